@@ -0,0 +1,67 @@
+"""
+Compares the memory taken by prospects held as the dicts decoded from JSON, as typed records and as RecordColumns.
+
+    python -m benchmarks.bench_records --prospects 100000
+"""
+import argparse
+import json
+import tracemalloc
+
+from pypardot.records import RecordColumns, record_class
+from pypardot.schema import OBJECT_FIELD_MAP
+
+
+def build_rows(count):
+    """
+    Returns a JSON array of <count> prospects with every standard prospect field, as Pardot would send it. As in most
+    accounts, only some of the optional text fields are filled in.
+    """
+    rows = []
+    for i in range(1, count + 1):
+        row = {}
+        for position, (name, spec) in enumerate(sorted(OBJECT_FIELD_MAP['prospect'].items())):
+            datatype = spec['datatype']
+            if datatype == 'string' and position % 3:
+                row[name] = None
+            elif datatype == 'integer':
+                row[name] = i
+            elif datatype == 'boolean':
+                row[name] = False
+            elif datatype == 'timestamp':
+                row[name] = '2019-01-01 00:00:00'
+            else:
+                row[name] = '{0} {1}'.format(name, i)
+        rows.append(row)
+    return json.dumps(rows)
+
+
+def measure(build, body):
+    """Returns the bytes still allocated by the result of build(json.loads(<body>)), with the decoded JSON freed."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(json.loads(body))
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--prospects', type=int, default=100000)
+    args = parser.parse_args()
+
+    body = build_rows(args.prospects)
+    cls = record_class('prospect')
+    sizes = [
+        ('dicts', measure(lambda rows: rows, body)),
+        ('records', measure(lambda rows: [cls(row) for row in rows], body)),
+        ('columns', measure(lambda rows: RecordColumns('prospect', rows), body)),
+    ]
+    baseline = float(sizes[0][1])
+    for name, size in sizes:
+        print('{0:8} {1:8.1f} MB ({2:.2f}x dicts)'.format(name, size / 1e6, size / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures cold start: the time a fresh interpreter takes to import pypardot.client and construct a PardotAPI, with
+object namespaces built on first use against every namespace built up front as the client used to.
+
+    python -m benchmarks.bench_startup --runs 20
+"""
+import argparse
+import subprocess
+import sys
+
+# Each snippet runs in a new interpreter and prints the import and construction times in milliseconds.
+SNIPPET = '''
+import time
+started = time.perf_counter()
+from pypardot.client import OBJECT_MODULES, PardotAPI
+imported = time.perf_counter()
+p = PardotAPI('email', 'password', 'user_key')
+{touch}
+built = time.perf_counter()
+print((imported - started) * 1000, (built - imported) * 1000)
+'''
+EAGER = 'for name, _, _ in OBJECT_MODULES:\n    getattr(p, name)'
+CASES = (
+    ('lazy', SNIPPET.format(touch='')),
+    ('first use', SNIPPET.format(touch='p.prospects')),
+    ('eager', SNIPPET.format(touch=EAGER)),
+)
+
+
+def run(code):
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return [float(value) for value in output.split()]
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print('{0:10} {1:>10} {2:>12}'.format('', 'import ms', 'PardotAPI ms'))
+    for name, code in CASES:
+        times = [run(code) for _ in range(args.runs)]
+        print('{0:10} {1:10.2f} {2:12.2f}'.format(
+            name, median([t[0] for t in times]), median([t[1] for t in times])))
+
+
+if __name__ == '__main__':
+    main()
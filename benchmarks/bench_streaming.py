@@ -0,0 +1,74 @@
+"""
+Compares peak memory while reading prospect query pages with query(), which loads each response whole, against
+stream_query(), which decodes one record at a time as the response arrives. Pages are served by the local simulator,
+run in a child process so that only the client's allocations are measured.
+
+    python -m benchmarks.bench_streaming --pages 5 --custom-fields 300
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import tracemalloc
+
+from pypardot.client import PardotAPI
+from pypardot.simulator import Simulator
+
+
+def serve(records, custom_fields, ready, done):
+    """Runs a simulator holding <records> prospects, putting its base URI on <ready>, until <done> is set."""
+    with Simulator(seed=1, custom_fields=custom_fields) as simulator:
+        simulator.seed('prospect', records)
+        ready.put(simulator.base_uri)
+        done.wait()
+
+
+def measure(read, pages):
+    """Returns (peak bytes allocated, seconds) for calling <read> <pages> times, each call consuming one page."""
+    tracemalloc.start()
+    start = time.time()
+    for _ in range(pages):
+        read()
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--records', type=int, default=200)
+    parser.add_argument('--custom-fields', type=int, default=300)
+    args = parser.parse_args()
+
+    ready, done = multiprocessing.Queue(), multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(args.records, args.custom_fields, ready, done))
+    server.start()
+    try:
+        client = PardotAPI(email='bench', password='bench', user_key='bench', base_uri=ready.get())
+        client.authenticate()
+        page_size = len(json.dumps(client.prospects.query(limit=args.records)))
+
+        def loaded():
+            for prospect in client.prospects.query(limit=args.records)['prospect']:
+                prospect.get('email')
+
+        def streamed():
+            for prospect in client.prospects.stream_query(limit=args.records):
+                prospect.get('email')
+
+        loaded_peak, loaded_time = measure(loaded, args.pages)
+        streamed_peak, streamed_time = measure(streamed, args.pages)
+    finally:
+        done.set()
+        server.join()
+
+    print('page size: {0:.1f} MB'.format(page_size / 1e6))
+    print('query():        peak {0:8.1f} MB, {1:6.2f} s'.format(loaded_peak / 1e6, loaded_time))
+    print('stream_query(): peak {0:8.1f} MB, {1:6.2f} s ({2:.1f}x less memory)'.format(
+        streamed_peak / 1e6, streamed_time, float(loaded_peak) / streamed_peak))
+
+
+if __name__ == '__main__':
+    main()
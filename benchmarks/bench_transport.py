@@ -0,0 +1,68 @@
+"""
+Compares calls per second through PardotAPI.get/post using the pooled keep-alive Transport against the previous
+behaviour of calling requests.get/requests.post directly, which opens a new connection for every call.
+
+    python -m benchmarks.bench_transport --calls 2000 --threads 8
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from pypardot.client import PardotAPI
+from pypardot.simulator import Simulator
+from pypardot.transport import Transport
+
+
+class ConnectionPerCallTransport(Transport):
+    """Reproduces the pre-Transport client: module-level requests calls, one connection per call."""
+
+    def __init__(self):
+        self.session = None
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        return requests.get(url, params=params, headers=headers, timeout=timeout)
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        return requests.post(url, data=data, headers=headers, timeout=timeout)
+
+    def close(self):
+        pass
+
+
+def run(transport, base_uri, calls, threads):
+    """Returns the calls per second achieved issuing <calls> alternating GET/POST requests on <threads> threads."""
+    client = PardotAPI(email='bench', password='bench', user_key='bench', transport=transport, base_uri=base_uri)
+    client.authenticate()
+
+    def call(i):
+        if i % 2:
+            client.prospects.query(limit=1)
+        else:
+            client.prospects.read_by_id(id=1)
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    return calls / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    with Simulator(seed=1) as simulator:
+        simulator.seed('prospect', 1)
+        baseline = run(ConnectionPerCallTransport(), simulator.base_uri, args.calls, args.threads)
+        with Transport(pool_maxsize=args.threads) as transport:
+            pooled = run(transport, simulator.base_uri, args.calls, args.threads)
+
+    print('connection per call: {0:10.1f} calls/s'.format(baseline))
+    print('pooled transport:    {0:10.1f} calls/s ({1:.2f}x)'.format(pooled, pooled / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Runs the client hot path benchmarks against the local simulator and saves the results as JSON, so that runs from
+different releases can be compared.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 0.1
+
+Each case reports a rate (calls or records per second) and, where it times individual calls, latency percentiles in
+milliseconds. With --compare, cases whose rate fell by more than the tolerance against the baseline file are listed
+as regressions and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import Response
+
+from pypardot.client import PardotAPI
+from pypardot.objects.prospects import Prospects
+from pypardot.simulator import Simulator
+
+PERCENTILES = (50, 90, 99)
+
+
+class Result(object):
+    """The outcome of one case: <count> units of work done in <elapsed> seconds, and per call <latencies> if timed."""
+
+    def __init__(self, unit, count, elapsed, latencies=()):
+        self.unit = unit
+        self.count = count
+        self.elapsed = elapsed
+        self.latencies = sorted(latencies)
+
+    @property
+    def rate(self):
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent):
+        """Returns the <percent>th percentile latency in milliseconds, by the nearest rank method."""
+        if not self.latencies:
+            return None
+        rank = max(0, min(len(self.latencies) - 1, int(round(percent / 100.0 * len(self.latencies))) - 1))
+        return self.latencies[rank] * 1000
+
+    def as_dict(self):
+        result = OrderedDict([('unit', self.unit), ('rate', round(self.rate, 2)), ('count', self.count),
+                              ('elapsed', round(self.elapsed, 4))])
+        if self.latencies:
+            result['latency_ms'] = OrderedDict(('p{0}'.format(percent), round(self.percentile(percent), 4))
+                                               for percent in PERCENTILES)
+        return result
+
+
+def timed(call, calls, threads=1):
+    """Makes <calls> calls of call(i) on <threads> threads, timing each one. Returns a Result in calls/s."""
+    def timed_call(i):
+        started = time.perf_counter()
+        call(i)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(timed_call, range(calls)))
+    else:
+        latencies = [timed_call(i) for i in range(calls)]
+    return Result('calls/s', calls, time.perf_counter() - started, latencies)
+
+
+def prospect_page(simulator, rows=200):
+    """Returns the JSON of a query response holding <rows> prospects generated by <simulator>, as Pardot sends it."""
+    ids = simulator.seed('prospect', rows)
+    records = [simulator.records['prospect'][record_id] for record_id in ids]
+    body = {'@attributes': {'stat': 'ok', 'version': 1}, 'result': {'total_results': rows, 'prospect': records}}
+    return json.dumps(body).encode('utf-8')
+
+
+class CannedClient(object):
+    """Stands in for PardotAPI, answering every request with a fresh decode of <body>, to time what surrounds it."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def get(self, object_name, path=None, params=None):
+        return json.loads(self.body)
+
+    post = get
+
+
+def bench_get(client, simulator, args):
+    """PardotAPI.get reading one prospect by id, over the pooled transport on --threads threads."""
+    simulator.seed('prospect', args.calls)
+    return timed(lambda i: client.get('prospect', path='/do/read/id/{0}'.format(i + 1)), args.calls, args.threads)
+
+
+def bench_post(client, simulator, args):
+    """PardotAPI.post updating one prospect by id, on --threads threads."""
+    simulator.seed('prospect', args.calls)
+    return timed(lambda i: client.post('prospect', path='/do/update/id/{0}'.format(i + 1), params={'score': i}),
+                 args.calls, args.threads)
+
+
+def bench_check_response(client, simulator, args):
+    """_check_response decoding a 200 prospect query page from a requests Response."""
+    response = Response()
+    response.status_code = 200
+    response.headers['content-type'] = 'application/json'
+    response.encoding = 'utf-8'
+    response._content = prospect_page(simulator)
+    return timed(lambda i: PardotAPI._check_response(response), args.iterations)
+
+
+def bench_query_normalization(client, simulator, args):
+    """Prospects.query turning the decoded single record and 200 record responses into lists of records."""
+    single = Prospects(CannedClient(json.dumps({'result': {'total_results': 1, 'prospect': {'id': 1}}})))
+    page = Prospects(CannedClient(json.dumps({'result': {'total_results': 200, 'prospect': [{'id': 1}] * 200}})))
+    return timed(lambda i: (single if i % 2 else page).query(id_greater_than=i), args.iterations)
+
+
+def bench_pagination(client, simulator, args):
+    """iter_query walking every page of --records prospects, one page at a time."""
+    simulator.seed('prospect', args.records)
+    started = time.perf_counter()
+    count = sum(1 for _ in client.prospects.iter_query())
+    return Result('records/s', count, time.perf_counter() - started)
+
+
+def bench_bulk_write(client, simulator, args):
+    """bulk_upsert of --records new prospects through batchUpsert, on the writer's default workers."""
+    records = [{'email': 'bench{0}@example.com'.format(i), 'first_name': 'Bench'} for i in range(args.records)]
+    started = time.perf_counter()
+    result = client.prospects.bulk_upsert(records)
+    if result.errors:
+        raise RuntimeError('{0} records were rejected'.format(len(result.errors)))
+    return Result('records/s', result.records, time.perf_counter() - started)
+
+
+CASES = OrderedDict([
+    ('get', bench_get),
+    ('post', bench_post),
+    ('check_response', bench_check_response),
+    ('query_normalization', bench_query_normalization),
+    ('pagination', bench_pagination),
+    ('bulk_write', bench_bulk_write),
+])
+
+
+def run(args):
+    """Runs the selected cases, each against a fresh simulator, and returns the results document."""
+    results = OrderedDict()
+    for name in args.cases or CASES:
+        with Simulator(seed=1) as simulator:
+            client = PardotAPI(email='bench', password='bench', user_key='bench', base_uri=simulator.base_uri)
+            client.authenticate()
+            try:
+                results[name] = CASES[name](client, simulator, args).as_dict()
+            finally:
+                client.transport.close()
+    return OrderedDict([
+        ('label', args.label),
+        ('created_at', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('results', results),
+    ])
+
+
+def compare(baseline, current, tolerance):
+    """
+    Returns (case, baseline rate, current rate, ratio) for every case in both documents whose rate fell by more than
+    <tolerance>, a fraction of the baseline rate.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before or not before['rate']:
+            continue
+        ratio = result['rate'] / before['rate']
+        if ratio < 1 - tolerance:
+            regressions.append((name, before['rate'], result['rate'], ratio))
+    return regressions
+
+
+def report(document):
+    for name, result in document['results'].items():
+        line = '{0:<20} {1:12.1f} {2:<10}'.format(name, result['rate'], result['unit'])
+        if 'latency_ms' in result:
+            line += ' '.join(' {0} {1:8.3f} ms'.format(percentile, value)
+                             for percentile, value in result['latency_ms'].items())
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), help='cases to run, all by default')
+    parser.add_argument('--calls', type=int, default=2000, help='requests made by the get and post cases')
+    parser.add_argument('--threads', type=int, default=8, help='threads making the get and post requests')
+    parser.add_argument('--iterations', type=int, default=500, help='iterations of the in-process cases')
+    parser.add_argument('--records', type=int, default=5000, help='records paged through and written')
+    parser.add_argument('--label', default='', help='a name for this run, such as the release under test')
+    parser.add_argument('--output', help='file to save the results to as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fraction a rate may fall below the baseline before it counts as a regression')
+    args = parser.parse_args()
+
+    document = run(args)
+    report(document)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), document, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print('regression: {0} fell from {1:.1f} to {2:.1f} ({3:.0%})'.format(name, before, after, ratio))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+"""
+asyncio flavour of PardotAPI. Requires aiohttp (pip install PyPardot4[async]).
+"""
+import asyncio
+import json
+
+from .client import PardotAPI, BASE_URI, INVALID_API_KEY_MESSAGE, add_namespaces
+from .errors import PardotAPIError
+from .pagination import PAGE_SIZE, records
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+DEFAULT_LIMIT = 100
+DEFAULT_LIMIT_PER_HOST = 32
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+class BufferedResponse(object):
+    """A fully read HTTP response exposing the parts of requests.Response that PardotAPI._check_response uses."""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+
+class AsyncTransport(object):
+    """
+    Pooled aiohttp transport used by AsyncPardotAPI. <limit> caps open connections overall and <limit_per_host>
+    caps them per host; idle connections are kept alive for <keepalive_timeout> seconds.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, limit_per_host=DEFAULT_LIMIT_PER_HOST, keepalive_timeout=30):
+        if aiohttp is None:
+            raise ImportError('AsyncTransport requires aiohttp: pip install PyPardot4[async]')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+
+    @property
+    def session(self):
+        """The aiohttp.ClientSession, created on first use so that it binds to the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def get(self, url, params=None, headers=None):
+        async with self.session.get(url, params=_encode(params), headers=headers) as response:
+            return BufferedResponse(response.status, response.headers, await response.read())
+
+    async def post(self, url, data=None, headers=None):
+        async with self.session.post(url, data=_encode(data), headers=headers) as response:
+            return BufferedResponse(response.status, response.headers, await response.read())
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+@add_namespaces
+class AsyncPardotAPI(object):
+    """
+    Same interface as PardotAPI with awaitable methods, e.g. await p.prospects.read_by_id(id=1). Authentication,
+    API key expiry handling and response checking are shared with PardotAPI. At most <max_concurrency> requests are
+    in flight at once; further calls wait their turn, so thousands of reads may be gathered safely.
+    """
+
+    def __init__(self, email, password, user_key, version=4, transport=None, base_uri=BASE_URI,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.email = email
+        self.password = password
+        self.user_key = user_key
+        self.api_key = None
+        self.version = version
+        self.base_uri = base_uri
+        self.transport = transport if transport is not None else AsyncTransport()
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._auth_lock = None
+
+    def build_namespace(self, object_class):
+        """Returns the AsyncObject exposed for <object_class> on this client."""
+        return AsyncObject(self, object_class)
+
+    async def post(self, object_name, path=None, params=None, retries=0):
+        """Async counterpart of PardotAPI.post."""
+        if params is None:
+            params = {}
+        try:
+            await self._check_auth(object_name=object_name)
+            params.update({'user_key': self.user_key, 'api_key': self.api_key, 'format': 'json'})
+            async with self._slots():
+                request = await self.transport.post(self._full_path(object_name, path), data=params)
+            return PardotAPI._check_response(request)
+        except PardotAPIError as err:
+            if err.message == INVALID_API_KEY_MESSAGE:
+                return await self._handle_expired_api_key(err, retries, 'post', object_name, path, params)
+            raise err
+
+    async def get(self, object_name, path=None, params=None, retries=0):
+        """Async counterpart of PardotAPI.get."""
+        if params is None:
+            params = {}
+        params.update({'format': 'json'})
+        try:
+            await self._check_auth(object_name=object_name)
+            headers = PardotAPI._build_auth_header(self)
+            async with self._slots():
+                request = await self.transport.get(self._full_path(object_name, path), params=params,
+                                                   headers=headers)
+            return PardotAPI._check_response(request)
+        except PardotAPIError as err:
+            if err.message == INVALID_API_KEY_MESSAGE:
+                return await self._handle_expired_api_key(err, retries, 'get', object_name, path, params)
+            raise err
+
+    async def _handle_expired_api_key(self, err, retries, method, object_name, path, params):
+        """Refreshes an expired API key once and re-issues the request, as PardotAPI does."""
+        if retries != 0 or object_name == 'login':
+            raise err
+        expired = self.api_key
+        async with self._lock():
+            if self.api_key == expired:
+                self.api_key = None
+                if not await self._login():
+                    raise err
+        return await getattr(self, method)(object_name=object_name, path=path, params=params, retries=1)
+
+    async def _check_auth(self, object_name):
+        if object_name == 'login' or self.api_key is not None:
+            return
+        async with self._lock():
+            if self.api_key is None:
+                await self._login()
+
+    async def authenticate(self):
+        """Authenticates the user and sets the API key. Returns True if authentication is successful."""
+        async with self._lock():
+            return await self._login()
+
+    async def _login(self):
+        try:
+            auth = await self.post('login', params={'email': self.email, 'password': self.password})
+        except PardotAPIError:
+            return False
+        if type(auth) is int:
+            return False
+        self.api_key = auth.get('api_key', None)
+        return self.api_key is not None
+
+    async def close(self):
+        """Closes the transport's pooled connections."""
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _full_path(self, object_name, path=None):
+        return PardotAPI._full_path(object_name, self.version, path, base_uri=self.base_uri)
+
+    def _slots(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _lock(self):
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+
+class AsyncObject(object):
+    """
+    Awaitable view of one of the object classes (Prospects, Visits, ...). Only the methods that make exactly one
+    request are offered: the object's endpoints and query. Each runs the object class's own code twice: once against
+    a recorder that captures the request it would send, and once more with the awaited response in hand, so argument
+    checks and result normalization are exactly those of the synchronous client. Helpers that make several requests,
+    such as read_many, the bulk writers or stream_query, raise AttributeError; iter_query has its own async version.
+    """
+
+    def __init__(self, client, object_class):
+        self.client = client
+        self.object_class = object_class
+
+    def __getattr__(self, name):
+        method = getattr(self.object_class, name, None)
+        if name.startswith('_') or not callable(method):
+            raise AttributeError(name)
+        if name != 'query' and getattr(method, 'operation', None) is None:
+            raise AttributeError('{0} makes more than one request and is not available on AsyncPardotAPI'.format(name))
+
+        async def call(*args, **kwargs):
+            try:
+                result = getattr(self.object_class(_Recorder()), name)(*args, **kwargs)
+            except _Request as request:
+                response = await getattr(self.client, request.method)(
+                    object_name=request.object_name, path=request.path, params=request.params)
+                return getattr(self.object_class(_Recorder(response)), name)(*args, **kwargs)
+            return result
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+    async def iter_query(self, page_size=PAGE_SIZE, **criteria):
+        """Async generator counterpart of iter_query, walking results with an id_greater_than cursor."""
+        result_key = self.object_class.result_key
+        criteria.pop('offset', None)
+        criteria.update({'sort_by': 'id', 'sort_order': 'ascending', 'limit': page_size})
+        while True:
+            rows = records(await self.query(**criteria), result_key)
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                return
+            criteria['id_greater_than'] = rows[-1]['id']
+
+
+class _Request(Exception):
+    def __init__(self, method, object_name, path, params):
+        super(_Request, self).__init__(method, object_name, path)
+        self.method = method
+        self.object_name = object_name
+        self.path = path
+        self.params = params
+
+
+class _Recorder(object):
+    """Stands in for the client: raises the request it is asked to make, or returns a response already fetched."""
+
+    def __init__(self, response=None):
+        self.response = response
+
+    def get(self, object_name, path=None, params=None):
+        return self._respond('get', object_name, path, params)
+
+    def post(self, object_name, path=None, params=None):
+        return self._respond('post', object_name, path, params)
+
+    def _respond(self, method, object_name, path, params):
+        if self.response is None:
+            raise _Request(method, object_name, path, params)
+        return self.response
+
+
+def _encode(params):
+    """Encodes request parameters the way requests does: None values are dropped and other values stringified."""
+    if not params:
+        return None
+    encoded = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        encoded.extend((key, str(item)) for item in values if item is not None)
+    return encoded
@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from .deadline import as_deadline
+from .errors import PardotAPIError
+
+# Pardot accepts at most 50 prospects per batch request.
+BATCH_LIMIT = 50
+BATCH_METHODS = {
+    'create': 'batchCreate',
+    'update': 'batchUpdate',
+    'upsert': 'batchUpsert',
+}
+
+BulkError = namedtuple('BulkError', ['index', 'record', 'message'])
+
+
+class BulkResult(object):
+    """
+    Outcome of a bulk write. <errors> lists a BulkError(index, record, message) for every input record Pardot
+    rejected, where index is the record's position in the input iterable.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.batches = 0
+        self.errors = []
+        self.started_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def succeeded(self):
+        return self.records - len(self.errors)
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def records_per_second(self):
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    def _add_batch(self, size, errors):
+        with self._lock:
+            self.records += size
+            self.batches += 1
+            self.errors.extend(errors)
+
+    def __repr__(self):
+        return '<BulkResult {0} records in {1} batches, {2} errors, {3:.1f} records/s>'.format(
+            self.records, self.batches, len(self.errors), self.records_per_second)
+
+
+class ProspectBulkWriter(object):
+    """
+    Writes any number of prospect dicts through Pardot's batch endpoints. Records are read lazily from the input
+    iterable, split into batches of <batch_size> (at most 50), serialized once per batch and sent by <workers>
+    threads. Only a couple of batches per worker are held in memory at a time, so the input can be a generator over
+    millions of rows. <operation> is 'create', 'update' or 'upsert'; updates need an id or email in each record.
+
+    If given, <progress> is called with the BulkResult after every batch. Records Pardot rejects are reported as
+    BulkErrors, while an error that is not about particular records, such as the daily API quota running out or
+    failed authentication, stops the write: no further batch is started and the PardotAPIError is raised.
+
+    With a <deadline> (a Deadline, or a number of seconds counted from the start of each write), no batch is started
+    once it has passed. The batches in flight are allowed to finish, so none is cut off half written, then
+    PardotDeadlineExceededError is raised with the BulkResult as its progress: every record before index
+    result.records of the input has been sent, and the write can be resumed from there.
+    """
+
+    def __init__(self, prospects, operation='upsert', batch_size=BATCH_LIMIT, workers=4, progress=None,
+                 deadline=None):
+        if operation not in BATCH_METHODS:
+            raise ValueError('operation must be one of {0}'.format(', '.join(sorted(BATCH_METHODS))))
+        if not 0 < batch_size <= BATCH_LIMIT:
+            raise ValueError('batch_size must be between 1 and {0}'.format(BATCH_LIMIT))
+        self.prospects = prospects
+        self.operation = operation
+        self.batch_size = batch_size
+        self.workers = workers
+        self.progress = progress
+        self.deadline = deadline
+
+    def write(self, records):
+        """Writes every record in <records> and returns a BulkResult once all batches have completed."""
+        result = BulkResult()
+        deadline = as_deadline(self.deadline)
+        expired = False
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = set()
+        try:
+            for start, batch in self.batches(records):
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                if deadline is not None and deadline.expired:
+                    expired = True
+                    break
+                pending.add(executor.submit(self._send, start, batch, result))
+            for future in pending:
+                future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            result.finished_at = time.time()
+        if expired:
+            deadline.check(progress=result)
+        return result
+
+    def batches(self, records):
+        """Yields (index of first record, list of records) for each batch of <records>."""
+        iterator = iter(records)
+        start = 0
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield start, batch
+            start += len(batch)
+
+    def send_batch(self, batch):
+        """
+        Sends one batch and returns {position in batch: error message} for the records Pardot rejected. Raises
+        PardotAPIError if Pardot failed the request as a whole, without per-record errors.
+        """
+        data = json.dumps({'prospects': batch}, separators=(',', ':'), default=str)
+        try:
+            response = getattr(self.prospects, BATCH_METHODS[self.operation])(prospects=data)
+        except PardotAPIError as err:
+            if not err.response.get('errors'):
+                raise
+            response = err.response
+        return _map_errors(response, batch)
+
+    def _send(self, start, batch, result):
+        errors = self.send_batch(batch)
+        result._add_batch(len(batch), [BulkError(start + position, batch[position], message)
+                                       for position, message in sorted(errors.items())])
+        if self.progress is not None:
+            self.progress(result)
+
+
+def _map_errors(response, batch):
+    """
+    Maps the errors of a batch response back to positions in <batch>. Batches are sent as a JSON list, so Pardot keys
+    errors by the record's position in the request; keys given as an id or email address are matched as well.
+    """
+    errors = response.get('errors') if isinstance(response, dict) else None
+    if not errors:
+        return {}
+    if isinstance(errors, list):
+        errors = dict(enumerate(errors))
+    positions = {}
+    for position, record in enumerate(batch):
+        for field in ('id', 'fid', 'email'):
+            if record.get(field) is not None:
+                positions.setdefault(str(record[field]), position)
+    mapped = {}
+    for key, message in errors.items():
+        key = str(key)
+        if key.isdigit() and int(key) < len(batch):
+            mapped[int(key)] = message
+        elif key in positions:
+            mapped[positions[key]] = message
+    return mapped
@@ -0,0 +1,200 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Objects that rarely change, cached for DEFAULT_TTL seconds unless other TTLs are given.
+DEFAULT_TTL = 300
+DEFAULT_TTLS = dict((object_name, DEFAULT_TTL) for object_name in (
+    'campaign', 'customField', 'emailTemplate', 'form', 'lifecycleStage', 'list', 'tag', 'user'))
+DEFAULT_MAX_ENTRIES = 1024
+# Request parameters that do not change the response.
+IGNORED_PARAMS = ('api_key', 'user_key', 'format')
+
+
+class ResponseCache(object):
+    """
+    Caches the JSON responses of read requests (queries, reads, describes) for the objects listed in <ttls>, a dict
+    of Pardot object name (as in the API URL, e.g. 'customField') to the number of seconds a response stays fresh.
+    Responses are keyed by account, object, path and parameters, and the least recently used entries are evicted
+    once more than <max_entries> are stored.
+
+    Any successful write to an object (create, update, delete...) drops every cached response for that object, so a
+    client never reads back stale data it has changed itself. Changes made elsewhere show up once the TTL runs out.
+
+    Entries live in <backend>: MemoryBackend (the default) for one process, or SQLiteBackend to share the cache
+    between processes and keep it across restarts. Cached responses are returned as fresh copies, so callers may
+    modify them.
+    """
+
+    def __init__(self, ttls=None, max_entries=DEFAULT_MAX_ENTRIES, backend=None):
+        self.ttls = dict(ttls) if ttls is not None else dict(DEFAULT_TTLS)
+        self.max_entries = max_entries
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.stats = CacheStats()
+
+    def cacheable(self, object_name):
+        return bool(self.ttls.get(object_name))
+
+    def get(self, account, object_name, path, params):
+        """Returns the cached response for the request, or None on a miss."""
+        value = self.backend.get(request_key(account, object_name, path, params), time.time())
+        if value is None:
+            self.stats.miss()
+            return None
+        self.stats.hit()
+        return json.loads(value)
+
+    def set(self, account, object_name, path, params, response):
+        key = request_key(account, object_name, path, params)
+        evicted = self.backend.set(key, _prefix(account, object_name), json.dumps(response),
+                                   time.time() + self.ttls[object_name], self.max_entries)
+        self.stats.evicted(evicted)
+
+    def invalidate(self, account, object_name):
+        """Drops every cached response for <object_name>."""
+        self.backend.invalidate(_prefix(account, object_name))
+
+    def clear(self):
+        self.backend.clear()
+
+
+class CacheStats(object):
+    """Thread-safe hit, miss and eviction counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def evicted(self, count):
+        if count:
+            with self._lock:
+                self.evictions += count
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+class MemoryBackend(object):
+    """Keeps cached responses in an LRU-ordered dict shared by the threads of one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, prefix, value, expires_at, max_entries):
+        """Stores <value> and returns the number of entries evicted to make room for it."""
+        with self._lock:
+            self._entries[key] = (prefix, value, expires_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def invalidate(self, prefix):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend(object):
+    """
+    Keeps cached responses in an SQLite database at <path>, shared by every process using the same file. Entries
+    record when they were last read, for LRU eviction.
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, prefix TEXT NOT NULL, '
+                'value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS responses_prefix ON responses (prefix)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)')
+
+    def get(self, key, now):
+        with self._lock, self._connection:
+            row = self._connection.execute('SELECT value FROM responses WHERE key = ? AND expires_at > ?',
+                                           (key, now)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute('UPDATE responses SET used_at = ? WHERE key = ?', (now, key))
+            return row[0]
+
+    def set(self, key, prefix, value, expires_at, max_entries):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, prefix, value, expires_at, used_at) VALUES (?, ?, ?, ?, ?)',
+                (key, prefix, value, expires_at, now))
+            self._connection.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+            count = self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            if count <= max_entries:
+                return 0
+            self._connection.execute(
+                'DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used_at LIMIT ?)',
+                (count - max_entries,))
+            return count - max_entries
+
+    def invalidate(self, prefix):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses WHERE prefix = ?', (prefix,))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses')
+
+    def close(self):
+        self._connection.close()
+
+
+def _prefix(account, object_name):
+    return '{0}/{1}'.format(account, object_name)
+
+
+def request_key(account, object_name, path, params):
+    """Builds the cache key from the request, ignoring authentication parameters and parameter order."""
+    params = sorted((str(name), str(value)) for name, value in (params or {}).items()
+                    if name not in IGNORED_PARAMS and value is not None)
+    return '{0} {1} {2}'.format(_prefix(account, object_name), path or '', json.dumps(params))
@@ -1,28 +1,17 @@
-import requests
-from .objects.accounts import Accounts
-from .objects.customfields import CustomFields
-from .objects.customredirects import CustomRedirects
-from .objects.dynamiccontent import DynamicContent
-from .objects.emailclicks import EmailClicks
-from .objects.emailtemplates import EmailTemplates
-from .objects.forms import Forms
-from .objects.lifecyclehistories import LifecycleHistories
-from .objects.lifecyclestages import LifecycleStages
-from .objects.lists import Lists
-from .objects.listmemberships import ListMemberships
-from .objects.emails import Emails
-from .objects.prospects import Prospects
-from .objects.opportunities import Opportunities
-from .objects.prospectaccounts import ProspectAccounts
-from .objects.tags import Tags
-from .objects.tagobjects import TagObjects
-from .objects.users import Users
-from .objects.visits import Visits
-from .objects.visitors import Visitors
-from .objects.visitoractivities import VisitorActivities
-from .objects.campaigns import Campaigns
-
-from .errors import PardotAPIError
+import copy
+import importlib
+import threading
+import time
+
+from .errors import PardotAPIError, PardotDeadlineExceededError, PardotQuotaExceededError
+from .cache import request_key
+from .deadline import current_deadline
+from .instrumentation import RequestInfo
+from .keycache import cache_key
+from .ratelimit import DAILY_LIMIT_ERROR_CODE
+from .singleflight import SingleFlight
+from .streaming import CHUNK_SIZE, RecordStream
+from .transport import Transport, take_connection_time
 
 # Issue #1 (http://code.google.com/p/pybing/issues/detail?id=1)
 # Python 2.6 has json built in, 2.5 needs simplejson
@@ -32,38 +21,151 @@ except ImportError:
     import simplejson as json
 
 BASE_URI = 'https://pi.pardot.com'
+# Pardot API keys are valid for one hour; they are refreshed this many seconds ahead of expiry.
+API_KEY_LIFETIME = 3600
+API_KEY_REFRESH_MARGIN = 300
+# Seconds allowed to establish a connection, and between bytes of the response, unless configured otherwise.
+DEFAULT_TIMEOUT = (10, 120)
+INVALID_API_KEY_MESSAGE = 'Invalid API key or user key'
+READ_PATH_PREFIXES = ('/do/query', '/do/read', '/do/describe', '/do/stats', '/do/listOneToOne')
+
+# Object namespaces exposed on the client, e.g. PardotAPI.prospects, with the module in pypardot.objects and the class
+# implementing each. Modules are only imported, and wrappers only built, when a namespace is first used.
+OBJECT_MODULES = (
+    ('accounts', 'accounts', 'Accounts'),
+    ('campaigns', 'campaigns', 'Campaigns'),
+    ('customfields', 'customfields', 'CustomFields'),
+    ('customredirects', 'customredirects', 'CustomRedirects'),
+    ('dynamiccontent', 'dynamiccontent', 'DynamicContent'),
+    ('emailclicks', 'emailclicks', 'EmailClicks'),
+    ('emails', 'emails', 'Emails'),
+    ('emailtemplates', 'emailtemplates', 'EmailTemplates'),
+    ('exports', 'exports', 'Exports'),
+    ('forms', 'forms', 'Forms'),
+    ('lifecyclehistories', 'lifecyclehistories', 'LifecycleHistories'),
+    ('lifecyclestages', 'lifecyclestages', 'LifecycleStages'),
+    ('listmemberships', 'listmemberships', 'ListMemberships'),
+    ('lists', 'lists', 'Lists'),
+    ('opportunities', 'opportunities', 'Opportunities'),
+    ('prospects', 'prospects', 'Prospects'),
+    ('prospectaccounts', 'prospectaccounts', 'ProspectAccounts'),
+    ('tags', 'tags', 'Tags'),
+    ('tagobjects', 'tagobjects', 'TagObjects'),
+    ('users', 'users', 'Users'),
+    ('visits', 'visits', 'Visits'),
+    ('visitors', 'visitors', 'Visitors'),
+    ('visitoractivities', 'visitoractivities', 'VisitorActivities'),
+)
+_OBJECT_CLASS_MODULES = dict((class_name, module) for _, module, class_name in OBJECT_MODULES)
+
+
+def load_object_class(module, class_name):
+    """Imports pypardot.objects.<module> and returns its <class_name> class."""
+    return getattr(importlib.import_module('.objects.' + module, __package__), class_name)
+
+
+def __getattr__(name):
+    """
+    Resolves the object classes this module used to import eagerly (from pypardot.client import Prospects) and
+    OBJECT_NAMESPACES, the (namespace, class) pairs, on first use.
+    """
+    if name in _OBJECT_CLASS_MODULES:
+        return load_object_class(_OBJECT_CLASS_MODULES[name], name)
+    if name == 'OBJECT_NAMESPACES':
+        return tuple((namespace, load_object_class(module, class_name))
+                     for namespace, module, class_name in OBJECT_MODULES)
+    raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+
+
+class ObjectNamespace(object):
+    """
+    Client attribute for one object namespace. On first access from a client it imports the object class, builds
+    the wrapper with the client's build_namespace() and stores it on the client, so later reads are plain attribute
+    lookups.
+    """
+
+    def __init__(self, name, module, class_name):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+
+    def __get__(self, client, owner):
+        if client is None:
+            return self
+        wrapper = client.build_namespace(load_object_class(self.module, self.class_name))
+        # Threads racing on first access all end up with the wrapper stored first.
+        return client.__dict__.setdefault(self.name, wrapper)
+
 
+def add_namespaces(client_class):
+    """Class decorator giving <client_class> an ObjectNamespace attribute for each object in OBJECT_MODULES."""
+    for name, module, class_name in OBJECT_MODULES:
+        setattr(client_class, name, ObjectNamespace(name, module, class_name))
+    return client_class
 
+
+def instrumented(method):
+    """
+    Decorates a request method of PardotAPI, such as get(), so that each call is reported to the client's instruments
+    as one RequestInfo, along with the retries and re-authentication it took. The call re-issued after
+    re-authenticating (retries=1) is part of the original call and is not reported on its own.
+    """
+    def wrapper(self, object_name, path=None, params=None, retries=0, **kwargs):
+        if not self.instruments or retries:
+            return method(self, object_name, path, params, retries, **kwargs)
+        request = RequestInfo(method.__name__, object_name, path)
+        for instrument in self.instruments:
+            instrument.before_request(request)
+        calls = self._calls.__dict__.setdefault('stack', [])
+        calls.append(request)
+        error = None
+        try:
+            return method(self, object_name, path, params, retries, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            calls.pop()
+            request.finish(error)
+            for instrument in self.instruments:
+                instrument.after_response(request)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+@add_namespaces
 class PardotAPI(object):
-    def __init__(self, email, password, user_key, version=4):
+    def __init__(self, email, password, user_key, version=4, transport=None, base_uri=BASE_URI, rate_limiter=None,
+                 retry_policy=None, key_cache=None, cache=None, coalesce_reads=True, instruments=None,
+                 timeout=DEFAULT_TIMEOUT, timeouts=None):
         self.email = email
         self.password = password
         self.user_key = user_key
         self.api_key = None
+        self.api_key_refresh_margin = API_KEY_REFRESH_MARGIN
+        self._api_key_expires_at = None
+        self._auth_flight = SingleFlight()
         self.version = version
-        self.accounts = Accounts(self)
-        self.campaigns = Campaigns(self)
-        self.customfields = CustomFields(self)
-        self.customredirects = CustomRedirects(self)
-        self.dynamiccontent = DynamicContent(self)
-        self.emailclicks = EmailClicks(self)
-        self.emails = Emails(self)
-        self.emailtemplates = EmailTemplates(self)
-        self.forms = Forms(self)
-        self.lifecyclehistories = LifecycleHistories(self)
-        self.lifecyclestages = LifecycleStages(self)
-        self.listmemberships = ListMemberships(self)
-        self.lists = Lists(self)
-        self.opportunities = Opportunities(self)
-        self.prospects = Prospects(self)
-        self.prospectaccounts = ProspectAccounts(self)
-        self.tags = Tags(self)
-        self.tagobjects = TagObjects(self)
-        self.users = Users(self)
-        self.visits = Visits(self)
-        self.visitors = Visitors(self)
-        self.visitoractivities = VisitorActivities(self)
+        self.base_uri = base_uri
+        self.transport = transport if transport is not None else Transport()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.key_cache = key_cache
+        self.cache = cache
+        self.coalesce_reads = coalesce_reads
+        self._read_flight = SingleFlight()
+        self.instruments = list(instruments or ())
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self._calls = threading.local()
+
+    def build_namespace(self, object_class):
+        """Returns the wrapper exposed for <object_class> on this client, e.g. Prospects(self) for self.prospects."""
+        return object_class(self)
 
+    @instrumented
     def post(self, object_name, path=None, params=None, retries=0):
         """
         Makes a POST request to the API. Checks for invalid requests that raise PardotAPIErrors. If the API key is
@@ -72,19 +174,22 @@ class PardotAPI(object):
         """
         if params is None:
             params = {}
-        params.update({'user_key': self.user_key, 'api_key': self.api_key, 'format': 'json'})
+        api_key = None
         try:
             self._check_auth(object_name=object_name)
-            request = requests.post(self._full_path(object_name, self.version, path), data=params)
-            response = self._check_response(request)
+            api_key = self.api_key
+            params.update({'user_key': self.user_key, 'api_key': api_key, 'format': 'json'})
+            response = self._request('post', object_name, path, data=params)
             return response
         except PardotAPIError as err:
-            if err.message == 'Invalid API key or user key':
-                response = self._handle_expired_api_key(err, retries, 'post', object_name, path, params)
+            self._note_error(err)
+            if err.message == INVALID_API_KEY_MESSAGE:
+                response = self._handle_expired_api_key(err, retries, 'post', object_name, path, params, api_key)
                 return response
             else:
                 raise err
 
+    @instrumented
     def get(self, object_name, path=None, params=None, retries=0):
         """
         Makes a GET request to the API. Checks for invalid requests that raise PardotAPIErrors. If the API key is
@@ -94,37 +199,217 @@ class PardotAPI(object):
         if params is None:
             params = {}
         params.update({'format': 'json'})
-        headers = self._build_auth_header()
+        api_key = None
         try:
             self._check_auth(object_name=object_name)
-            request = requests.get(self._full_path(object_name, self.version, path), params=params, headers=headers)
-            response = self._check_response(request)
+            api_key = self.api_key
+            headers = self._build_auth_header()
+            response = self._request('get', object_name, path, params=params, headers=headers)
             return response
         except PardotAPIError as err:
-            if err.message == 'Invalid API key or user key':
-                response = self._handle_expired_api_key(err, retries, 'get', object_name, path, params)
+            self._note_error(err)
+            if err.message == INVALID_API_KEY_MESSAGE:
+                response = self._handle_expired_api_key(err, retries, 'get', object_name, path, params, api_key)
                 return response
             else:
                 raise err
 
-    def _handle_expired_api_key(self, err, retries, method, object_name, path, params):
+    @instrumented
+    def post_json(self, object_name, path=None, params=None, retries=0):
+        """
+        Makes a POST request to the API with <params> sent as a JSON body, as endpoints such as export creation
+        expect. Errors and expired API keys are handled as with post().
+        """
+        api_key = None
+        try:
+            self._check_auth(object_name=object_name)
+            api_key = self.api_key
+            headers = self._build_auth_header()
+            headers['Content-Type'] = 'application/json'
+            response = self._request('post', object_name, '{0}?format=json'.format(path or ''),
+                                     data=json.dumps(params or {}), headers=headers)
+            return response
+        except PardotAPIError as err:
+            self._note_error(err)
+            if err.message == INVALID_API_KEY_MESSAGE:
+                response = self._handle_expired_api_key(err, retries, 'post_json', object_name, path, params,
+                                                        api_key)
+                return response
+            else:
+                raise err
+
+    def download(self, url, headers=None):
+        """
+        Makes an authenticated GET request for <url>, a full URL such as an export's result file, and returns the
+        requests.Response with its body left unread. Extra <headers>, such as a Range header, are sent as given.
+        """
+        self._check_auth(object_name='export')
+        headers = dict(headers or {}, **self._build_auth_header())
+        return self._send_url('get', url, headers=headers, stream=True, timeout=self.timeout_for('export'))
+
+    @instrumented
+    def stream(self, object_name, path=None, params=None, retries=0, result_key=None):
+        """
+        Makes a GET request to the API and returns a RecordStream that yields the records under
+        result[<result_key>] (by default <object_name>) as they are decoded from the response body, without loading
+        the whole response. Errors reported by Pardot are raised as PardotAPIErrors before any record is returned,
+        and an invalid API key is refreshed once, as with get().
+        """
+        if params is None:
+            params = {}
+        params.update({'format': 'json'})
+        api_key = None
+        try:
+            self._check_auth(object_name=object_name)
+            api_key = self.api_key
+            headers = self._build_auth_header()
+            return self._stream(object_name, path, params, headers, result_key or object_name)
+        except PardotAPIError as err:
+            self._note_error(err)
+            if err.message == INVALID_API_KEY_MESSAGE:
+                return self._handle_expired_api_key(err, retries, 'stream', object_name, path, params, api_key,
+                                                    result_key=result_key)
+            else:
+                raise err
+
+    def _stream(self, object_name, path, params, headers, result_key):
+        def send():
+            response = self._send('get', object_name, path, params=params, headers=headers, stream=True)
+            if response.headers.get('content-type') != 'application/json':
+                response.close()
+                return response.status_code
+            return response
+
+        if self.retry_policy is None:
+            response = send()
+        else:
+            response = self.retry_policy.call(send, idempotent=True)
+        if type(response) is int:
+            raise PardotAPIError(json_response={'@attributes': {'stat': 'fail', 'err_code': 0},
+                                                'err': 'Unexpected HTTP {0} response'.format(response)})
+        records = RecordStream(response.iter_content(CHUNK_SIZE), result_key, close=response.close).prime()
+        if records.response.get('err'):
+            raise PardotAPIError(json_response=records.response)
+        return records
+
+    def _request(self, method, object_name, path=None, **kwargs):
+        """
+        Sends the request and checks the response, answering reads from the response cache when one is configured
+        and the object is cached. A successful write to a cached object drops that object's cached responses.
+
+        Identical reads issued concurrently by several threads share one request, unless coalesce_reads is off.
+        Each thread then receives its own copy of the response. Writes are never coalesced.
+        """
+        cache = self.cache
+        if cache is not None and not cache.cacheable(object_name):
+            cache = None
+        if not (method == 'get' or _is_read(path)):
+            response = self._fetch(method, object_name, path, **kwargs)
+            if cache is not None:
+                cache.invalidate(self._key_cache_id(), object_name)
+            return response
+        if cache is None and not self.coalesce_reads:
+            return self._fetch(method, object_name, path, **kwargs)
+        params = kwargs.get('data', kwargs.get('params'))
+        key = request_key(self._key_cache_id(), object_name, path, params)
+
+        def read():
+            if cache is not None:
+                cached = cache.get(self._key_cache_id(), object_name, path, params)
+                if cached is not None:
+                    return cached
+            response = self._fetch(method, object_name, path, **kwargs)
+            if cache is not None and isinstance(response, dict):
+                cache.set(self._key_cache_id(), object_name, path, params, response)
+            return response
+
+        if not self.coalesce_reads:
+            return read()
+        # Requests sent with different API keys are not shared: one sent with a stale key would fail for all.
+        auth = kwargs.get('headers', {}).get('Authorization') or (params or {}).get('api_key')
+        response, shared = self._read_flight.do((method, key, auth), read)
+        return copy.deepcopy(response) if shared else response
+
+    def _fetch(self, method, object_name, path=None, **kwargs):
+        """
+        Sends the request and checks the response. With a retry policy configured, retryable failures are retried;
+        POSTs to paths other than reads are treated as writes and only retried if Pardot cannot have processed them.
+        """
+        if self.retry_policy is None:
+            return self._check_response(self._send(method, object_name, path, **kwargs))
+        return self.retry_policy.call(
+            lambda: self._check_response(self._send(method, object_name, path, **kwargs)),
+            idempotent=method == 'get' or _is_read(path))
+
+    def _send(self, method, object_name, path=None, **kwargs):
+        """Sends the request through the transport, waiting on the rate limiter first if one is configured."""
+        url = self._full_path(object_name, self.version, path, base_uri=self.base_uri)
+        return self._send_url(method, url, timeout=self.timeout_for(object_name), **kwargs)
+
+    def timeout_for(self, object_name):
+        """
+        Returns the timeout for a request to <object_name>: its entry in <timeouts>, else the client's <timeout>,
+        either seconds or a (connect, read) pair as requests takes them. Inside a Deadline, both are capped by the
+        time remaining, and PardotDeadlineExceededError is raised once none is left.
+        """
+        timeout = self.timeouts.get(object_name, self.timeout)
+        deadline = current_deadline()
+        if deadline is not None:
+            return deadline.cap(timeout)
+        return timeout
+
+    def _send_url(self, method, url, **kwargs):
+        request = self._current_call()
+        if request is None:
+            return self._transport_send(method, url, **kwargs)
+        take_connection_time()
+        try:
+            response = self._transport_send(method, url, **kwargs)
+        except Exception:
+            request.record_failed_attempt(take_connection_time())
+            raise
+        request.record_attempt(response, take_connection_time(), streamed=kwargs.get('stream', False))
+        return response
+
+    def _transport_send(self, method, url, **kwargs):
+        if self.rate_limiter is None:
+            return getattr(self.transport, method)(url, **kwargs)
+        with self.rate_limiter.limit():
+            return getattr(self.transport, method)(url, **kwargs)
+
+    def _current_call(self):
+        """The RequestInfo of the instrumented call in progress on this thread, or None."""
+        calls = getattr(self._calls, 'stack', None)
+        return calls[-1] if calls else None
+
+    def _note_error(self, err):
+        """Lets the rate limiter know when Pardot reports that the daily quota has been spent."""
+        if self.rate_limiter is not None and str(err.err_code) == str(DAILY_LIMIT_ERROR_CODE):
+            self.rate_limiter.exhaust_quota()
+
+    def _handle_expired_api_key(self, err, retries, method, object_name, path, params, api_key=None, **kwargs):
         """
         Tries to refresh an expired API key and re-issue the HTTP request. If the refresh has already been attempted,
-        an error is raised.
+        an error is raised. <api_key> is the key the failed request was sent with; if another thread has already
+        replaced it, the request is simply re-issued with the new key. Extra <kwargs> are passed on to <method>.
         """
-        if retries != 0:
+        if retries != 0 or object_name == 'login':
             raise err
-        self.api_key = None
-        if self.authenticate():
-            response = getattr(self, method)(object_name=object_name, path=path, params=params, retries=1)
+        if self.key_cache is not None and api_key is not None:
+            self.key_cache.invalidate(self._key_cache_id(), api_key)
+        if self._refresh_api_key(stale_key=api_key):
+            request = self._current_call()
+            if request is not None:
+                request.reauthenticated = True
+            response = getattr(self, method)(object_name=object_name, path=path, params=params, retries=1, **kwargs)
             return response
         else:
             raise err
 
     @staticmethod
-    def _full_path(object_name, version, path=None):
+    def _full_path(object_name, version, path=None, base_uri=BASE_URI):
         """Builds the full path for the API request"""
-        full = '{0}/api/{1}/version/{2}'.format(BASE_URI, object_name, version)
+        full = '{0}/api/{1}/version/{2}'.format(base_uri, object_name, version)
         if path:
             return full + '{0}'.format(path)
         return full
@@ -146,23 +431,86 @@ class PardotAPI(object):
             return response.status_code
 
     def _check_auth(self, object_name):
+        """
+        Makes sure a usable API key is set before a request. A missing or expired key is refreshed before returning;
+        a key close to expiry is refreshed on a background thread while requests carry on with the current one.
+        """
         if object_name == 'login':
             return
-        if self.api_key is None:
-            self.authenticate()
+        api_key = self.api_key
+        if api_key is None or self._api_key_expired():
+            self._refresh_api_key(stale_key=api_key)
+        elif self._api_key_expired(margin=self.api_key_refresh_margin):
+            self._refresh_api_key_in_background()
+
+    def _api_key_expired(self, margin=0):
+        """True if the API key expires within <margin> seconds. Keys set directly on the client never expire here."""
+        return self._api_key_expires_at is not None and time.time() >= self._api_key_expires_at - margin
 
     def authenticate(self):
         """
          Authenticates the user and sets the API key if successful. Returns True if authentication is successful,
-         False if authentication fails.
+         False if authentication fails. Concurrent calls share a single login request.
+        """
+        return self._refresh_api_key(stale_key=self.api_key)
+
+    def _refresh_api_key(self, stale_key):
         """
+        Replaces <stale_key> with a new API key. Only one login runs at a time: other threads wait for it and use
+        its result, and a thread arriving after <stale_key> has already been replaced does not log in again. With a
+        key cache configured, a valid key cached by another process is used instead of logging in, and a key from a
+        successful login is cached for others.
+        """
+        def refresh():
+            if self.api_key is not None and self.api_key != stale_key and not self._api_key_expired():
+                return True
+            if self.key_cache is None:
+                return self._login()
+            cached = self.key_cache.get(self._key_cache_id())
+            if cached is not None and cached[0] != stale_key:
+                self.api_key, self._api_key_expires_at = cached
+                return True
+            if not self._login():
+                return False
+            self.key_cache.set(self._key_cache_id(), self.api_key, self._api_key_expires_at)
+            return True
+
+        refreshed, _ = self._auth_flight.do('login', refresh)
+        return refreshed
+
+    def _key_cache_id(self):
+        return cache_key(self.email, self.user_key, self.version)
+
+    def _refresh_api_key_in_background(self):
+        if self._auth_flight.in_flight('login'):
+            return
+        refresher = threading.Thread(target=self._refresh_api_key_quietly, args=(self.api_key,))
+        refresher.daemon = True
+        refresher.start()
+
+    def _refresh_api_key_quietly(self, stale_key):
+        """
+        Runs _refresh_api_key on the background thread. If the login fails, e.g. because of a network error or the
+        daily quota, the current key stays in use; once it expires, the next call refreshes it in the foreground and
+        raises any error there. Transport errors, requests' included, are OSErrors.
+        """
+        try:
+            self._refresh_api_key(stale_key)
+        except (PardotAPIError, PardotQuotaExceededError, PardotDeadlineExceededError, OSError):
+            pass
+
+    def _login(self):
+        """Requests a new API key. Returns True and stores the key and its expiry if the login succeeds."""
         try:
+            logged_in_at = time.time()
             auth = self.post('login', params={'email': self.email, 'password': self.password})
             if type(auth) is int:
                 # sometimes the self.post method will return a status code instead of JSON response on failures
                 return False
-            self.api_key = auth.get('api_key', None)
-            if self.api_key is not None:
+            api_key = auth.get('api_key', None)
+            if api_key is not None:
+                self._api_key_expires_at = logged_in_at + API_KEY_LIFETIME
+                self.api_key = api_key
                 return True
             return False
         except PardotAPIError:
@@ -175,4 +523,9 @@ class PardotAPI(object):
         if not self.user_key or not self.api_key:
             raise Exception('Cannot build Authorization header. user or api key is empty')
         auth_string = 'Pardot api_key=%s, user_key=%s' % (self.api_key, self.user_key)
-        return {'Authorization': auth_string}
\ No newline at end of file
+        return {'Authorization': auth_string}
+
+
+def _is_read(path):
+    """True if <path> is an operation that only reads data."""
+    return path is not None and path.startswith(READ_PATH_PREFIXES)
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from .errors import PardotDeadlineExceededError
+
+_active = threading.local()
+
+
+class Deadline(object):
+    """
+    A time budget of <seconds> for an operation made of many requests, such as walking every page of a query or
+    writing a million prospects. Operations that accept a deadline stop once it has passed and raise
+    PardotDeadlineExceededError, reporting how far they got.
+
+    Used as a context manager, a deadline also applies to every request made on the current thread inside the block:
+    each request's connect and read timeouts are capped by the time remaining, retries that would end past it are
+    not started, and no request is sent once it has passed. Deadlines may be nested; the earliest one applies.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.time() + seconds
+
+    def remaining(self):
+        """Seconds left, never less than 0."""
+        return max(0.0, self.expires_at - time.time())
+
+    @property
+    def expired(self):
+        return time.time() >= self.expires_at
+
+    def check(self, progress=None):
+        """Raises PardotDeadlineExceededError, with <progress>, if the deadline has passed."""
+        if self.expired:
+            raise PardotDeadlineExceededError(
+                'Deadline of {0} seconds exceeded'.format(self.seconds), progress=progress)
+
+    def cap(self, timeout):
+        """
+        Returns <timeout> (seconds, a (connect, read) pair, or None for no timeout) with each part cut down to the
+        time remaining. Raises PardotDeadlineExceededError if none is left.
+        """
+        self.check()
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining, remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def __enter__(self):
+        stack = _active.__dict__.setdefault('stack', [])
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active.stack.pop()
+
+    def __repr__(self):
+        return '<Deadline {0:.1f} of {1} seconds remaining>'.format(self.remaining(), self.seconds)
+
+
+def as_deadline(deadline):
+    """Returns <deadline> as a Deadline: None stays None, and a number of seconds starts a new Deadline."""
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    return Deadline(deadline)
+
+
+def current_deadline():
+    """Returns the earliest Deadline entered on this thread, or None."""
+    stack = getattr(_active, 'stack', None)
+    if not stack:
+        return None
+    return min(stack, key=lambda deadline: deadline.expires_at)
@@ -18,3 +18,24 @@ class PardotAPIError(Exception):
 
 class PardotAPIArgumentError(Exception):
     pass
+
+
+class PardotQuotaExceededError(Exception):
+    """Raised by a RateLimiter, without calling the API, once the account's daily API quota has been spent."""
+    pass
+
+
+class PardotExportError(Exception):
+    """Raised when an export job fails, or does not complete within the time allowed for it."""
+    pass
+
+
+class PardotDeadlineExceededError(Exception):
+    """
+    Raised when an operation runs out of the time budget given by a Deadline. <progress> says how far it got, in
+    terms the operation documents, so that it can be resumed.
+    """
+
+    def __init__(self, message='Deadline exceeded', progress=None):
+        Exception.__init__(self, message)
+        self.progress = progress
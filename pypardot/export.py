@@ -0,0 +1,187 @@
+import csv
+import io
+import json
+import os
+
+from .records import PARSERS
+from .schema import OBJECT_FIELD_MAP, field_types
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ('csv', 'parquet', 'arrow')
+DEFAULT_CHUNK_SIZE = 10000
+# describe() field types with a datatype other than string.
+DESCRIBE_DATATYPES = {'number': 'float'}
+
+
+class ColumnarSink(object):
+    """
+    Writes query results to a CSV, Parquet or Arrow IPC file at <path>. Rows are converted into per-column buffers
+    that are written out every <chunk_size> rows, so memory use is bounded by one chunk however many rows are
+    written. Fed from iter_query, preferably with stream=True, a whole object is exported without holding it in
+    memory.
+
+    Columns are the fields of <schema> (a field map like pypardot.schema.OBJECT_FIELD_MAP[object_name], used by
+    default, or one built by schema_from_describe()), followed by the other fields found in the first chunk. Pass
+    <fields> to choose the columns instead. Values are parsed to their field's datatype; nested values such as
+    campaign dicts are written as JSON. Parquet and Arrow files need pyarrow (pip install pypardot4[arrow]).
+    """
+
+    def __init__(self, path, object_name, format=None, schema=None, fields=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        format = format or os.path.splitext(path)[1].lstrip('.').lower()
+        if format not in FORMATS:
+            raise ValueError('format must be one of {0}'.format(', '.join(FORMATS)))
+        if format != 'csv' and pyarrow is None:
+            raise RuntimeError('Writing {0} files requires pyarrow, which is not installed.'.format(format))
+        self.path = path
+        self.object_name = object_name
+        self.format = format
+        self.types = field_types(object_name, schema)
+        self.fields = list(fields) if fields is not None else None
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._pending = []
+        self._columns = None
+        self._buffers = None
+        self._buffered = 0
+        self._writer = None
+        self._file = None
+
+    def write(self, rows):
+        """Writes every row of <rows>, an iterable of record dicts, and returns the number of rows written."""
+        count = 0
+        for row in rows:
+            if self._columns is None:
+                # Rows are only kept whole until the first chunk has decided the columns.
+                self._pending.append(row)
+                if len(self._pending) >= self.chunk_size:
+                    self.flush()
+            else:
+                for name, column in self._buffers.items():
+                    column.append(_convert(row.get(name), self.types.get(name)))
+                self._buffered += 1
+                if self._buffered >= self.chunk_size:
+                    self.flush()
+            count += 1
+        return count
+
+    def flush(self):
+        """Writes out the buffered rows."""
+        if self._columns is None:
+            if not self._pending:
+                return
+            self._open(self._pending)
+            pending, self._pending = self._pending, []
+            self.write(pending)
+        if not self._buffered:
+            return
+        self._write_chunk(self._buffers)
+        self.rows += self._buffered
+        self._buffers = dict((name, []) for name in self._columns)
+        self._buffered = 0
+
+    def close(self):
+        """Writes out the buffered rows and closes the file. A file with no rows gets just its header or schema."""
+        self.flush()
+        if self._columns is None:
+            self._open([])
+        if self._writer is not None and self.format != 'csv':
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self, rows):
+        if self.fields is not None:
+            self._columns = self.fields
+        else:
+            known = set(self.types)
+            extra = sorted(set(name for row in rows for name in row if name not in known))
+            self._columns = sorted(self.types, key=_field_order) + extra
+        self._buffers = dict((name, []) for name in self._columns)
+        if self.format == 'csv':
+            self._file = io.open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self._columns)
+            return
+        self._arrow_schema = pyarrow.schema([(name, _arrow_type(self.types.get(name))) for name in self._columns])
+        if self.format == 'parquet':
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, self._arrow_schema)
+        else:
+            self._file = pyarrow.OSFile(self.path, 'wb')
+            self._writer = pyarrow.ipc.new_file(self._file, self._arrow_schema)
+
+    def _write_chunk(self, columns):
+        if self.format == 'csv':
+            self._writer.writerows(zip(*[columns[name] for name in self._columns]))
+            return
+        batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(columns[name], type=self._arrow_schema.field(name).type) for name in self._columns],
+            schema=self._arrow_schema)
+        if self.format == 'parquet':
+            self._writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+
+def export(rows, path, object_name, **kwargs):
+    """Writes <rows> to <path> with a ColumnarSink and returns the number of rows written."""
+    with ColumnarSink(path, object_name, **kwargs) as sink:
+        sink.write(rows)
+    return sink.rows
+
+
+def schema_from_describe(response, object_name='prospectAccount'):
+    """
+    Builds a field map from a describe() response, such as ProspectAccounts.describe(), for use as a ColumnarSink or
+    record_class schema. Standard fields keep the types listed in pypardot.schema; number fields become floats and
+    every other field a string.
+    """
+    schema = dict(OBJECT_FIELD_MAP.get(object_name, {}))
+    result = response.get('result') or {}
+    fields = result.get('field') or []
+    if isinstance(fields, dict):
+        fields = [fields]
+    for field in fields:
+        attributes = field.get('@attributes', field)
+        name = attributes.get('id') or attributes.get('name')
+        if not name or name in schema:
+            continue
+        datatype = DESCRIBE_DATATYPES.get(str(attributes.get('type', '')).lower(), 'string')
+        schema[name] = {'datatype': datatype}
+    return schema
+
+
+def _field_order(name):
+    return (name != 'id', name)
+
+
+def _convert(value, datatype):
+    if value is None:
+        return None
+    if datatype in PARSERS:
+        kind, parse = PARSERS[datatype]
+        return value if type(value) is kind else parse(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value if isinstance(value, str) else str(value)
+
+
+def _arrow_type(datatype):
+    return {
+        'integer': pyarrow.int64(),
+        'float': pyarrow.float64(),
+        'boolean': pyarrow.bool_(),
+        'timestamp': pyarrow.timestamp('s'),
+    }.get(datatype, pyarrow.string())
@@ -0,0 +1,206 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .errors import PardotAPIError, PardotExportError
+
+PENDING_STATES = ('Waiting', 'Processing')
+COMPLETE_STATE = 'Complete'
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 65536
+
+
+class ExportJobManager(object):
+    """
+    Runs Pardot exports from start to finish: submits the export, polls its state with exponential backoff (from
+    <poll_interval> up to <max_poll_interval> seconds, giving up after <timeout> seconds if set), downloads its result
+    files into <directory> and yields their rows as dicts, like iter_query does for queries.
+
+    Result files are downloaded in <part_size> byte ranges by <workers> threads when the server supports range
+    requests. Completed ranges are recorded next to the partial file, so a download interrupted by an error or a
+    restart resumes where it stopped instead of starting over. The id of each export run() creates is saved in
+    <directory> as well, so that running the same export again after an interruption carries on with that export
+    and its partial downloads rather than creating a new one. Requests go through the client, so its rate limiter
+    applies to them.
+    """
+
+    def __init__(self, client, directory, workers=4, part_size=DEFAULT_PART_SIZE, poll_interval=2,
+                 max_poll_interval=60, timeout=None):
+        self.client = client
+        self.directory = directory
+        self.workers = workers
+        self.part_size = part_size
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+    def run(self, object, procedure, fields=None, **arguments):
+        """
+        Creates an export and yields every row of its results once it has completed and been downloaded. If an
+        earlier run of the same export was interrupted, its export is resumed instead, unless it has since failed or
+        expired. The saved export id is removed once every row has been yielded.
+        """
+        saved = os.path.join(self.directory, 'export-{0}.json'.format(
+            _fingerprint(object, procedure, fields, arguments)))
+        export_id = self._resumable(saved)
+        if export_id is None:
+            export_id = self.submit(object, procedure, fields=fields, **arguments)
+            with open(saved, 'w') as saved_file:
+                json.dump({'id': export_id}, saved_file)
+        for row in self.rows(self.download(self.wait(export_id))):
+            yield row
+        os.remove(saved)
+
+    def submit(self, object, procedure, fields=None, **arguments):
+        """Creates an export and returns its id."""
+        response = self.client.exports.create(object=object, procedure=procedure, fields=fields, **arguments)
+        return _export(response)['id']
+
+    def wait(self, export_id):
+        """Polls the export until it completes and returns it. Raises PardotExportError if it fails or times out."""
+        started = time.time()
+        delay = self.poll_interval
+        while True:
+            export = _export(self.client.exports.read(id=export_id))
+            state = export.get('state')
+            if state == COMPLETE_STATE:
+                return export
+            if state not in PENDING_STATES:
+                raise PardotExportError('Export {0} ended in state {1}'.format(export_id, state))
+            if self.timeout is not None and time.time() + delay - started > self.timeout:
+                raise PardotExportError('Export {0} did not complete within {1} seconds'.format(
+                    export_id, self.timeout))
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    def download(self, export):
+        """Downloads the result files of a completed export and returns their local paths."""
+        refs = export.get('resultRefs') or []
+        if not isinstance(refs, list):
+            refs = [refs]
+        paths = []
+        for index, url in enumerate(refs):
+            path = os.path.join(self.directory, 'export-{0}-{1}.csv'.format(export['id'], index))
+            self.fetch(url, path)
+            paths.append(path)
+        return paths
+
+    def fetch(self, url, path):
+        """Downloads <url> to <path>, in parallel ranges if the server allows it, resuming a previous attempt."""
+        if os.path.exists(path):
+            return path
+        partial = path + '.part'
+        response = self.client.download(url, headers={'Range': 'bytes=0-0'})
+        size = _range_size(response)
+        if response.status_code == 416:
+            # The range cannot be satisfied because the file is empty.
+            response.close()
+            open(partial, 'wb').close()
+        elif size is None:
+            self._write_whole(response, partial)
+        else:
+            response.close()
+            self._fetch_ranges(url, partial, size)
+        os.rename(partial, path)
+        return path
+
+    def _resumable(self, saved):
+        """Returns the export id saved at <saved> if that export is still running or complete, else None."""
+        try:
+            with open(saved) as saved_file:
+                export_id = json.load(saved_file)['id']
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+        try:
+            state = _export(self.client.exports.read(id=export_id)).get('state')
+        except PardotAPIError:
+            return None
+        return export_id if state in PENDING_STATES + (COMPLETE_STATE,) else None
+
+    def rows(self, paths):
+        """Yields the rows of the CSV result files at <paths> as dicts."""
+        for path in paths:
+            with io.open(path, newline='', encoding='utf-8') as result_file:
+                for row in csv.DictReader(result_file):
+                    yield row
+
+    def _write_whole(self, response, partial):
+        try:
+            _check_status(response, 200)
+            with open(partial, 'wb') as out:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    out.write(chunk)
+        finally:
+            response.close()
+
+    def _fetch_ranges(self, url, partial, size):
+        progress_path = partial + '.progress'
+        done = set()
+        if os.path.exists(partial) and os.path.exists(progress_path):
+            with open(progress_path) as progress_file:
+                progress = json.load(progress_file)
+            if progress.get('size') == size and progress.get('part_size') == self.part_size:
+                done = set(progress['done'])
+        if not done:
+            with open(partial, 'wb') as out:
+                out.truncate(size)
+        lock = threading.Lock()
+
+        def fetch_range(start):
+            end = min(start + self.part_size, size) - 1
+            response = self.client.download(url, headers={'Range': 'bytes={0}-{1}'.format(start, end)})
+            try:
+                _check_status(response, 206)
+                with open(partial, 'r+b') as out:
+                    out.seek(start)
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        out.write(chunk)
+            finally:
+                response.close()
+            with lock:
+                done.add(start)
+                with open(progress_path, 'w') as progress_file:
+                    json.dump({'size': size, 'part_size': self.part_size, 'done': sorted(done)}, progress_file)
+
+        starts = [start for start in range(0, size, self.part_size) if start not in done]
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for _ in executor.map(fetch_range, starts):
+                pass
+        finally:
+            executor.shutdown(wait=True)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+
+
+def _export(response):
+    export = response.get('export') if isinstance(response, dict) else None
+    if not export:
+        raise PardotExportError('Unexpected export response: {0!r}'.format(response))
+    return export
+
+
+def _fingerprint(object, procedure, fields, arguments):
+    """Identifies an export by what it selects, so that a rerun of the same export can find the one saved."""
+    request = json.dumps([object, procedure, fields, arguments], sort_keys=True, default=str)
+    return hashlib.sha1(request.encode('utf-8')).hexdigest()[:16]
+
+
+def _range_size(response):
+    """Returns the full size of the file from a ranged response, or None if the server ignored the range."""
+    content_range = response.headers.get('Content-Range', '')
+    if response.status_code != 206 or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+def _check_status(response, expected):
+    if response.status_code != expected:
+        raise PardotExportError('Unexpected HTTP {0} response downloading export results'.format(
+            response.status_code))
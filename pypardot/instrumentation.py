@@ -0,0 +1,277 @@
+import bisect
+import re
+import threading
+import time
+
+# Upper bounds, in seconds, of the latency histogram buckets; slower requests fall in a final unbounded bucket.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_IDENTIFIER = re.compile(r'^(/do/\w+)((?:/[^/]+/[^/]+)*)$')
+
+
+def route(path):
+    """
+    Returns <path> with its identifier values replaced by placeholders, e.g. /do/read/id/{id} for /do/read/id/42, so
+    that requests for different records of an object are reported together.
+    """
+    match = _IDENTIFIER.match(path or '')
+    if not match:
+        return path or ''
+    parts = match.group(2).split('/')[1:]
+    return match.group(1) + ''.join('/{0}/{{{0}}}'.format(name) for name in parts[::2])
+
+
+class RequestInfo(object):
+    """
+    What is known about one client call, such as PardotAPI.get(), as it is made. Hooks receive the same object before
+    the request is sent and after the response, or error, is in; <state> is theirs to keep per-request values in.
+
+    A call may send several HTTP requests: <attempts> counts them, including retries and the request re-issued after
+    re-authenticating (<reauthenticated>), and is 0 for reads answered from the response cache or shared with an
+    identical concurrent read. <status>, <ttfb> (seconds until the response headers arrived) and the byte counts are
+    those of the last attempt; <connect> adds up the time spent opening new connections, name resolution and TLS
+    included, and is 0 when pooled ones were reused. <elapsed> is the duration of the whole call. If it failed,
+    <error> is the exception raised, and <err_code> Pardot's error code when Pardot reported one. Streamed responses
+    are timed until their first records have been decoded, and their <bytes_received> is taken from Content-Length.
+    With a custom transport whose responses do not carry the request sent, its timing or its body, <bytes_sent>,
+    <ttfb> and <bytes_received> are left as None.
+    """
+
+    def __init__(self, method, object_name, path):
+        self.method = method
+        self.object_name = object_name
+        self.path = path
+        self.route = route(path)
+        self.started_at = time.time()
+        self.elapsed = None
+        self.status = None
+        self.err_code = None
+        self.error = None
+        self.attempts = 0
+        self.reauthenticated = False
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connect = 0.0
+        self.ttfb = None
+        self.state = {}
+
+    @property
+    def retries(self):
+        """HTTP requests sent after the first one, other than the one re-issued after re-authenticating."""
+        return max(0, self.attempts - 1 - int(self.reauthenticated))
+
+    def record_attempt(self, response, connect, streamed=False):
+        self.attempts += 1
+        self.status = response.status_code
+        elapsed = getattr(response, 'elapsed', None)
+        self.ttfb = elapsed.total_seconds() if elapsed is not None else None
+        self.connect += connect
+        sent = getattr(response, 'request', None)
+        if sent is None:
+            self.bytes_sent = None
+        else:
+            body = getattr(sent, 'body', None)
+            self.bytes_sent = len(body) if body else 0
+        if streamed:
+            self.bytes_received = int((getattr(response, 'headers', None) or {}).get('Content-Length') or 0)
+        else:
+            content = getattr(response, 'content', None)
+            self.bytes_received = len(content) if content is not None else None
+
+    def record_failed_attempt(self, connect):
+        """Counts an attempt that got no response, e.g. because the connection failed."""
+        self.attempts += 1
+        self.connect += connect
+
+    def finish(self, error=None):
+        self.elapsed = time.time() - self.started_at
+        if error is not None:
+            self.error = error
+            self.err_code = getattr(error, 'err_code', None)
+
+
+class Instrument(object):
+    """
+    Base class of request hooks. Pass instruments to the client (PardotAPI(..., instruments=[...])) and each one's
+    before_request is called with a RequestInfo before a call sends anything, and after_response with the same object
+    once it has returned or raised. Hooks run on the calling thread and should not raise.
+    """
+
+    def before_request(self, request):
+        pass
+
+    def after_response(self, request):
+        pass
+
+
+class Histogram(object):
+    """Counts observations into fixed <buckets> (upper bounds, in seconds). Not thread-safe on its own."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percent):
+        """
+        Returns an upper bound of the <percent>th percentile: the bound of the bucket it falls in, or None if no values
+        were observed or it falls beyond the last bucket.
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], self.counts)),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+class _RouteStats(object):
+    def __init__(self, buckets):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.reauthentications = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = {}
+        self.err_codes = {}
+        self.latency = Histogram(buckets)
+        self.ttfb = Histogram(buckets)
+        self.connect = Histogram(buckets)
+
+    def add(self, request):
+        self.calls += 1
+        self.retries += request.retries
+        self.reauthentications += int(request.reauthenticated)
+        self.bytes_sent += request.bytes_sent or 0
+        self.bytes_received += request.bytes_received or 0
+        if request.error is not None:
+            self.errors += 1
+        if request.status is not None:
+            self.statuses[request.status] = self.statuses.get(request.status, 0) + 1
+        if request.err_code is not None:
+            self.err_codes[request.err_code] = self.err_codes.get(request.err_code, 0) + 1
+        self.latency.observe(request.elapsed)
+        if request.ttfb is not None:
+            self.ttfb.observe(request.ttfb)
+        if request.connect:
+            self.connect.observe(request.connect)
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'reauthentications': self.reauthentications,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'statuses': dict(self.statuses),
+            'err_codes': dict(self.err_codes),
+            'latency': self.latency.as_dict(),
+            'ttfb': self.ttfb.as_dict(),
+            'connect': self.connect.as_dict(),
+        }
+
+
+class HistogramCollector(Instrument):
+    """
+    Keeps in-memory, thread-safe statistics per object and route (see route()): call, error, retry and
+    re-authentication counts, bytes, HTTP statuses, Pardot error codes, and histograms of the call latency, the time
+    to first byte and the time spent opening connections. snapshot() returns them as a dict keyed by
+    '<object name> <route>', e.g. 'prospect /do/read/id/{id}'.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def after_response(self, request):
+        key = '{0} {1}'.format(request.object_name, request.route).rstrip()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _RouteStats(self.buckets)
+            stats.add(request)
+
+    def snapshot(self):
+        with self._lock:
+            return dict((key, stats.as_dict()) for key, stats in self._stats.items())
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+class OpenTelemetrySpans(Instrument):
+    """
+    Emits an OpenTelemetry client span for every call, named after the object and route, through <tracer> (by
+    default the global tracer provider's 'pypardot' tracer). Spans are children of whatever span is current when the
+    call is made, carry the request's status, error code, bytes, timings, retries and re-authentication as
+    attributes, and are marked as errors when the call raised. Needs opentelemetry-api
+    (pip install pypardot4[opentelemetry]), which is only imported here as it is slow to import.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+            from opentelemetry.trace import SpanKind, Status, StatusCode
+        except ImportError:
+            raise RuntimeError('OpenTelemetrySpans requires opentelemetry-api, which is not installed.')
+        self.tracer = tracer if tracer is not None else trace.get_tracer('pypardot')
+        self._client_kind = SpanKind.CLIENT
+        self._error_status = lambda description: Status(StatusCode.ERROR, description)
+
+    def before_request(self, request):
+        request.state['span'] = self.tracer.start_span(
+            'pardot {0} {1}'.format(request.object_name, request.route).rstrip(), kind=self._client_kind,
+            attributes={
+                'pardot.object': request.object_name,
+                'pardot.route': request.route,
+                'http.request.method': 'GET' if request.method in ('get', 'stream') else 'POST',
+            })
+
+    def after_response(self, request):
+        span = request.state.pop('span', None)
+        if span is None:
+            return
+        attributes = {
+            'pardot.attempts': request.attempts,
+            'pardot.retries': request.retries,
+            'pardot.reauthenticated': request.reauthenticated,
+            'pardot.connect_seconds': request.connect,
+        }
+        if request.bytes_sent is not None:
+            attributes['pardot.bytes_sent'] = request.bytes_sent
+        if request.bytes_received is not None:
+            attributes['pardot.bytes_received'] = request.bytes_received
+        if request.status is not None:
+            attributes['http.response.status_code'] = request.status
+        if request.ttfb is not None:
+            attributes['pardot.ttfb_seconds'] = request.ttfb
+        if request.err_code is not None:
+            attributes['pardot.err_code'] = str(request.err_code)
+        span.set_attributes(attributes)
+        if request.error is not None:
+            span.record_exception(request.error)
+            span.set_status(self._error_status(str(request.error)))
+        span.end()
@@ -0,0 +1,292 @@
+"""
+Resumable bulk jobs. A job checkpoints its progress to a SQLiteJobStore under a name of the caller's choosing, and
+running a job with the same name again carries on where the previous run stopped, whether it finished, failed or
+was killed.
+"""
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .bulk import BATCH_LIMIT, BulkError, ProspectBulkWriter
+from .export import ColumnarSink
+
+PENDING = 'pending'
+DONE = 'done'
+DEFAULT_PART_SIZE = 10000
+_PART_NUMBER = '[0-9]' * 5
+
+
+class SQLiteJobStore(object):
+    """
+    Keeps the checkpoints of any number of jobs in an SQLite database at <path>: each job's settings and state (such
+    as its cursor), the status of every batch it has started, and the records Pardot rejected. Every checkpoint is
+    committed before the job moves on, so it survives the process being killed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.executescript(
+                'CREATE TABLE IF NOT EXISTS jobs (job TEXT PRIMARY KEY, kind TEXT NOT NULL, settings TEXT NOT NULL, '
+                'state TEXT, updated_at REAL NOT NULL);'
+                'CREATE TABLE IF NOT EXISTS batches (job TEXT NOT NULL, batch INTEGER NOT NULL, status TEXT NOT NULL, '
+                'records INTEGER NOT NULL, PRIMARY KEY (job, batch));'
+                'CREATE TABLE IF NOT EXISTS failures (job TEXT NOT NULL, record_index INTEGER NOT NULL, '
+                'batch INTEGER NOT NULL, record TEXT NOT NULL, message TEXT, PRIMARY KEY (job, record_index));')
+            self._connection.commit()
+
+    def open(self, job, kind, settings):
+        """
+        Registers <job> with its <kind> and <settings>, or checks them against those it was started with, and
+        returns its saved state (None for a new job). Resuming a job with different settings raises ValueError.
+        """
+        settings = json.dumps(settings, sort_keys=True)
+        with self._lock:
+            row = self._connection.execute('SELECT kind, settings, state FROM jobs WHERE job = ?', (job,)).fetchone()
+            if row is None:
+                self._connection.execute('INSERT INTO jobs (job, kind, settings, updated_at) VALUES (?, ?, ?, ?)',
+                                         (job, kind, settings, time.time()))
+                self._connection.commit()
+                return None
+        if (row[0], row[1]) != (kind, settings):
+            raise ValueError('job {0!r} was started as a {1} with settings {2}'.format(job, row[0], row[1]))
+        return json.loads(row[2]) if row[2] else None
+
+    def save_state(self, job, state):
+        with self._lock:
+            self._connection.execute('UPDATE jobs SET state = ?, updated_at = ? WHERE job = ?',
+                                     (json.dumps(state), time.time(), job))
+            self._connection.commit()
+
+    def batches(self, job):
+        """Returns {batch id: (status, records)} for every batch of <job> that was started."""
+        with self._lock:
+            rows = self._connection.execute('SELECT batch, status, records FROM batches WHERE job = ?', (job,))
+            return dict((batch, (status, records)) for batch, status, records in rows)
+
+    def start_batch(self, job, batch, records):
+        """Records that <batch> is about to be sent, so that a crash while it is in flight is noticed on resume."""
+        with self._lock:
+            self._connection.execute('INSERT OR REPLACE INTO batches (job, batch, status, records) VALUES (?, ?, ?, ?)',
+                                     (job, batch, PENDING, records))
+            self._connection.commit()
+
+    def complete_batch(self, job, batch, failures=()):
+        """Marks <batch> done and saves its <failures>, BulkErrors, in the same transaction."""
+        with self._lock:
+            self._connection.execute('UPDATE batches SET status = ? WHERE job = ? AND batch = ?', (DONE, job, batch))
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO failures (job, record_index, batch, record, message) VALUES (?, ?, ?, ?, ?)',
+                [(job, failure.index, batch, json.dumps(failure.record, default=str), failure.message)
+                 for failure in failures])
+            self._connection.commit()
+
+    def failures(self, job):
+        """Returns the BulkErrors saved for <job>, in input order."""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT record_index, record, message FROM failures WHERE job = ? ORDER BY record_index', (job,))
+            return [BulkError(index, json.loads(record), message) for index, record, message in rows]
+
+    def reset(self, job):
+        """Forgets everything about <job>, so that it starts over when next run."""
+        with self._lock:
+            for table in ('jobs', 'batches', 'failures'):
+                self._connection.execute('DELETE FROM {0} WHERE job = ?'.format(table), (job,))
+            self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+
+class JobProgress(object):
+    """
+    Progress of a job: <done> of <total> records (None if unknown), of which <resumed> were done by earlier runs, and
+    <failed> were rejected by Pardot. Throughput and the estimated time to completion only count this run.
+    """
+
+    def __init__(self, total=None, resumed=0, failed=0):
+        self.total = total
+        self.resumed = resumed
+        self.done = resumed
+        self.failed = failed
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, records, failed=0):
+        with self._lock:
+            self.done += records
+            self.failed += failed
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started_at
+
+    @property
+    def records_per_second(self):
+        elapsed = self.elapsed
+        return (self.done - self.resumed) / elapsed if elapsed else 0.0
+
+    @property
+    def eta(self):
+        """Estimated seconds until the job completes, or None while the total or the throughput is unknown."""
+        rate = self.records_per_second
+        if self.total is None or not rate:
+            return None
+        return max(0, self.total - self.done) / rate
+
+    def __repr__(self):
+        eta = self.eta
+        return '<JobProgress {0} of {1} records, {2} failed, {3:.1f} records/s, eta {4}>'.format(
+            self.done, '?' if self.total is None else self.total, self.failed, self.records_per_second,
+            '?' if eta is None else '{0:.0f}s'.format(eta))
+
+
+class BulkWriteJob(object):
+    """
+    A ProspectBulkWriter that can be resumed. The input is split into batches of <batch_size> numbered by position,
+    and every batch is checkpointed in <store> under the job <name> before it is sent and once Pardot has answered,
+    along with the records Pardot rejected. Running the job again with the same input, in the same order, skips the
+    batches already done.
+
+    A batch that was in flight when a run died may or may not have been written. It is sent again on resume, which
+    is harmless for updates and upserts; for creates it is sent as an upsert, so it cannot create prospects twice.
+
+    <progress>, if given, is called with the JobProgress after every batch. <total>, the number of input records,
+    enables the estimated time to completion; it is taken from len(records) when the input has one.
+    """
+
+    kind = 'bulk_write'
+
+    def __init__(self, prospects, store, name, operation='upsert', batch_size=BATCH_LIMIT, workers=4, total=None,
+                 progress=None):
+        self.writer = ProspectBulkWriter(prospects, operation=operation, batch_size=batch_size)
+        self.resend = ProspectBulkWriter(prospects, operation='upsert' if operation == 'create' else operation,
+                                         batch_size=batch_size)
+        self.store = store
+        self.name = name
+        self.workers = workers
+        self.total = total
+        self.progress = progress
+
+    def run(self, records):
+        """Writes the records of <records> not written by earlier runs and returns the job's JobProgress."""
+        writer = self.writer
+        self.store.open(self.name, self.kind, {'operation': writer.operation, 'batch_size': writer.batch_size})
+        batches = self.store.batches(self.name)
+        done = sum(count for status, count in batches.values() if status == DONE)
+        total = self.total if self.total is not None else (len(records) if hasattr(records, '__len__') else None)
+        progress = JobProgress(total, resumed=done, failed=len(self.store.failures(self.name)))
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = set()
+        try:
+            for start, batch in writer.batches(records):
+                batch_id = start // writer.batch_size
+                status = batches.get(batch_id, (None, 0))[0]
+                if status == DONE:
+                    continue
+                if len(pending) >= self.workers * 2:
+                    completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        future.result()
+                sender = self.resend if status == PENDING else writer
+                pending.add(executor.submit(self._send, sender, batch_id, start, batch, progress))
+            for future in pending:
+                future.result()
+        finally:
+            executor.shutdown(wait=True)
+        return progress
+
+    def failures(self):
+        """Returns a BulkError for every record rejected so far, across runs."""
+        return self.store.failures(self.name)
+
+    def _send(self, sender, batch_id, start, batch, progress):
+        self.store.start_batch(self.name, batch_id, len(batch))
+        errors = sender.send_batch(batch)
+        failures = [BulkError(start + position, batch[position], message)
+                    for position, message in sorted(errors.items())]
+        self.store.complete_batch(self.name, batch_id, failures)
+        progress.add(len(batch), len(failures))
+        if self.progress is not None:
+            self.progress(progress)
+
+
+class QueryExportJob(object):
+    """
+    Exports every record of an object matching <criteria> to <directory>, as numbered part files of <part_size>
+    records named <name>-00000.<format> and so on, written by a ColumnarSink (format is csv, parquet or arrow).
+    <objects> is the object's client namespace, e.g. p.prospects, and records are walked in id order.
+
+    Each part is written under a temporary name and renamed once complete, then the id it ended at is checkpointed
+    in <store>. Running the job again continues with the next part from that id, so records are never exported
+    twice; a part left half written by a killed run is discarded and written again. Extra <sink_options> are passed
+    to ColumnarSink, and <progress> is called with the JobProgress after every part.
+    """
+
+    kind = 'query_export'
+
+    def __init__(self, objects, store, name, directory, format='csv', part_size=DEFAULT_PART_SIZE, progress=None,
+                 sink_options=None, **criteria):
+        self.objects = objects
+        self.store = store
+        self.name = name
+        self.directory = directory
+        self.format = format
+        self.part_size = part_size
+        self.progress = progress
+        self.sink_options = sink_options or {}
+        self.criteria = criteria
+
+    def run(self):
+        """Exports the records not exported by earlier runs and returns the job's JobProgress."""
+        settings = {'object': self.objects.object_name, 'format': self.format, 'part_size': self.part_size,
+                    'criteria': self.criteria}
+        state = self.store.open(self.name, self.kind, settings) or {
+            'cursor': self.criteria.get('id_greater_than'), 'part': 0, 'records': 0}
+        for stale in glob.glob(self._part_path(_PART_NUMBER) + '.tmp'):
+            os.remove(stale)
+
+        criteria = dict(self.criteria)
+        if state['cursor'] is not None:
+            criteria['id_greater_than'] = state['cursor']
+        remaining = self.objects.query(**dict(criteria, limit=1))['total_results']
+        progress = JobProgress(state['records'] + remaining, resumed=state['records'])
+        rows = self.objects.iter_query(**criteria)
+        while True:
+            last = []
+            path = self._part_path('{0:05d}'.format(state['part']))
+            sink = ColumnarSink(path + '.tmp', self.objects.object_name, format=self.format, **self.sink_options)
+            with sink:
+                count = sink.write(self._take(rows, last))
+            if not count:
+                os.remove(path + '.tmp')
+                return progress
+            os.rename(path + '.tmp', path)
+            state = {'cursor': last[0]['id'], 'part': state['part'] + 1, 'records': state['records'] + count}
+            self.store.save_state(self.name, state)
+            progress.add(count)
+            if self.progress is not None:
+                self.progress(progress)
+
+    def parts(self):
+        """Returns the paths of the completed part files, in order."""
+        return sorted(glob.glob(self._part_path(_PART_NUMBER)))
+
+    def _part_path(self, part):
+        return os.path.join(self.directory, '{0}-{1}.{2}'.format(self.name, part, self.format))
+
+    def _take(self, rows, last):
+        """Yields up to part_size records from <rows>, keeping the latest one in <last>."""
+        for _ in range(self.part_size):
+            row = next(rows, None)
+            if row is None:
+                return
+            last[:] = [row]
+            yield row
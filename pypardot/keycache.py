@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def cache_key(email, user_key, version):
+    """Identifies one set of credentials without storing the password or user key in the clear."""
+    return hashlib.sha256('{0}\n{1}\n{2}'.format(email, user_key, version).encode('utf-8')).hexdigest()
+
+
+class FileKeyCache(object):
+    """
+    Stores API keys and their expiry timestamps in a JSON file at <path>, so that processes, cron jobs and restarts
+    on the same host reuse a valid key instead of logging in again. Writes are guarded by an advisory file lock and
+    replace the file atomically. The file holds live API keys, so it is created readable by its owner only.
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError('FileKeyCache requires fcntl, which is not available on this platform.')
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (api_key, expires_at) for <key> if a key that has not expired is cached, else None."""
+        entry = self._update(lambda entries: entries.get(key))
+        if entry and entry['expires_at'] > time.time():
+            return entry['api_key'], entry['expires_at']
+        return None
+
+    def set(self, key, api_key, expires_at):
+        def store(entries):
+            entries[key] = {'api_key': api_key, 'expires_at': expires_at}
+        self._update(store)
+
+    def invalidate(self, key, api_key):
+        """Drops the entry for <key>, unless another process has already replaced <api_key> with a newer key."""
+        def drop(entries):
+            if key in entries and entries[key]['api_key'] == api_key:
+                del entries[key]
+        self._update(drop)
+
+    def _update(self, func):
+        with self._lock:
+            with open(self.path + '.lock', 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    entries = self._read()
+                    before = json.dumps(entries, sort_keys=True)
+                    result = func(entries)
+                    if json.dumps(entries, sort_keys=True) != before:
+                        self._write(entries)
+                    return result
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        temporary = '{0}.{1}.tmp'.format(self.path, os.getpid())
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w') as cache_file:
+            json.dump(entries, cache_file)
+        os.rename(temporary, self.path)
+
+
+class SQLiteKeyCache(object):
+    """
+    Stores API keys and their expiry timestamps in an SQLite database at <path>. SQLite's own locking makes it safe
+    to share between processes, including on platforms without fcntl. Like FileKeyCache's file, the database is
+    created readable by its owner only.
+    """
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS api_keys (key TEXT PRIMARY KEY, api_key TEXT NOT NULL, '
+                'expires_at REAL NOT NULL)')
+
+    def get(self, key):
+        with self._connect() as connection:
+            row = connection.execute(
+                'SELECT api_key, expires_at FROM api_keys WHERE key = ? AND expires_at > ?',
+                (key, time.time())).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, key, api_key, expires_at):
+        with self._connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO api_keys (key, api_key, expires_at) VALUES (?, ?, ?)',
+                               (key, api_key, expires_at))
+
+    def invalidate(self, key, api_key):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM api_keys WHERE key = ? AND api_key = ?', (key, api_key))
+
+    def _connect(self):
+        return _Connection(sqlite3.connect(self.path, timeout=self.timeout))
+
+
+class _Connection(object):
+    """sqlite3 connection context manager that commits on success and always closes."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+        finally:
+            self.connection.close()
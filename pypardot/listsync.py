@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .errors import PardotAPIError
+from .ratelimit import CONCURRENT_LIMIT_ERROR_CODE, DAILY_LIMIT_ERROR_CODE
+
+ADD = 'add'
+REMOVE = 'remove'
+OPT_OUT = 'opt_out'
+OPT_IN = 'opt_in'
+# Errors about the account rather than a prospect: an invalid API key (also what a failed login leads to), a failed
+# login, and the daily and concurrent request limits. Every further operation would fail the same way.
+ACCOUNT_ERROR_CODES = ('1', '15', str(DAILY_LIMIT_ERROR_CODE), str(CONCURRENT_LIMIT_ERROR_CODE))
+
+
+class ListSyncPlan(object):
+    """
+    The membership changes that bring a list in line with the desired set of prospects. Each attribute is a set of
+    prospect ids: <to_add> and <to_remove> are memberships to create and delete, <to_opt_out> and <to_opt_in> are
+    existing memberships whose opted_out flag must change. <fingerprint> identifies the desired state the plan was
+    made for; see ListSync.
+    """
+
+    def __init__(self, list_id, to_add=(), to_remove=(), to_opt_out=(), to_opt_in=(), opted_out=(), fingerprint=None):
+        self.list_id = list_id
+        self.to_add = set(to_add)
+        self.to_remove = set(to_remove)
+        self.to_opt_out = set(to_opt_out)
+        self.to_opt_in = set(to_opt_in)
+        # New memberships that must be created opted out.
+        self.opted_out = set(opted_out)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def diff(cls, list_id, current, desired, opted_out=None):
+        """
+        Computes the plan from <current>, a dict of prospect id to opted_out flag for the list's memberships, and the
+        <desired> prospect ids. If <opted_out> (a subset of desired ids) is given, opt-out flags are synced too.
+        """
+        desired = set(desired)
+        members = set(current)
+        plan = cls(list_id, to_add=desired - members, to_remove=members - desired)
+        if opted_out is not None:
+            opted_out = set(opted_out) & desired
+            kept = desired & members
+            plan.to_opt_out = set(pid for pid in kept & opted_out if not current[pid])
+            plan.to_opt_in = set(pid for pid in kept - opted_out if current[pid])
+            plan.opted_out = plan.to_add & opted_out
+        return plan
+
+    def operations(self):
+        """Yields the (operation, prospect_id) pairs of the plan."""
+        for operation, ids in ((REMOVE, self.to_remove), (OPT_OUT, self.to_opt_out), (OPT_IN, self.to_opt_in),
+                               (ADD, self.to_add)):
+            for prospect_id in sorted(ids):
+                yield operation, prospect_id
+
+    def discard(self, operation, prospect_id):
+        """Drops a completed operation from the plan."""
+        self._ids(operation).discard(prospect_id)
+
+    def __len__(self):
+        return len(self.to_add) + len(self.to_remove) + len(self.to_opt_out) + len(self.to_opt_in)
+
+    def save(self, path):
+        with open(path, 'w') as plan_file:
+            json.dump({
+                'list_id': self.list_id,
+                'to_add': sorted(self.to_add),
+                'to_remove': sorted(self.to_remove),
+                'to_opt_out': sorted(self.to_opt_out),
+                'to_opt_in': sorted(self.to_opt_in),
+                'opted_out': sorted(self.opted_out),
+                'fingerprint': self.fingerprint,
+            }, plan_file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as plan_file:
+            return cls(**json.load(plan_file))
+
+    def _ids(self, operation):
+        return {ADD: self.to_add, REMOVE: self.to_remove, OPT_OUT: self.to_opt_out, OPT_IN: self.to_opt_in}[operation]
+
+
+class ListSyncResult(object):
+    """Counts of applied operations by type, the (operation, prospect_id, message) of each failure, and timing."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.planned = len(plan)
+        self.applied = dict((operation, 0) for operation in (ADD, REMOVE, OPT_OUT, OPT_IN))
+        self.errors = []
+        self.started_at = time.time()
+        self.finished_at = None
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    def __repr__(self):
+        return '<ListSyncResult list {0}: {1} planned, {2} applied, {3} errors in {4:.1f}s>'.format(
+            self.plan.list_id, self.planned, sum(self.applied.values()), len(self.errors), self.elapsed)
+
+
+class ListSync(object):
+    """
+    Syncs the membership of one list to a desired set of prospects. The list's current memberships are streamed
+    with iter_query, diffed against the desired ids with set operations, and only the differences are written, by
+    <workers> threads. Requests go through the client, so its rate limiter and retry policy apply to them.
+
+    With <state_path> set, the plan is saved there before any write and each completed operation is appended to a
+    journal next to it. If the sync is interrupted, running it again with the same <state_path>, list and desired
+    prospects resumes the saved plan, skipping completed operations, without reading the list again; a plan saved
+    for another list or other desired prospects is discarded and the list diffed afresh. Both files are removed
+    once every operation has been attempted, even if some failed, so that the next sync diffs the list again rather
+    than replaying operations that may never succeed.
+
+    Errors about a prospect are recorded in the result and the sync carries on. An error about the account, such as
+    the daily API limit being reached or the API key being refused, stops the sync: no further operation is sent,
+    the PardotAPIError is raised and the saved plan is kept for the next run to resume.
+    """
+
+    def __init__(self, listmemberships, list_id, workers=4, state_path=None):
+        self.listmemberships = listmemberships
+        self.list_id = list_id
+        self.workers = workers
+        self.state_path = state_path
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Returns {prospect_id: opted_out} for the list's current memberships."""
+        memberships = {}
+        for membership in self.listmemberships.iter_query(list_id=self.list_id):
+            memberships[int(membership['prospect_id'])] = _flag(membership.get('opted_out'))
+        return memberships
+
+    def plan(self, desired_prospect_ids, opted_out_prospect_ids=None):
+        """
+        Returns the saved plan when resuming the sync of the same list to the same prospects, else diffs the list
+        against the desired prospect ids.
+        """
+        desired = [int(pid) for pid in desired_prospect_ids]
+        opted_out = None if opted_out_prospect_ids is None else [int(pid) for pid in opted_out_prospect_ids]
+        fingerprint = _fingerprint(desired, opted_out)
+        if self.state_path is not None and os.path.exists(self.state_path):
+            plan = ListSyncPlan.load(self.state_path)
+            if plan.list_id == self.list_id and plan.fingerprint == fingerprint:
+                for operation, prospect_id in self._journal():
+                    plan.discard(operation, prospect_id)
+                return plan
+            self._remove_state()
+        plan = ListSyncPlan.diff(self.list_id, self.current(), desired, opted_out)
+        plan.fingerprint = fingerprint
+        if self.state_path is not None:
+            plan.save(self.state_path)
+        return plan
+
+    def apply(self, plan):
+        """Applies every operation of <plan> and returns a ListSyncResult."""
+        result = ListSyncResult(plan)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = set()
+        try:
+            for operation, prospect_id in list(plan.operations()):
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(executor.submit(self._apply, plan, operation, prospect_id, result, stop))
+            for future in pending:
+                future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            result.finished_at = time.time()
+        self._remove_state()
+        return result
+
+    def sync(self, desired_prospect_ids, opted_out_prospect_ids=None):
+        """Plans and applies the sync in one call."""
+        return self.apply(self.plan(desired_prospect_ids, opted_out_prospect_ids))
+
+    def _apply(self, plan, operation, prospect_id, result, stop):
+        if stop.is_set():
+            return
+        memberships = self.listmemberships
+        try:
+            if operation == ADD:
+                params = {'opted_out': 1} if prospect_id in plan.opted_out else {}
+                memberships.create(list_id=self.list_id, prospect_id=prospect_id, **params)
+            elif operation == REMOVE:
+                memberships.delete(list_id=self.list_id, prospect_id=prospect_id)
+            else:
+                memberships.update(list_id=self.list_id, prospect_id=prospect_id,
+                                   opted_out=1 if operation == OPT_OUT else 0)
+        except PardotAPIError as err:
+            if str(err.err_code) in ACCOUNT_ERROR_CODES:
+                stop.set()
+                raise
+            with self._lock:
+                result.errors.append((operation, prospect_id, err.message))
+            return
+        with self._lock:
+            plan.discard(operation, prospect_id)
+            result.applied[operation] += 1
+            if self.state_path is not None:
+                with open(self._journal_path(), 'a') as journal:
+                    journal.write('{0} {1}\n'.format(operation, prospect_id))
+
+    def _journal(self):
+        if not os.path.exists(self._journal_path()):
+            return []
+        with open(self._journal_path()) as journal:
+            entries = [line.split() for line in journal]
+        return [(entry[0], int(entry[1])) for entry in entries if len(entry) == 2]
+
+    def _journal_path(self):
+        return self.state_path + '.journal'
+
+    def _remove_state(self):
+        if self.state_path is None:
+            return
+        for path in (self.state_path, self._journal_path()):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _fingerprint(desired, opted_out):
+    """Identifies a desired state: the sorted desired prospect ids and opted-out ids (None when not synced)."""
+    state = [sorted(set(desired)), None if opted_out is None else sorted(set(opted_out))]
+    return hashlib.sha1(json.dumps(state).encode('utf-8')).hexdigest()
+
+
+def _flag(value):
+    return value in (True, 1, '1', 'true', 'True')
@@ -0,0 +1,233 @@
+import re
+
+from ..errors import PardotAPIArgumentError
+from ..pagination import iter_query, read_many
+
+_PLACEHOLDER = re.compile(r'{(\w+)}')
+
+# How identifiers are named in the errors raised when they are missing. Others are named as written.
+IDENTIFIER_LABELS = {
+    'fid': 'CRM FID',
+    'list_id': 'a list ID',
+    'prospect_id': 'a prospect ID',
+    'prospect_email': 'a prospect email',
+    'emailTemplateID': 'email template id',
+}
+
+
+class Operation(object):
+    """
+    One endpoint of a Pardot object. <path> is the API path, with a {placeholder} for each identifier the caller
+    must supply, e.g. '/do/read/id/{id}'. <list_params> are required comma separated id lists, sent without spaces,
+    and <params> are optional parameters that may also be passed positionally after the identifiers; any other
+    keyword arguments are sent as they are.
+
+    <returns> decides what the method returns: 'response' for the API response, 'records' for a query result whose
+    records are always a list, or 'deleted' for True if Pardot answered 204 No Content and False otherwise.
+    """
+
+    RETURNS = ('response', 'records', 'deleted')
+
+    def __init__(self, path, doc, method='post', list_params=(), params=(), returns='response', verb=None):
+        if returns not in self.RETURNS:
+            raise ValueError('returns must be one of {0}'.format(', '.join(self.RETURNS)))
+        self.path = path
+        self.doc = doc
+        self.method = method
+        self.identifiers = tuple(_PLACEHOLDER.findall(path))
+        self.list_params = tuple(list_params)
+        self.params = tuple(params)
+        self.returns = returns
+        self.verb = verb
+
+    @property
+    def positional(self):
+        """The parameters that may be passed positionally, in order."""
+        return self.identifiers + self.list_params + self.params
+
+
+class ObjectSpec(object):
+    """
+    Describes one Pardot object: its API <object_name>, the key its records are listed under in responses
+    (<result_key>, the object name by default), the <noun> and <plural> used in docstrings and errors, and its
+    <operations>, a list of (method name, Operation) pairs.
+
+    With <query_criteria> set to the URL of the object's search criteria, the object gets query, iter_query,
+    stream_query and read_many methods. <read_many> picks another way to read records by id: 'ids' for an operation
+    taking an <ids> list (named by <read_many_operation>), or 'read' to read them one at a time with that operation.
+    """
+
+    def __init__(self, object_name, noun, doc, plural=None, result_key=None, query_criteria=None, operations=(),
+                 read_many=None, read_many_operation='read'):
+        self.object_name = object_name
+        self.noun = noun
+        self.plural = plural or noun + 's'
+        self.doc = doc
+        self.result_key = result_key or object_name
+        self.query_criteria = query_criteria
+        self.operations = list(operations)
+        self.read_many = read_many
+        self.read_many_operation = read_many_operation
+
+
+class PardotObject(object):
+    """
+    Base class of the object classes generated from the registry. Every request made by a generated method goes
+    through _get or _post, so behaviour added there applies to every endpoint.
+    """
+
+    object_name = None
+    result_key = None
+    noun = None
+
+    def __init__(self, client):
+        self.client = client
+
+    def _call(self, name, operation, kwargs):
+        values = {}
+        for identifier in operation.identifiers + operation.list_params:
+            value = kwargs.pop(identifier, None)
+            if not value:
+                raise PardotAPIArgumentError('{0} is required to {1} {2}.'.format(
+                    IDENTIFIER_LABELS.get(identifier, identifier), operation.verb or name.split('_')[0],
+                    _article(self.noun)))
+            if identifier in operation.list_params:
+                kwargs[identifier] = str(value).replace(' ', '')
+            else:
+                values[identifier] = value
+        path = operation.path.format(**values)
+        if operation.method == 'get':
+            response = self._get(path=path, params=kwargs)
+        else:
+            response = self._post(path=path, params=kwargs)
+        if operation.returns == 'records':
+            return self._records(response, kwargs)
+        if operation.returns == 'deleted':
+            return response == 204
+        return response
+
+    def _records(self, response, params):
+        """Returns the result of a query response, ensuring its records are a list, no matter what."""
+        result = response.get('result')
+        if 'output' not in params and 'bulk' not in params.values():
+            if result['total_results'] == 0:
+                result[self.result_key] = []
+            elif result['total_results'] == 1:
+                result[self.result_key] = [result[self.result_key]]
+        return result
+
+    def _get(self, object_name=None, path=None, params=None):
+        """GET requests for the object."""
+        if params is None:
+            params = {}
+        response = self.client.get(object_name=object_name or self.object_name, path=path, params=params)
+        return response
+
+    def _post(self, object_name=None, path=None, params=None):
+        """POST requests for the object."""
+        if params is None:
+            params = {}
+        response = self.client.post(object_name=object_name or self.object_name, path=path, params=params)
+        return response
+
+
+def build_class(class_name, spec, module=None):
+    """Returns a PardotObject subclass named <class_name> with the methods described by <spec>, an ObjectSpec."""
+    attributes = {
+        '__doc__': spec.doc,
+        '__module__': module or __name__,
+        'object_name': spec.object_name,
+        'result_key': spec.result_key,
+        'noun': spec.noun,
+    }
+    if spec.query_criteria:
+        attributes.update(_query_methods(spec))
+    for name, operation in spec.operations:
+        attributes[name] = _operation_method(name, operation)
+    if spec.read_many:
+        attributes['read_many'] = _read_many_method(spec)
+    return type(str(class_name), (PardotObject,), attributes)
+
+
+def _operation_method(name, operation):
+    positional = operation.positional
+
+    def method(self, *args, **kwargs):
+        if len(args) > len(positional):
+            raise TypeError('{0}() takes at most {1} positional arguments ({2} given)'.format(
+                name, len(positional), len(args)))
+        for param, value in zip(positional, args):
+            if param in kwargs:
+                raise TypeError('{0}() got multiple values for argument {1!r}'.format(name, param))
+            kwargs[param] = value
+        return self._call(name, operation, kwargs)
+
+    method.__name__ = str(name)
+    method.__doc__ = operation.doc
+    method.operation = operation
+    return method
+
+
+def _query_methods(spec):
+    def query(self, **kwargs):
+        response = self._get(path='/do/query', params=kwargs)
+        return self._records(response, kwargs)
+
+    def iter_query_method(self, **kwargs):
+        return iter_query(self.query, self.result_key, stream_query=self.stream_query, **kwargs)
+
+    def stream_query(self, **kwargs):
+        return self.client.stream(object_name=self.object_name, path='/do/query', params=kwargs,
+                                  result_key=self.result_key)
+
+    def read_many_method(self, ids, **kwargs):
+        return read_many(ids, self.result_key, query=self.query, **kwargs)
+
+    query.__doc__ = """
+        Returns the {0} matching the specified criteria parameters.
+        Supported search criteria: {1}
+        """.format(spec.plural, spec.query_criteria)
+    iter_query_method.__name__ = 'iter_query'
+    iter_query_method.__doc__ = """
+        Yields every one of the {0} matching the specified criteria parameters, one record at a time, fetching
+        further pages as needed. See pypardot.pagination.iter_query for the cursor options.
+        """.format(spec.plural)
+    stream_query.__doc__ = """
+        Yields the {0} matching the specified criteria parameters, decoding them one at a time as the response
+        arrives rather than loading the whole page. Returns a pypardot.streaming.RecordStream.
+        """.format(spec.plural)
+    read_many_method.__name__ = 'read_many'
+    read_many_method.__doc__ = """
+        Returns the {0} with the given <ids> as a dict keyed by id, using as few queries as possible.
+        See pypardot.pagination.read_many for details.
+        """.format(spec.plural)
+    return {'query': query, 'iter_query': iter_query_method, 'stream_query': stream_query,
+            'read_many': read_many_method}
+
+
+def _read_many_method(spec):
+    name = spec.read_many_operation
+    if spec.read_many == 'ids':
+        def read_many_method(self, ids, **kwargs):
+            return read_many(ids, self.result_key, query=getattr(self, name), id_list=True, **kwargs)
+
+        doc = 'querying up to 200 ids per request'
+    else:
+        identifier = dict(spec.operations)[name].identifiers[0]
+
+        def read_many_method(self, ids, **kwargs):
+            read = getattr(self, name)
+            return read_many(ids, self.result_key, read=lambda record_id: read(**{identifier: record_id}),
+                             **kwargs)
+
+        doc = 'reading each one separately, by several threads at once'
+    read_many_method.__name__ = 'read_many'
+    read_many_method.__doc__ = """
+        Returns the {0} with the given <ids> as a dict keyed by id, {1}.
+        See pypardot.pagination.read_many for details.
+        """.format(spec.plural, doc)
+    return read_many_method
+
+
+def _article(noun):
+    return ('an ' if noun[:1] in 'aeiou' else 'a ') + noun
@@ -0,0 +1,32 @@
+from ..errors import PardotAPIArgumentError
+from ..exportjobs import ExportJobManager
+from .registry import object_class
+
+
+class Exports(object_class('Exports', __name__)):
+    """
+    A class to create and read Pardot exports, which run large queries asynchronously and deliver their results as
+    CSV files. See pypardot.exportjobs.ExportJobManager for running an export from start to finish.
+    Export reference: http://developer.pardot.com/kb/api-version-4/export/
+    """
+
+    def create(self, object=None, procedure=None, fields=None, **arguments):
+        """
+        Creates an export of the <object> records (e.g. 'visitorActivity') selected by <procedure> (e.g.
+        'filter_by_created_at'), called with the given <arguments> (e.g. created_after and created_before).
+        <fields> optionally limits the exported fields. Returns the new export, including its id and state.
+        """
+        if not object or not procedure:
+            raise PardotAPIArgumentError('object and procedure are required to create an export.')
+        body = {'object': object, 'procedure': {'name': procedure, 'arguments': arguments}}
+        if fields:
+            body['fields'] = list(fields)
+        response = self.client.post_json(object_name='export', path='/do/create', params=body)
+        return response
+
+    def iter_export(self, object=None, procedure=None, directory=None, fields=None, **arguments):
+        """
+        Creates an export, waits for it to complete, downloads its result files into <directory> and yields their
+        rows as dicts. See pypardot.exportjobs.ExportJobManager to tune polling and downloads.
+        """
+        return ExportJobManager(self.client, directory).run(object, procedure, fields=fields, **arguments)
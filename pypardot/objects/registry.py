@@ -0,0 +1,409 @@
+"""
+The Pardot objects and endpoints this package wraps. Each entry of OBJECTS describes one object class exposed on
+the client; object_class() builds the class from it. Behaviour shared by every endpoint belongs in
+pypardot.objects.base rather than in the classes.
+"""
+from .base import ObjectSpec, Operation, build_class
+
+REFERENCE = 'http://developer.pardot.com/kb/object-field-references'
+API = 'http://developer.pardot.com/kb/api-version-4'
+BATCH_DOC = 'See Endpoints for Batch Processing: {0}/prospects/#endpoints-for-batch-processing'.format(API)
+SEND_DOC = ('Required parameters: (email_template_id OR (text_content, name, subject, & ((from_email & from_name) '
+            'OR from_user_id)))')
+
+
+def _read(noun, extra=''):
+    return 'Returns the data for the {0} specified by <id>{1}. <id> is the Pardot ID of the target {0}.'.format(
+        noun, extra)
+
+
+OBJECTS = {
+    'Accounts': ObjectSpec(
+        'account', 'account',
+        'A class to query and use Pardot accounts.\n    Account field reference: {0}/#account'.format(REFERENCE),
+        operations=[
+            ('read', Operation('/do/read', 'Returns the data for the account of the currently logged in user.')),
+        ]),
+    'Campaigns': ObjectSpec(
+        'campaign', 'campaign',
+        'A class to query and use Pardot campaigns.\n    Campaign field reference: {0}/#campaign'.format(REFERENCE),
+        query_criteria='{0}/campaigns/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('campaign'))),
+            ('update', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for the campaign specified by <id>. <id> is the Pardot ID of the '
+                'campaign.')),
+            ('create', Operation('/do/create', 'Creates a new campaign using the specified data.')),
+        ]),
+    'CustomFields': ObjectSpec(
+        'customField', 'custom field',
+        'A class to query and use Pardot Custom Fields.\n    Custom fields field reference: {0}'.format(REFERENCE),
+        query_criteria='{0}/custom-fields/#supported-search-criteria'.format(API),
+        operations=[
+            ('create', Operation('/do/create', 'Creates a new custom field using the specified data.')),
+            ('read', Operation('/do/read/id/{id}', _read('custom field'))),
+            ('update', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for the custom field specified by <id>. <id> is the Pardot ID of the '
+                'custom field.\n    Refer to Custom Field in Object Field References for more details. Returns the '
+                'updated version of the custom field.')),
+            ('delete', Operation(
+                '/do/delete/id/{id}',
+                'Deletes the custom field specified by <id>. Returns HTTP 204 No Content on success.')),
+        ]),
+    'CustomRedirects': ObjectSpec(
+        'customRedirect', 'custom redirect',
+        'A class to query and use Pardot Custom Redirects.\n    Custom redirects field reference: '
+        '{0}#custom-redirect'.format(REFERENCE),
+        query_criteria='{0}/custom-redirects/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('custom redirect'))),
+        ]),
+    'DynamicContent': ObjectSpec(
+        'dynamicContent', 'dynamic content item',
+        'A class to query and use Pardot dynamic content.\n    Dynamic content field reference: '
+        '{0}#dynamic-content'.format(REFERENCE),
+        query_criteria='{0}/dynamic-content/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('dynamic content item'))),
+        ]),
+    'EmailClicks': ObjectSpec(
+        'emailClick', 'email click',
+        'A class to query and use Pardot email clicks.\n    Email clicks field reference: '
+        '{0}#email-clicks'.format(REFERENCE),
+        query_criteria='{0}/batch-email-clicks/#supported-search-criteria'.format(API)),
+    'Emails': ObjectSpec(
+        'email', 'email',
+        'A class to query and send Pardot emails.\n    Email field reference: {0}/#email'.format(REFERENCE),
+        operations=[
+            ('send_to_email', Operation(
+                '/do/send/prospect_email/{prospect_email}',
+                'Sends an email to the prospect identified by <prospect_email>.\n    ' + SEND_DOC)),
+            ('send_to_id', Operation(
+                '/do/send/prospect_id/{prospect_id}',
+                'Sends an email to the prospect identified by <prospect_id>.\n    ' + SEND_DOC)),
+            ('send_to_lists', Operation(
+                '/do/send/', 'Sends an email to the lists identified by list_ids[].\n    ' + SEND_DOC)),
+            ('read', Operation(
+                '/do/read/id/{email_id}',
+                'Returns the data for the email specified by <email_id>. <email_id> is the Pardot ID of the target '
+                'email.')),
+            ('stats', Operation(
+                '/do/stats/id/{list_email_id}',
+                'Returns the statistical data for the list email specified by <list_email_id>. <list_email_id> is '
+                'the Pardot ID of the target email.', verb='read the stats of')),
+        ],
+        read_many='read'),
+    'EmailTemplates': ObjectSpec(
+        'emailTemplate', 'email template',
+        'A class to query and use Pardot email templates.',
+        operations=[
+            ('read', Operation(
+                '/do/read/id/{emailTemplateID}',
+                'Returns the data for the email template specified by <emailTemplateID>, the Pardot ID of the target '
+                'email template.')),
+            ('listOneToOne', Operation(
+                '/do/listOneToOne',
+                'Returns a list of email templates which are enabled for use in one to one emails.')),
+        ],
+        read_many='read'),
+    'Exports': ObjectSpec(
+        'export', 'export',
+        'A class to create and read Pardot exports, which run large queries asynchronously and deliver their results '
+        'as\n    CSV files.\n    Export reference: {0}/export/'.format(API),
+        operations=[
+            ('read', Operation(
+                '/do/read/id/{id}',
+                'Returns the export specified by <id>, including its state and, once it is complete, the URLs of its '
+                'result\n    files.', method='get')),
+        ]),
+    'Forms': ObjectSpec(
+        'form', 'form',
+        'A class to query and use Pardot Forms.\n    Forms field reference: {0}#form'.format(REFERENCE),
+        query_criteria='{0}/forms/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('form'))),
+        ]),
+    'LifecycleHistories': ObjectSpec(
+        'lifecycleHistory', 'lifecycle history',
+        'A class to query and use Pardot Lifecycle Histories.\n    Lifecycle histories field reference: '
+        '{0}#lifecycle-history'.format(REFERENCE),
+        plural='lifecycle histories',
+        query_criteria='{0}/lifecycle-histories/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('lifecycle history'))),
+        ]),
+    'LifecycleStages': ObjectSpec(
+        'lifecycleStage', 'lifecycle stage',
+        'A class to query and use Pardot Lifecycle Stages.\n    Lifecycle stages field reference: '
+        '{0}#lifecycle-stage'.format(REFERENCE),
+        query_criteria='{0}/lifecycle-stages/#supported-search-criteria'.format(API)),
+    'ListMemberships': ObjectSpec(
+        'listMembership', 'list membership',
+        'A class to query and use Pardot list memberships.\n    List membership field reference: '
+        '{0}#list-membership'.format(REFERENCE),
+        result_key='list_membership',
+        query_criteria='{0}/list-memberships/#supported-search-criteria'.format(API),
+        operations=[
+            ('create', Operation(
+                '/do/create/list_id/{list_id}/prospect_id/{prospect_id}',
+                'Creates a new list membership using the specified data. <list_id> is the Pardot list ID\n    of the '
+                'target list and <prospect_id> is the Pardot prospect ID of the target prospect.\n    Opting out '
+                'prospect from list may also be added with this request.')),
+            ('read', Operation(
+                '/do/read/list_id/{list_id}/prospect_id/{prospect_id}',
+                'Returns the data for the list membership specified by <list_id> and <prospect_id>.\n    <list_id> is '
+                'the Pardot list ID of the list and <prospect_id> is the Pardot prospect ID\n    of the prospect for '
+                'the target list membership.')),
+            ('read_by_id', Operation('/do/read/id/{id}', _read('list membership'))),
+            ('update', Operation(
+                '/do/update/list_id/{list_id}/prospect_id/{prospect_id}',
+                'Updates the provided data for a list membership specified by <list_id> and <prospect_id>.\n    '
+                '<list_id> is the Pardot list ID of the list and <prospect_id> is the Pardot prospect ID\n    of the '
+                'prospect for the target list membership. Fields that are not updated by the request remain '
+                'unchanged.')),
+            ('update_by_id', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for a list membership specified by <id>. <id> is the Pardot ID of the '
+                'target list membership.\n    Fields that are not updated by the request remain unchanged.')),
+            ('delete', Operation(
+                '/do/delete/list_id/{list_id}/prospect_id/{prospect_id}',
+                'Deletes the list membership specified by <list_id> and <prospect_id>.\n    <list_id> is the Pardot '
+                'list ID of the list and <prospect_id> is the Pardot prospect ID\n    of the prospect for the target '
+                'list membership. Returns True if the operation was successful.', returns='deleted')),
+            ('delete_by_id', Operation(
+                '/do/delete/id/{id}',
+                'Deletes the list membership specified by <id>. <id> is the Pardot ID of the target list membership.'
+                '\n    Returns True if the operation was successful.', returns='deleted')),
+        ]),
+    'Lists': ObjectSpec(
+        'list', 'list',
+        'A class to query and use Pardot lists.\n    List field reference: {0}/#list'.format(REFERENCE),
+        query_criteria='{0}/lists/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('list'))),
+            ('update', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for the list specified by <id>. <id> is the Pardot ID of the list.')),
+            ('create', Operation('/do/create', 'Creates a new list using the specified data.')),
+            ('delete', Operation(
+                '/do/delete/id/{id}', 'Deletes the list specified by <id>. Returns HTTP 204 No Content on success.')),
+        ]),
+    'Opportunities': ObjectSpec(
+        'opportunity', 'opportunity',
+        'A class to query and use Pardot opportunities.\n    Opportunity field reference: '
+        '{0}#opportunity'.format(REFERENCE),
+        plural='opportunities',
+        query_criteria='{0}/opportunities/#supported-search-criteria'.format(API),
+        operations=[
+            ('create_by_email', Operation(
+                '/do/create/prospect_email/{prospect_email}',
+                'Creates a new opportunity using the specified data. <prospect_email> must correspond to an existing '
+                'prospect.', params=('name', 'value', 'probability'))),
+            ('create_by_id', Operation(
+                '/do/create/prospect_id/{prospect_id}',
+                'Creates a new opportunity using the specified data. <prospect_id> must correspond to an existing '
+                'prospect.', params=('name', 'value', 'probability'))),
+            ('read', Operation(
+                '/do/read/id/{id}',
+                _read('opportunity', ', including campaign assignment and associated visitor\n    activities'))),
+            ('update', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for the opportunity specified by <id>. <id> is the Pardot ID for the '
+                'target\n    opportunity. Fields that are not updated by the request remain unchanged. Returns an '
+                'updated version of the\n    opportunity.')),
+            ('delete', Operation(
+                '/do/delete/id/{id}',
+                'Deletes the opportunity specified by <id>. <id> is the Pardot ID for the target opportunity. Returns '
+                'no response\n    on success.')),
+            ('undelete', Operation(
+                '/do/undelete/id/{id}',
+                'Un-deletes the opportunity specified by <id>. <id> is the Pardot ID for the target opportunity. '
+                'Returns no\n    response on success.')),
+        ]),
+    'ProspectAccounts': ObjectSpec(
+        'prospectAccount', 'prospect account',
+        'A class to query and use Pardot prospect accounts.\n    Prospect account field reference: '
+        '{0}/#prospect-account'.format(REFERENCE),
+        query_criteria='{0}/prospect-accounts/#supported-search-criteria'.format(API),
+        operations=[
+            ('create', Operation('/do/create', 'Creates a new prospect account.')),
+            ('describe', Operation(
+                '/do/describe',
+                'Returns the field metadata for prospect accounts, explaining what fields are available, their types, '
+                'whether\n    they are required, and their options (for dropdowns, radio buttons, etc).',
+                method='get')),
+            ('read', Operation('/do/read/id/{id}', _read('prospect account'))),
+            ('update', Operation(
+                '/do/update/id/{id}',
+                'Updates the data for the prospect account specified by <id>. <id> is the Pardot ID of the target '
+                'prospect\n    account.')),
+            ('assign', Operation(
+                '/do/assign/id/{id}',
+                'Assigns the prospect account to a user specified by <user_id>. <id> is the Pardot ID of the target '
+                'prospect\n    account.', params=('user_id',))),
+        ]),
+    'Prospects': ObjectSpec(
+        'prospect', 'prospect',
+        'A class to query and use Pardot prospects.\n    Prospect field reference: {0}#prospect'.format(REFERENCE),
+        query_criteria='{0}/prospects/#supported-search-criteria'.format(API),
+        operations=[
+            ('assign_by_fid', Operation(
+                '/do/assign/fid/{fid}',
+                'Assigns or reassigns the prospect specified by <fid> to a specified Pardot user or group. <fid> must '
+                'be a valid\n    CRM FID. One (and only one) of the following parameters must be provided to identify '
+                'the target user or\n    group: <user_email>, <user_id>, or <group_id>. Returns an updated version of '
+                'the prospect.')),
+            ('assign_by_id', Operation(
+                '/do/assign/id/{id}',
+                'Assigns or reassigns the prospect specified by <id> to a specified Pardot user or group. One (and '
+                'only one) of\n    the following parameters must be provided to identify the target user or group: '
+                '<user_email>, <user_id>, or\n    <group_id>. Returns an updated version of the prospect.')),
+            ('unassign_by_fid', Operation(
+                '/do/unassign/fid/{fid}',
+                'Unassigns the prospect specified by <fid>. Returns an updated version of the prospect.')),
+            ('unassign_by_id', Operation(
+                '/do/unassign/id/{id}',
+                'Unassigns the prospect specified by <id>. Returns an updated version of the prospect.')),
+            ('create', Operation(
+                '/do/create/email/{email}',
+                'Creates a new prospect using the specified data. <email> must be a unique email address.\n    May '
+                'optionally include a crm fid <fid>. Returns the new prospect.')),
+            ('batchCreate', Operation(
+                '/do/batchCreate',
+                'Creates new prospects using the provided <data> in either XML or JSON.\n    ' + BATCH_DOC)),
+            ('read_by_email', Operation(
+                '/do/read/email/{email}',
+                'Returns data for the prospect specified by <email>, including campaign assignment, profile criteria\n'
+                '    matching statuses, associated visitor activities, email list subscriptions, and custom field data.'
+                '\n    <email> is the email address of the target prospect.')),
+            ('read_by_id', Operation(
+                '/do/read/id/{id}',
+                'Returns data for the prospect specified by <id>, including campaign assignment, profile criteria\n'
+                '    matching statuses, associated visitor activities, email list subscriptions, and custom field data.'
+                '\n    <id> is the Pardot ID of the target prospect.')),
+            ('read_by_fid', Operation(
+                '/do/read/fid/{fid}',
+                'Returns data for the prospect specified by <fid>. <fid> must be a valid CRM FID.\n    This data '
+                'includes campaign assignment, profile criteria matching statuses, associated\n    visitor activities, '
+                'email list subscriptions, and custom field data.')),
+            ('update_by_fid', Operation(
+                '/do/update/fid/{fid}',
+                'Updates the provided data for a prospect specified by <fid>. <fid> is the Pardot CRM FID of the\n    '
+                'prospect. Fields that are not updated by the request remain unchanged.')),
+            ('update_by_id', Operation(
+                '/do/update/id/{id}',
+                'Updates the provided data for a prospect specified by <id>. <id> is the Pardot ID of the prospect.\n'
+                '    Fields that are not updated by the request remain unchanged.')),
+            ('batchUpdate', Operation(
+                '/do/batchUpdate',
+                'Updates prospects using the provided <data> in either XML or JSON.\n    ' + BATCH_DOC)),
+            ('upsert_by_email', Operation(
+                '/do/upsert/email/{email}',
+                'Updates the provided data for the prospect specified by <email>. If a prospect with the provided '
+                'email address\n    does not yet exist, a new prospect is created using the <email> value. Fields '
+                'that are not updated by the\n    request remain unchanged.')),
+            ('upsert_by_id', Operation(
+                '/do/upsert/id/{id}',
+                'Updates the provided data for the prospect specified by <id>. If an <email> value is provided, it is '
+                'used to\n    update the prospect\'s email address. If a prospect with the provided ID is not found, '
+                'Pardot searches for a\n    prospect identified by <email>. If a prospect with the provided email '
+                'address does not yet exist, a new\n    prospect is created using <email> value. Fields that are not '
+                'updated by the request remain unchanged.')),
+            ('upsert_by_fid', Operation(
+                '/do/upsert/fid/{fid}',
+                'Updates the provided data for the prospect specified by <fid>. If an <email> value is provided, it is '
+                'used to\n    update the prospect\'s email address. If a prospect with the provided ID is not found, '
+                'Pardot searches for a\n    prospect identified by <email>. If a prospect with the provided email '
+                'address does not yet exist, a new\n    prospect is created using <email> value. Fields that are not '
+                'updated by the request remain unchanged.')),
+            ('batchUpsert', Operation(
+                '/do/batchUpsert',
+                'Upserts prospects using the provided <data> in either XML or JSON.\n    ' + BATCH_DOC)),
+            ('delete_by_fid', Operation(
+                '/do/delete/fid/{fid}',
+                'Deletes the prospect specified by <fid>. Returns True if operation was successful.',
+                returns='deleted')),
+            ('delete_by_id', Operation(
+                '/do/delete/id/{id}',
+                'Deletes the prospect specified by <id>. Returns True if operation was successful.',
+                returns='deleted')),
+        ]),
+    'TagObjects': ObjectSpec(
+        'tagObject', 'tag object',
+        'A class to query and use Pardot tagObjects.\n    TagObject field reference: {0}#tag-object'.format(REFERENCE),
+        query_criteria='{0}/tag-objects/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('tag object'))),
+        ]),
+    'Tags': ObjectSpec(
+        'tag', 'tag',
+        'A class to query and use Pardot Tags.\n    Tag field reference: {0}#tag'.format(REFERENCE),
+        query_criteria='{0}/tags/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('tag'))),
+        ]),
+    'Users': ObjectSpec(
+        'user', 'user',
+        'A class to query and use Pardot users.\n    User field reference: {0}'.format(REFERENCE),
+        query_criteria='{0}/users/#supported-search-criteria'.format(API),
+        operations=[
+            ('read_by_id', Operation('/do/read/id/{id}', _read('user'))),
+            ('read_by_email', Operation(
+                '/do/read/email/{email}',
+                'Returns the data for the user specified by <email>. <email> is the email address of the target '
+                'user.')),
+        ]),
+    'VisitorActivities': ObjectSpec(
+        'visitorActivity', 'visitor activity',
+        'A class to query and use Pardot visitor activities.\n    Visitor Activity field reference: '
+        '{0}'.format(REFERENCE),
+        plural='visitor activities',
+        result_key='visitor_activity',
+        query_criteria='{0}/visitor-activities/#supported-search-criteria'.format(API),
+        operations=[
+            ('read', Operation('/do/read/id/{id}', _read('visitor activity'))),
+        ]),
+    'Visitors': ObjectSpec(
+        'visitor', 'visitor',
+        'A class to query and use Pardot visitors.\n    Visitor field reference: {0}'.format(REFERENCE),
+        query_criteria='{0}/visitors/#supported-search-criteria'.format(API),
+        operations=[
+            ('assign', Operation(
+                '/do/assign/id/{id}',
+                'Assigns or reassigns the visitor specified by <id> to a prospect specified by <prospect_id>.\n    '
+                'Returns an updated version of the visitor.')),
+            ('read', Operation(
+                '/do/read/id/{id}',
+                _read('visitor', ', including associated visitor activities, identified\n    company data, and '
+                                 'visitor referrers'))),
+        ]),
+    'Visits': ObjectSpec(
+        'visit', 'visit',
+        'A class to query and use Pardot visits.\n    Visit field reference: {0}/#visit'.format(REFERENCE),
+        operations=[
+            ('query_by_ids', Operation(
+                '/do/query',
+                'Returns the visits matching the given <ids>. The <ids> should be comma separated integers.',
+                method='get', list_params=('ids',), returns='records')),
+            ('query_by_visitor_ids', Operation(
+                '/do/query',
+                'Returns the visits matching the given <visitor_ids>, comma separated integers.',
+                method='get', list_params=('visitor_ids',), returns='records')),
+            ('query_by_prospect_ids', Operation(
+                '/do/query',
+                'Returns the visits matching the given <prospect_ids>, comma separated integers.',
+                method='get', list_params=('prospect_ids',), returns='records')),
+            ('read', Operation('/do/read/id/{id}', _read('visit'))),
+        ],
+        read_many='ids', read_many_operation='query_by_ids'),
+}
+
+
+def object_class(class_name, module=None):
+    """
+    Returns a new class named <class_name> built from its entry in OBJECTS, e.g. object_class('Prospects').
+    <module> is the module the class is exposed from.
+    """
+    return build_class(class_name, OBJECTS[class_name], module=module)
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from pypardot.simulator import Simulator
+
+try:
+	from pypardot.aio import AsyncPardotAPI, aiohttp
+except ImportError:
+	aiohttp = None
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncPardotAPI(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.simulator.seed('prospect', 3)
+
+	def tearDown(self):
+		self.simulator.stop()
+
+	def run_client(self, main):
+		async def run():
+			async with AsyncPardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri) as p:
+				return await main(p)
+		return asyncio.run(run())
+
+	def test_single_request_methods(self):
+		async def main(p):
+			prospects = await asyncio.gather(*[p.prospects.read_by_id(id=i) for i in (1, 2, 3)])
+			result = await p.prospects.query(id_greater_than=2)
+			ids = [prospect['id'] async for prospect in p.prospects.iter_query(page_size=2)]
+			return [prospect['prospect']['id'] for prospect in prospects], result['prospect'], ids
+
+		reads, queried, ids = self.run_client(main)
+		self.assertEqual(reads, [1, 2, 3])
+		self.assertEqual([prospect['id'] for prospect in queried], [3])
+		self.assertEqual(ids, [1, 2, 3])
+
+	def test_helpers_making_several_requests_are_not_offered(self):
+		async def main(p):
+			for name in ('read_many', 'bulk_create', 'stream_query', 'update_field_by_id'):
+				with self.assertRaises(AttributeError):
+					getattr(p.prospects, name)
+			with self.assertRaises(AttributeError):
+				p.exports.create
+		self.run_client(main)
+		self.assertEqual(sum(self.simulator.requests.values()), 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
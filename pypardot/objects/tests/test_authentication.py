@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+
+from pypardot.client import PardotAPI
+from pypardot.keycache import FileKeyCache, SQLiteKeyCache
+
+from .test_retry import FakeResponse, OK
+
+EXPIRED = FakeResponse({'@attributes': {'stat': 'fail', 'err_code': 1}, 'err': 'Invalid API key or user key'})
+
+
+class KeyCheckingTransport(object):
+	"""Accepts requests carrying the most recently issued API key; counts logins."""
+
+	def __init__(self, login_delay=0.05):
+		self.login_delay = login_delay
+		self.login_error = None
+		self.logins = 0
+		self.valid_key = None
+		self.lock = threading.Lock()
+
+	def post(self, url, data=None, headers=None, timeout=None):
+		if '/api/login/' in url:
+			time.sleep(self.login_delay)
+			if self.login_error is not None:
+				raise self.login_error
+			with self.lock:
+				self.logins += 1
+				self.valid_key = 'key{0}'.format(self.logins)
+			return FakeResponse({'@attributes': {'stat': 'ok'}, 'api_key': self.valid_key})
+		return OK if data.get('api_key') == self.valid_key else EXPIRED
+
+	def get(self, url, params=None, headers=None, timeout=None):
+		return OK if 'api_key={0},'.format(self.valid_key) in headers['Authorization'] else EXPIRED
+
+
+class TestAuthentication(unittest.TestCase):
+	def run_threads(self, target, count=32):
+		threads = [threading.Thread(target=target) for _ in range(count)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+	def test_first_calls_share_one_login(self):
+		transport = KeyCheckingTransport()
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		self.run_threads(lambda: client.prospects.read_by_id(id=1))
+		self.assertEqual(transport.logins, 1)
+
+	def test_expired_key_is_refreshed_once(self):
+		transport = KeyCheckingTransport()
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.authenticate()
+		transport.valid_key = 'rotated'
+		self.run_threads(lambda: client.get('prospect', path='/do/query'))
+		self.assertEqual(transport.logins, 2)
+
+	def test_key_is_refreshed_ahead_of_expiry_in_background(self):
+		transport = KeyCheckingTransport(login_delay=0)
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.authenticate()
+		client._api_key_expires_at = time.time() + 10
+		client.prospects.read_by_id(id=1)
+		for _ in range(100):
+			if transport.logins == 2:
+				break
+			time.sleep(0.01)
+		self.assertEqual(transport.logins, 2)
+		self.assertEqual(client.api_key, 'key2')
+
+	def test_failed_background_refresh_is_left_to_the_next_call(self):
+		transport = KeyCheckingTransport(login_delay=0)
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.authenticate()
+		transport.login_error = requests.exceptions.ConnectionError('connection refused')
+		errors = []
+		previous, threading.excepthook = threading.excepthook, errors.append
+		try:
+			client._api_key_expires_at = time.time() + 10
+			client.prospects.read_by_id(id=1)
+			for _ in range(100):
+				if not client._auth_flight.in_flight('login'):
+					break
+				time.sleep(0.01)
+			time.sleep(0.05)
+		finally:
+			threading.excepthook = previous
+		self.assertEqual(errors, [])
+		self.assertEqual(client.api_key, 'key1')
+
+		transport.login_error = None
+		client._api_key_expires_at = time.time() - 1
+		client.prospects.read_by_id(id=1)
+		self.assertEqual(client.api_key, 'key2')
+
+	def test_get_before_authenticate_logs_in(self):
+		transport = KeyCheckingTransport(login_delay=0)
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		self.assertEqual(client.get('prospect', path='/do/query'), OK.body)
+		self.assertEqual(transport.logins, 1)
+
+
+class TestKeyCache(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def check_cache(self, make_cache):
+		transport = KeyCheckingTransport(login_delay=0)
+		first = PardotAPI('email', 'password', 'user_key', transport=transport, key_cache=make_cache())
+		first.prospects.read_by_id(id=1)
+		second = PardotAPI('email', 'password', 'user_key', transport=transport, key_cache=make_cache())
+		second.prospects.read_by_id(id=1)
+		self.assertEqual(transport.logins, 1)
+		self.assertEqual(second.api_key, first.api_key)
+
+		transport.valid_key = 'rotated'
+		second.prospects.read_by_id(id=1)
+		self.assertEqual(transport.logins, 2)
+		third = PardotAPI('email', 'password', 'user_key', transport=transport, key_cache=make_cache())
+		third.prospects.read_by_id(id=1)
+		self.assertEqual(transport.logins, 2)
+		self.assertEqual(third.api_key, 'key2')
+
+	def test_file_cache_is_shared(self):
+		path = os.path.join(self.directory, 'keys.json')
+		self.check_cache(lambda: FileKeyCache(path))
+
+	def test_sqlite_cache_is_shared(self):
+		path = os.path.join(self.directory, 'keys.db')
+		self.check_cache(lambda: SQLiteKeyCache(path))
+
+	@unittest.skipIf(os.name != 'posix', 'file modes are POSIX only')
+	def test_caches_are_private(self):
+		previous = os.umask(0o022)
+		try:
+			FileKeyCache(os.path.join(self.directory, 'keys.json')).set('id', 'key', time.time() + 60)
+			SQLiteKeyCache(os.path.join(self.directory, 'keys.db')).set('id', 'key', time.time() + 60)
+		finally:
+			os.umask(previous)
+		for name in ('keys.json', 'keys.db'):
+			self.assertEqual(os.stat(os.path.join(self.directory, name)).st_mode & 0o777, 0o600)
+
+	def test_expired_entries_are_ignored(self):
+		cache = SQLiteKeyCache(os.path.join(self.directory, 'keys.db'))
+		cache.set('id', 'old', time.time() - 1)
+		self.assertEqual(cache.get('id'), None)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,56 @@
+import json
+import threading
+import unittest
+
+from pypardot.bulk import ProspectBulkWriter
+from pypardot.errors import PardotAPIError
+
+
+class FakeProspects(object):
+	"""Rejects prospects without an email the way Pardot's batch endpoints report per-record errors."""
+
+	def __init__(self, quota=None):
+		self.batches = []
+		self.quota = quota
+		self.lock = threading.Lock()
+
+	def batchUpsert(self, prospects=None):
+		batch = json.loads(prospects)['prospects']
+		with self.lock:
+			if self.quota is not None and len(self.batches) >= self.quota:
+				raise PardotAPIError({'@attributes': {'stat': 'fail', 'err_code': 66},
+									  'err': 'You have exceeded your daily API call limit'})
+			self.batches.append(batch)
+		errors = dict((str(i), 'Invalid prospect email address') for i, p in enumerate(batch) if not p.get('email'))
+		if errors:
+			raise PardotAPIError({'@attributes': {'stat': 'fail', 'err_code': 10000}, 'err': 'batch', 'errors': errors})
+		return {'@attributes': {'stat': 'ok'}}
+
+
+class TestProspectBulkWriter(unittest.TestCase):
+	def test_chunks_and_maps_errors_to_input_rows(self):
+		prospects = FakeProspects()
+		records = ({'email': '' if i % 40 == 7 else 'p{0}@example.com'.format(i)} for i in range(260))
+		result = ProspectBulkWriter(prospects, workers=3).write(records)
+		self.assertEqual(result.records, 260)
+		self.assertEqual(result.batches, 6)
+		self.assertTrue(all(len(batch) <= 50 for batch in prospects.batches))
+		self.assertEqual(sorted(error.index for error in result.errors), [7, 47, 87, 127, 167, 207, 247])
+		self.assertEqual(result.succeeded, 253)
+		self.assertTrue(result.records_per_second > 0)
+
+	def test_account_errors_stop_the_write(self):
+		prospects = FakeProspects(quota=2)
+		records = ({'email': 'p{0}@example.com'.format(i)} for i in range(1000))
+		with self.assertRaises(PardotAPIError) as context:
+			ProspectBulkWriter(prospects, workers=1).write(records)
+		self.assertEqual(context.exception.err_code, 66)
+		self.assertEqual(len(prospects.batches), 2)
+
+	def test_rejects_oversized_batches(self):
+		with self.assertRaises(ValueError):
+			ProspectBulkWriter(FakeProspects(), batch_size=51)
+
+
+if __name__ == '__main__':
+	unittest.main()
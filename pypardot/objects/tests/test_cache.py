@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypardot.cache import ResponseCache, SQLiteBackend
+from pypardot.client import PardotAPI
+
+from .test_retry import FakeResponse, LOGIN
+
+
+class CountingTransport(object):
+	"""Answers every request with a fresh copy of a custom field response and counts non-login requests."""
+
+	def __init__(self):
+		self.calls = []
+
+	def get(self, url, params=None, headers=None, timeout=None):
+		return self._respond(url)
+
+	def post(self, url, data=None, headers=None, timeout=None):
+		return self._respond(url)
+
+	def _respond(self, url):
+		if '/api/login/' in url:
+			return LOGIN
+		self.calls.append(url)
+		return FakeResponse({'@attributes': {'stat': 'ok'}, 'customField': {'id': 1, 'name': 'Region'}})
+
+
+class TestResponseCache(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def client(self, cache):
+		self.transport = CountingTransport()
+		return PardotAPI('email', 'password', 'user_key', transport=self.transport, cache=cache)
+
+	def test_reads_are_cached_until_a_write(self):
+		client = self.client(ResponseCache())
+		first = client.customfields.read(id=1)
+		first['customField']['name'] = 'changed by the caller'
+		self.assertEqual(client.customfields.read(id=1)['customField']['name'], 'Region')
+		self.assertEqual(len(self.transport.calls), 1)
+
+		client.customfields.delete(id=1)
+		client.customfields.read(id=1)
+		self.assertEqual(len(self.transport.calls), 3)
+		self.assertEqual(client.cache.stats.as_dict(), {'hits': 1, 'misses': 2, 'evictions': 0})
+
+	def test_uncached_objects_always_reach_pardot(self):
+		client = self.client(ResponseCache(ttls={'customField': 0}))
+		client.customfields.read(id=1)
+		client.customfields.read(id=1)
+		self.assertEqual(len(self.transport.calls), 2)
+
+	def test_sqlite_backend_evicts_least_recently_used(self):
+		backend = SQLiteBackend(os.path.join(self.directory, 'cache.db'))
+		client = self.client(ResponseCache(max_entries=2, backend=backend))
+		for field_id in (1, 2, 1, 3):
+			client.customfields.read(id=field_id)
+		self.assertEqual(client.cache.stats.evictions, 1)
+		client.customfields.read(id=1)
+		client.customfields.read(id=2)
+		self.assertEqual(len(self.transport.calls), 4)
+		backend.close()
@@ -0,0 +1,56 @@
+import threading
+import time
+import unittest
+
+from pypardot.client import PardotAPI
+
+from .test_retry import FakeResponse, LOGIN
+
+
+class SlowTransport(object):
+	"""Answers every request after a short delay, counting the non-login requests."""
+
+	def __init__(self):
+		self.calls = 0
+		self.lock = threading.Lock()
+
+	def get(self, url, params=None, headers=None, timeout=None):
+		return self._respond(url)
+
+	def post(self, url, data=None, headers=None, timeout=None):
+		return self._respond(url)
+
+	def _respond(self, url):
+		if '/api/login/' in url:
+			return LOGIN
+		with self.lock:
+			self.calls += 1
+		time.sleep(0.2)
+		return FakeResponse({'@attributes': {'stat': 'ok'}, 'prospect': {'id': 1}})
+
+
+class TestReadCoalescing(unittest.TestCase):
+	def run_concurrently(self, func, count=5):
+		results = []
+		threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		return results
+
+	def test_identical_reads_share_one_request(self):
+		transport = SlowTransport()
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.authenticate()
+		results = self.run_concurrently(lambda: client.prospects.read_by_id(id=1))
+		self.assertEqual(transport.calls, 1)
+		self.assertEqual([result['prospect']['id'] for result in results], [1] * 5)
+		self.assertEqual(len(set(id(result) for result in results)), 5)
+
+	def test_writes_are_not_coalesced(self):
+		transport = SlowTransport()
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.authenticate()
+		self.run_concurrently(lambda: client.prospects.update_by_id(id=1, city='Atlanta'))
+		self.assertEqual(transport.calls, 5)
@@ -0,0 +1,90 @@
+import time
+import unittest
+
+import requests
+
+from pypardot.client import PardotAPI
+from pypardot.deadline import Deadline
+from pypardot.errors import PardotDeadlineExceededError
+from pypardot.simulator import Simulator
+
+
+def expire(deadline):
+	deadline.expires_at = time.time() - 1
+
+
+class TestDeadlines(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri)
+		self.p.authenticate()
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+
+	def test_timeouts_per_client_and_object(self):
+		self.simulator.seed('campaign', 1)
+		self.simulator.seed('tag', 1)
+		self.simulator.latency = 0.3
+		self.p.timeout = (5, 0.05)
+		self.p.timeouts = {'campaign': (5, 2)}
+		self.assertEqual(self.p.timeout_for('tag'), (5, 0.05))
+		with self.assertRaises(requests.exceptions.ReadTimeout):
+			self.p.tags.read(id=1)
+		self.assertEqual(self.p.campaigns.read(id=1)['campaign']['id'], 1)
+
+	def test_deadline_caps_timeouts_and_stops_requests(self):
+		self.simulator.seed('tag', 1)
+		with Deadline(60) as deadline:
+			connect, read = self.p.timeout_for('tag')
+			self.assertLessEqual(connect, 10)
+			self.assertLessEqual(read, 60)
+			with Deadline(0.5):
+				self.assertLessEqual(self.p.timeout_for('tag')[1], 0.5)
+			self.p.tags.read(id=1)
+			expire(deadline)
+			with self.assertRaises(PardotDeadlineExceededError):
+				self.p.tags.read(id=1)
+		self.assertEqual(self.simulator.requests[('tag', 'read')], 1)
+		self.assertEqual(self.p.timeout_for('tag'), self.p.timeout)
+
+	def test_iteration_stops_and_reports_where_to_resume(self):
+		self.simulator.seed('prospect', 1000)
+		deadline = Deadline(60)
+		ids = []
+		with self.assertRaises(PardotDeadlineExceededError) as context:
+			for prospect in self.p.prospects.iter_query(deadline=deadline, parallel=2):
+				ids.append(prospect['id'])
+				if len(ids) == 250:
+					expire(deadline)
+		progress = context.exception.progress
+		self.assertEqual(progress['records'], len(ids))
+		self.assertEqual(progress['resume'], {'id_greater_than': ids[-1]})
+		ids.extend(prospect['id'] for prospect in self.p.prospects.iter_query(**progress['resume']))
+		self.assertEqual(ids, list(range(1, 1001)))
+
+	def test_timestamp_iteration_resumes_without_losing_ties(self):
+		self.simulator.seed('prospect', 450, created_at='2019-01-01 00:00:00')
+		deadline = Deadline(60)
+		ids = []
+		with self.assertRaises(PardotDeadlineExceededError) as context:
+			for prospect in self.p.prospects.iter_query(cursor='created_at', deadline=deadline):
+				ids.append(prospect['id'])
+				if len(ids) == 250:
+					expire(deadline)
+		resume = context.exception.progress['resume']
+		self.assertEqual(resume, {'created_after': '2018-12-31 23:59:59'})
+		ids.extend(prospect['id'] for prospect in self.p.prospects.iter_query(cursor='created_at', **resume))
+		self.assertEqual(set(ids), set(range(1, 451)))
+
+	def test_bulk_writes_stop_between_batches(self):
+		deadline = Deadline(60)
+		records = [{'email': 'p{0}@example.com'.format(i)} for i in range(500)]
+		with self.assertRaises(PardotDeadlineExceededError) as context:
+			self.p.prospects.bulk_upsert(records, workers=1, deadline=deadline, progress=lambda result: expire(deadline))
+		result = context.exception.progress
+		self.assertEqual((result.records, result.batches), (100, 2))
+		self.assertEqual(len(self.simulator.records['prospect']), result.records)
+		self.p.prospects.bulk_upsert(records[result.records:])
+		self.assertEqual(len(self.simulator.records['prospect']), 500)
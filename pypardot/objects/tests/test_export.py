@@ -0,0 +1,47 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from pypardot.export import export, pyarrow, schema_from_describe
+
+ACTIVITIES = [
+	{'id': i, 'type': str(i % 3), 'created_at': '2019-01-01 00:00:0{0}'.format(i), 'campaign': {'id': 7}}
+	for i in range(1, 6)]
+
+
+class TestExport(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_csv_is_written_in_chunks(self):
+		path = os.path.join(self.directory, 'activities.csv')
+		self.assertEqual(export(iter(ACTIVITIES), path, 'visitorActivity', chunk_size=2), 5)
+		with open(path) as csv_file:
+			rows = list(csv.DictReader(csv_file))
+		self.assertEqual(len(rows), 5)
+		self.assertEqual(rows[0]['id'], '1')
+		self.assertEqual(rows[4]['created_at'], '2019-01-01 00:00:05')
+		self.assertEqual(rows[0]['campaign'], '{"id": 7}')
+
+	@unittest.skipIf(pyarrow is None, 'Requires pyarrow')
+	def test_parquet_columns_are_typed(self):
+		path = os.path.join(self.directory, 'activities.parquet')
+		export(ACTIVITIES, path, 'visitorActivity', chunk_size=2)
+		table = pyarrow.parquet.read_table(path)
+		self.assertEqual(table.num_rows, 5)
+		self.assertEqual(table.column('type').to_pylist(), [1, 2, 0, 1, 2])
+		self.assertEqual(table.column('created_at').to_pylist()[0], datetime(2019, 1, 1, 0, 0, 1))
+
+	def test_schema_from_describe(self):
+		schema = schema_from_describe({'result': {'field': [
+			{'@attributes': {'id': 'annual_revenue', 'name': 'Annual Revenue', 'type': 'Number'}},
+			{'@attributes': {'id': 'industry', 'name': 'Industry', 'type': 'Dropdown'}}]}})
+		self.assertEqual(schema['annual_revenue'], {'datatype': 'float'})
+		self.assertEqual(schema['industry'], {'datatype': 'string'})
+		self.assertEqual(schema['id'], {'datatype': 'integer'})
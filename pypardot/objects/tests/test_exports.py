@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotExportError
+from pypardot.exportjobs import ExportJobManager
+
+RESULTS = 'https://pi.pardot.com/api/export/version/4/do/downloadFile/id/'
+RESULT_URL = RESULTS + '5'
+CSV = 'id,type,prospect_id\n' + ''.join('{0},4,{1}\n'.format(i, i * 10) for i in range(1, 101))
+
+
+class Interrupted(Exception):
+	pass
+
+
+class Response(object):
+	def __init__(self, status_code, body=b'', headers=None):
+		self.status_code = status_code
+		self.content = body
+		self.headers = dict({'content-type': 'application/json'}, **(headers or {}))
+
+	def json(self):
+		return json.loads(self.content.decode('utf-8'))
+
+	def iter_content(self, chunk_size=None):
+		yield self.content
+
+	def close(self):
+		pass
+
+
+class ExportServer(object):
+	"""
+	Runs exports, numbered from 5, that complete after <polls> reads, and serves their CSV result in byte ranges.
+	Downloading a range in <failing_ranges> fails once.
+	"""
+
+	def __init__(self, polls=1, ranges=True, final_state='Complete', failing_ranges=()):
+		self.polls = polls
+		self.ranges = ranges
+		self.final_state = final_state
+		self.failing_ranges = set(failing_ranges)
+		self.created = []
+		self.downloads = []
+
+	def post(self, url, data=None, headers=None, timeout=None):
+		if '/login/' in url:
+			return self._json({'api_key': 'key'})
+		self.created.append(json.loads(data))
+		return self._json({'export': {'id': 4 + len(self.created), 'state': 'Waiting'}})
+
+	def get(self, url, params=None, headers=None, stream=False, timeout=None):
+		if url.startswith(RESULTS):
+			return self._download(headers)
+		export_id = int(url.rsplit('/', 1)[1])
+		self.polls -= 1
+		if self.polls > 0:
+			return self._json({'export': {'id': export_id, 'state': 'Processing'}})
+		return self._json({'export': {'id': export_id, 'state': self.final_state,
+									  'resultRefs': [RESULTS + str(export_id)]}})
+
+	def _download(self, headers):
+		body = CSV.encode('utf-8')
+		self.downloads.append(headers.get('Range'))
+		if headers.get('Range') in self.failing_ranges:
+			self.failing_ranges.discard(headers['Range'])
+			raise Interrupted()
+		if not self.ranges or 'Range' not in headers:
+			return Response(200, body, {'content-type': 'text/csv'})
+		start, end = [int(value) for value in headers['Range'].split('=')[1].split('-')]
+		end = min(end, len(body) - 1)
+		return Response(206, body[start:end + 1], {
+			'content-type': 'text/csv', 'Content-Range': 'bytes {0}-{1}/{2}'.format(start, end, len(body))})
+
+	def _json(self, body):
+		body = dict({'@attributes': {'stat': 'ok'}}, **body)
+		return Response(200, json.dumps(body).encode('utf-8'))
+
+
+class TestExports(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def manager(self, server, **kwargs):
+		client = PardotAPI('email', 'password', 'user_key', transport=server)
+		return ExportJobManager(client, self.directory, part_size=500, poll_interval=0, **kwargs)
+
+	def test_rows_are_yielded_once_the_export_completes(self):
+		server = ExportServer(polls=3)
+		rows = list(self.manager(server).run(
+			'visitorActivity', 'filter_by_created_at', created_after='2020-01-01', created_before='2020-02-01'))
+		self.assertEqual(server.created, [{'object': 'visitorActivity', 'procedure': {
+			'name': 'filter_by_created_at', 'arguments': {'created_after': '2020-01-01', 'created_before': '2020-02-01'}}}])
+		self.assertEqual([int(row['id']) for row in rows], list(range(1, 101)))
+		self.assertEqual(rows[0], {'id': '1', 'type': '4', 'prospect_id': '10'})
+		self.assertEqual(server.polls, 0)
+		# One probe, then four ranges of at most 500 bytes.
+		self.assertEqual(len(server.downloads), 1 + -(-len(CSV) // 500))
+
+	def test_whole_file_is_downloaded_without_range_support(self):
+		server = ExportServer(ranges=False)
+		rows = list(self.manager(server).run('visitorActivity', 'filter_by_created_at'))
+		self.assertEqual(len(rows), 100)
+		self.assertEqual(len(server.downloads), 1)
+
+	def test_interrupted_download_resumes(self):
+		server = ExportServer()
+		path = os.path.join(self.directory, 'export-5-0.csv')
+		body = CSV.encode('utf-8')
+		with open(path + '.part', 'wb') as partial:
+			partial.write(body[:500] + b'\0' * (len(body) - 500))
+		with open(path + '.part.progress', 'w') as progress:
+			json.dump({'size': len(body), 'part_size': 500, 'done': [0]}, progress)
+
+		self.manager(server).fetch(RESULT_URL, path)
+		self.assertNotIn('bytes=0-499', server.downloads)
+		with open(path, 'rb') as result:
+			self.assertEqual(result.read(), body)
+		self.assertFalse(os.path.exists(path + '.part.progress'))
+
+	def test_interrupted_run_resumes_its_export(self):
+		server = ExportServer(failing_ranges=['bytes=500-903'])
+		manager = self.manager(server, workers=1)
+		with self.assertRaises(Interrupted):
+			list(manager.run('visitorActivity', 'filter_by_created_at', created_after='2020-01-01'))
+		self.assertEqual(server.downloads, ['bytes=0-0', 'bytes=0-499', 'bytes=500-903'])
+
+		server.downloads = []
+		rows = list(manager.run('visitorActivity', 'filter_by_created_at', created_after='2020-01-01'))
+		self.assertEqual(len(rows), 100)
+		self.assertEqual(len(server.created), 1)
+		self.assertEqual(server.downloads, ['bytes=0-0', 'bytes=500-903'])
+		self.assertEqual(os.listdir(self.directory), ['export-5-0.csv'])
+
+		# Once complete, running the export again creates a new one.
+		list(manager.run('visitorActivity', 'filter_by_created_at', created_after='2020-01-01'))
+		self.assertEqual(len(server.created), 2)
+
+	def test_failed_export_raises(self):
+		with self.assertRaises(PardotExportError):
+			list(self.manager(ExportServer(final_state='Failed')).run('visitorActivity', 'filter_by_created_at'))
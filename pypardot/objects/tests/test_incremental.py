@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.incremental import IncrementalSync, SQLiteStateStore
+from pypardot.simulator import Simulator
+
+
+class FakeStream(object):
+	"""
+	In-memory records supporting the criteria IncrementalSync passes to iter_query. updated_after is exclusive, as in
+	Pardot and the Simulator.
+	"""
+
+	def __init__(self, records=(), deleted=()):
+		self.records = list(records)
+		self.deleted = list(deleted)
+		self.queries = []
+
+	def iter_query(self, cursor='id', deleted=None, id_greater_than=None, updated_after=None):
+		self.queries.append({'cursor': cursor, 'id_greater_than': id_greater_than, 'updated_after': updated_after})
+		records = self.deleted if deleted == 'true' else self.records
+		if id_greater_than is not None:
+			records = [record for record in records if record['id'] > id_greater_than]
+		if updated_after is not None:
+			records = [record for record in records if record['updated_at'] > updated_after]
+		return iter(sorted(records, key=lambda record: (record[cursor], record['id'])))
+
+
+class FakeClient(object):
+	def __init__(self):
+		self.prospects = FakeStream()
+		self.visitoractivities = FakeStream()
+
+
+class TestIncrementalSync(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.store = SQLiteStateStore(os.path.join(self.directory, 'state.db'))
+		self.client = FakeClient()
+
+	def tearDown(self):
+		self.store.close()
+		shutil.rmtree(self.directory)
+
+	def changes(self, stream):
+		return [(change.operation, change.record['id'])
+				for change in IncrementalSync(self.client, self.store, clock_skew=60).changes(stream)]
+
+	def test_overlap_returns_late_records_without_duplicates(self):
+		prospects = self.client.prospects
+		prospects.records = [{'id': 1, 'updated_at': '2019-01-01 10:00:00'},
+							 {'id': 2, 'updated_at': '2019-01-01 10:00:30'}]
+		self.assertEqual(self.changes('prospects'), [('upsert', 1), ('upsert', 2)])
+		self.assertEqual(self.store.get('prospects')['watermark'], '2019-01-01 10:00:30')
+
+		# A record committed late with an older timestamp, a record updated again and one deletion.
+		prospects.records.append({'id': 3, 'updated_at': '2019-01-01 10:00:10'})
+		prospects.records[0] = {'id': 1, 'updated_at': '2019-01-01 10:05:00'}
+		prospects.deleted = [{'id': 4, 'updated_at': '2019-01-01 10:04:00'}]
+		self.assertEqual(self.changes('prospects'), [('upsert', 3), ('upsert', 1), ('delete', 4)])
+		self.assertEqual(prospects.queries[-2]['updated_after'], '2019-01-01 09:59:30')
+
+		self.assertEqual(self.changes('prospects'), [])
+
+	def test_id_stream_resumes_after_last_id(self):
+		activities = self.client.visitoractivities
+		activities.records = [{'id': i} for i in range(1, 6)]
+		self.assertEqual(len(self.changes('visitoractivities')), 5)
+		activities.records.append({'id': 6})
+		self.assertEqual(self.changes('visitoractivities'), [('upsert', 6)])
+		self.assertEqual(activities.queries[-1]['id_greater_than'], 5)
+
+
+class TestIncrementalSyncWithSimulator(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.store = SQLiteStateStore(os.path.join(self.directory, 'state.db'))
+		self.simulator = Simulator(seed=1).start()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri)
+		# The simulator has no deleted records to query.
+		self.sync = IncrementalSync(self.p, self.store, clock_skew=60,
+									streams={'prospects': {'namespace': 'prospects', 'cursor': 'updated_at'}})
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+		self.store.close()
+		shutil.rmtree(self.directory)
+
+	def test_more_than_a_page_sharing_the_watermark(self):
+		self.simulator.seed('prospect', 5, updated_at='2019-01-01 09:59:59')
+		self.simulator.seed('prospect', 450, updated_at='2019-01-01 10:00:00')
+		self.simulator.seed('prospect', 5, updated_at='2019-01-01 10:00:01')
+		ids = [change.record['id'] for change in self.sync.changes('prospects')]
+		self.assertEqual(sorted(ids), list(range(1, 461)))
+		self.assertEqual(self.store.get('prospects')['watermark'], '2019-01-01 10:00:01')
+
+		self.simulator.seed('prospect', 300, updated_at='2019-01-01 10:00:01')
+		ids = [change.record['id'] for change in self.sync.changes('prospects')]
+		self.assertEqual(sorted(ids), list(range(461, 761)))
+		self.assertEqual([change for change in self.sync.changes('prospects')], [])
@@ -0,0 +1,118 @@
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotAPIError
+from pypardot.instrumentation import HistogramCollector, Instrument, OpenTelemetrySpans, route
+from pypardot.retry import RetryPolicy
+from pypardot.simulator import Simulator
+
+from .test_retry import LOGIN, OK
+
+try:
+	from opentelemetry.sdk.trace import TracerProvider
+	from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+	from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+	TracerProvider = None
+
+
+class Recorder(Instrument):
+	def __init__(self):
+		self.events = []
+
+	def before_request(self, request):
+		self.events.append(('before', request.object_name, request.attempts))
+
+	def after_response(self, request):
+		self.events.append(('after', request.object_name, request))
+
+
+class MinimalTransport(object):
+	"""A custom transport whose responses only have a status, headers and a JSON body."""
+
+	def get(self, url, **kwargs):
+		return OK
+
+	def post(self, url, **kwargs):
+		return LOGIN if '/api/login/' in url else OK
+
+
+class TestInstrumentation(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.simulator.seed('prospect', 3)
+		self.recorder = Recorder()
+		self.collector = HistogramCollector()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri,
+						   instruments=[self.recorder, self.collector])
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+
+	def test_routes_group_identifiers(self):
+		self.assertEqual(route('/do/read/id/42'), '/do/read/id/{id}')
+		self.assertEqual(route('/do/read/list_id/1/prospect_id/2'), '/do/read/list_id/{list_id}/prospect_id/{prospect_id}')
+		self.assertEqual(route('/do/query'), '/do/query')
+		self.assertEqual(route(None), '')
+
+	def test_hooks_see_each_call_once(self):
+		self.p.prospects.read_by_id(id=1)
+		self.assertEqual([event[:2] for event in self.recorder.events],
+						 [('before', 'prospect'), ('before', 'login'), ('after', 'login'), ('after', 'prospect')])
+		self.assertEqual(self.recorder.events[0][2], 0)
+		login, read = self.recorder.events[2][2], self.recorder.events[3][2]
+		self.assertEqual((read.route, read.status, read.attempts, read.retries), ('/do/read/id/{id}', 200, 1, 0))
+		self.assertGreater(read.bytes_received, 0)
+		self.assertGreater(read.bytes_sent, 0)
+		self.assertIsNotNone(read.ttfb)
+		self.assertGreaterEqual(read.elapsed, read.ttfb)
+		# The login opened the connection; the read reused it.
+		self.assertGreater(login.connect, 0)
+		self.assertEqual(read.connect, 0)
+
+	def test_collector_counts_retries_reauthentication_and_errors(self):
+		self.p.retry_policy = RetryPolicy(base_delay=0)
+		self.p.prospects.read_by_id(id=1)
+		self.simulator.fail_next('server_error')
+		self.p.prospects.read_by_id(id=2)
+		self.simulator.fail_next('expired_key')
+		self.p.prospects.read_by_id(id=3)
+		with self.assertRaises(PardotAPIError):
+			self.p.prospects.read_by_id(id=4)
+
+		stats = self.collector.snapshot()
+		self.assertEqual(stats['login']['calls'], 2)
+		reads = stats['prospect /do/read/id/{id}']
+		self.assertEqual((reads['calls'], reads['errors'], reads['retries'], reads['reauthentications']), (4, 1, 1, 1))
+		self.assertEqual(reads['statuses'], {200: 3, 400: 1})
+		self.assertEqual(list(reads['err_codes']), [self.recorder.events[-1][2].err_code])
+		self.assertEqual(reads['latency']['count'], 4)
+
+	def test_custom_transports_need_only_minimal_responses(self):
+		recorder, collector = Recorder(), HistogramCollector()
+		p = PardotAPI('email', 'password', 'user_key', transport=MinimalTransport(), instruments=[recorder, collector])
+		self.assertEqual(p.prospects.read_by_id(id=1)['prospect']['id'], 1)
+		read = recorder.events[-1][2]
+		self.assertEqual((read.status, read.attempts), (200, 1))
+		self.assertEqual((read.ttfb, read.bytes_sent, read.bytes_received), (None, None, None))
+		stats = collector.snapshot()['prospect /do/read/id/{id}']
+		self.assertEqual((stats['calls'], stats['bytes_sent']), (1, 0))
+
+	@unittest.skipIf(TracerProvider is None, 'opentelemetry-sdk is not installed')
+	def test_spans_are_emitted(self):
+		exporter = InMemorySpanExporter()
+		provider = TracerProvider()
+		provider.add_span_processor(SimpleSpanProcessor(exporter))
+		self.p.instruments = [OpenTelemetrySpans(provider.get_tracer('test'))]
+		self.p.prospects.read_by_id(id=1)
+		with self.assertRaises(PardotAPIError):
+			self.p.prospects.read_by_id(id=4)
+
+		spans = exporter.get_finished_spans()
+		self.assertEqual([span.name for span in spans],
+						 ['pardot login', 'pardot prospect /do/read/id/{id}', 'pardot prospect /do/read/id/{id}'])
+		self.assertEqual(spans[1].attributes['http.response.status_code'], 200)
+		self.assertTrue(spans[1].status.is_ok)
+		self.assertIn('pardot.err_code', spans[2].attributes)
+		self.assertFalse(spans[2].status.is_ok)
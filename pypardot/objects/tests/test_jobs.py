@@ -0,0 +1,80 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.jobs import BulkWriteJob, QueryExportJob, SQLiteJobStore
+from pypardot.simulator import Simulator
+
+
+class Interrupted(Exception):
+	pass
+
+
+def interrupt_after(count):
+	calls = []
+
+	def progress(job_progress):
+		calls.append(job_progress)
+		if len(calls) == count:
+			raise Interrupted()
+	return progress
+
+
+class TestJobs(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.store = SQLiteJobStore(os.path.join(self.directory, 'jobs.db'))
+		self.simulator = Simulator(seed=1).start()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri)
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+		self.store.close()
+		shutil.rmtree(self.directory)
+
+	def test_bulk_writes_resume_without_rewriting_batches(self):
+		records = [{'email': 'p{0}@example.com'.format(i)} for i in range(300)] + [{'first_name': 'No email'}]
+		with self.assertRaises(Interrupted):
+			BulkWriteJob(self.p.prospects, self.store, 'load', operation='create', workers=1,
+						 progress=interrupt_after(2)).run(records)
+		self.assertEqual(self.simulator.requests[('prospect', 'batchCreate')], 3)
+
+		# The third batch was written, but the run died before checkpointing it.
+		self.store.start_batch('load', 2, 50)
+		progress = BulkWriteJob(self.p.prospects, self.store, 'load', operation='create').run(records)
+		self.assertEqual(self.simulator.requests[('prospect', 'batchCreate')], 7)
+		self.assertEqual(self.simulator.requests[('prospect', 'batchUpsert')], 1)
+		self.assertEqual((progress.done, progress.resumed, progress.total, progress.failed), (301, 100, 301, 1))
+		self.assertEqual(progress.eta, 0)
+		self.assertEqual(len(self.simulator.records['prospect']), 300)
+		self.assertEqual([(error.index, error.record) for error in self.store.failures('load')],
+						 [(300, {'first_name': 'No email'})])
+
+		BulkWriteJob(self.p.prospects, self.store, 'load', operation='create').run(records)
+		self.assertEqual(self.simulator.requests[('prospect', 'batchCreate')], 7)
+		with self.assertRaises(ValueError):
+			BulkWriteJob(self.p.prospects, self.store, 'load', operation='upsert').run(records)
+
+	def test_exports_resume_after_the_last_complete_part(self):
+		self.simulator.seed('prospect', 450)
+		with self.assertRaises(Interrupted):
+			QueryExportJob(self.p.prospects, self.store, 'prospects', self.directory, part_size=200,
+						   progress=interrupt_after(1)).run()
+		stale = os.path.join(self.directory, 'prospects-00001.csv.tmp')
+		open(stale, 'w').close()
+
+		job = QueryExportJob(self.p.prospects, self.store, 'prospects', self.directory, part_size=200)
+		progress = job.run()
+		self.assertEqual((progress.done, progress.resumed, progress.total), (450, 200, 450))
+		self.assertFalse(os.path.exists(stale))
+		ids = []
+		for path in job.parts():
+			with open(path) as f:
+				ids.extend(int(row['id']) for row in csv.DictReader(f))
+		self.assertEqual([os.path.basename(path) for path in job.parts()],
+						 ['prospects-00000.csv', 'prospects-00001.csv', 'prospects-00002.csv'])
+		self.assertEqual(ids, list(range(1, 451)))
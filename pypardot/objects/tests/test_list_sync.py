@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pypardot.errors import PardotAPIError
+from pypardot.listsync import ListSync
+
+
+class Interrupted(Exception):
+	pass
+
+
+class FakeListMemberships(object):
+	"""
+	In-memory list memberships for a single list, optionally failing writes for some prospects and interrupting the
+	sync at others.
+	"""
+
+	def __init__(self, members, failing=(), interrupting=(), quota=None):
+		self.members = dict(members)
+		self.failing = set(failing)
+		self.interrupting = set(interrupting)
+		self.quota = quota
+		self.calls = 0
+		self.writes = []
+		self.lock = threading.Lock()
+
+	def iter_query(self, list_id=None):
+		for prospect_id, opted_out in sorted(self.members.items()):
+			yield {'list_id': list_id, 'prospect_id': prospect_id, 'opted_out': opted_out}
+
+	def create(self, list_id=None, prospect_id=None, opted_out=0):
+		self._write('create', prospect_id)
+		self.members[prospect_id] = bool(opted_out)
+
+	def update(self, list_id=None, prospect_id=None, opted_out=0):
+		self._write('update', prospect_id)
+		self.members[prospect_id] = bool(opted_out)
+
+	def delete(self, list_id=None, prospect_id=None):
+		self._write('delete', prospect_id)
+		del self.members[prospect_id]
+
+	def _write(self, operation, prospect_id):
+		with self.lock:
+			self.calls += 1
+			if self.quota is not None and self.calls > self.quota:
+				raise PardotAPIError({'@attributes': {'err_code': 66}, 'err': 'You have exceeded your daily API call limit'})
+		if prospect_id in self.interrupting:
+			raise Interrupted()
+		if prospect_id in self.failing:
+			raise PardotAPIError({'@attributes': {'err_code': 3}, 'err': 'Invalid prospect ID'})
+		with self.lock:
+			self.writes.append((operation, prospect_id))
+
+
+class TestListSync(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_only_differences_are_written(self):
+		memberships = FakeListMemberships(dict((pid, False) for pid in range(1, 1001)))
+		desired = list(range(3, 1003))
+		result = ListSync(memberships, 7).sync(desired, opted_out_prospect_ids=[5, 1002])
+		self.assertEqual(memberships.members, dict((pid, pid in (5, 1002)) for pid in desired))
+		self.assertEqual(result.applied, {'add': 2, 'remove': 2, 'opt_out': 1, 'opt_in': 0})
+		self.assertEqual(len(memberships.writes), 5)
+
+	def test_interrupted_sync_resumes_from_saved_plan(self):
+		state_path = os.path.join(self.directory, 'list7.json')
+		memberships = FakeListMemberships({1: False, 2: False}, interrupting=[4])
+		with self.assertRaises(Interrupted):
+			ListSync(memberships, 7, workers=1, state_path=state_path).sync([2, 3, 4])
+		self.assertTrue(os.path.exists(state_path))
+
+		memberships.interrupting = set()
+		memberships.writes = []
+		memberships.iter_query = None  # Resuming must not read the list again.
+		second = ListSync(memberships, 7, state_path=state_path).sync([2, 3, 4])
+		self.assertEqual(memberships.writes, [('create', 4)])
+		self.assertEqual(second.errors, [])
+		self.assertEqual(sorted(memberships.members), [2, 3, 4])
+		self.assertFalse(os.path.exists(state_path))
+
+	def test_saved_plan_for_other_prospects_or_list_is_not_resumed(self):
+		state_path = os.path.join(self.directory, 'list7.json')
+		memberships = FakeListMemberships({1: False, 2: False}, interrupting=[4])
+		with self.assertRaises(Interrupted):
+			ListSync(memberships, 7, workers=1, state_path=state_path).sync([2, 3, 4])
+
+		memberships.interrupting = set()
+		ListSync(memberships, 8, state_path=state_path).sync([1, 2, 3, 4])
+		self.assertEqual(sorted(memberships.members), [1, 2, 3, 4])
+		self.assertFalse(os.path.exists(state_path + '.journal'))
+
+	def test_account_errors_stop_the_sync(self):
+		state_path = os.path.join(self.directory, 'list7.json')
+		memberships = FakeListMemberships({}, quota=3)
+		with self.assertRaises(PardotAPIError) as context:
+			ListSync(memberships, 7, workers=2, state_path=state_path).sync(range(1, 101))
+		self.assertEqual(context.exception.err_code, 66)
+		written = len(memberships.writes)
+		self.assertEqual(written, 3)
+		self.assertLessEqual(memberships.calls, 3 + 2)
+		self.assertTrue(os.path.exists(state_path))
+		self.assertTrue(os.path.exists(state_path + '.journal'))
+
+		memberships.quota = None
+		memberships.calls = 0
+		memberships.iter_query = None  # Resuming must not read the list again.
+		result = ListSync(memberships, 7, state_path=state_path).sync(range(1, 101))
+		self.assertEqual(result.applied['add'], 100 - written)
+		self.assertEqual(memberships.calls, 100 - written)
+		self.assertEqual(sorted(memberships.members), list(range(1, 101)))
+		self.assertFalse(os.path.exists(state_path))
+
+	def test_permanent_failures_do_not_pin_the_plan(self):
+		state_path = os.path.join(self.directory, 'list7.json')
+		memberships = FakeListMemberships({1: False, 2: False}, failing=[4])
+		first = ListSync(memberships, 7, state_path=state_path).sync([2, 3, 4])
+		self.assertEqual(first.errors, [('add', 4, 'Invalid prospect ID')])
+		self.assertFalse(os.path.exists(state_path))
+
+		second = ListSync(memberships, 7, state_path=state_path).sync([2, 5])
+		self.assertEqual(second.applied['remove'], 1)
+		self.assertEqual(sorted(memberships.members), [2, 5])
+
+
+if __name__ == '__main__':
+	unittest.main()
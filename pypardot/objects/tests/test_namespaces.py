@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+from pypardot.client import OBJECT_MODULES, PardotAPI
+from pypardot.objects.prospects import Prospects
+
+
+class TestNamespaces(unittest.TestCase):
+	def test_object_modules_are_imported_on_first_use(self):
+		code = ('import sys\n'
+				'from pypardot.client import PardotAPI\n'
+				'p = PardotAPI("email", "password", "user_key")\n'
+				'print(sorted(m for m in sys.modules if m.startswith("pypardot.objects.")))\n'
+				'p.prospects\n'
+				'print(sorted(m for m in sys.modules if m.startswith("pypardot.objects.")))\n')
+		before, after = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').splitlines()
+		self.assertEqual(before, '[]')
+		self.assertIn("'pypardot.objects.prospects'", after)
+		self.assertNotIn("'pypardot.objects.visits'", after)
+
+	def test_namespaces_behave_as_attributes(self):
+		p = PardotAPI('email', 'password', 'user_key')
+		self.assertIsInstance(p.prospects, Prospects)
+		self.assertIs(p.prospects, p.prospects)
+		self.assertIs(p.prospects.client, p)
+		self.assertTrue(all(hasattr(p, name) for name, _, _ in OBJECT_MODULES))
+		p.prospects = 'replaced'
+		self.assertEqual(p.prospects, 'replaced')
+
+	def test_object_classes_can_still_be_imported_from_the_client(self):
+		from pypardot.client import OBJECT_NAMESPACES, Prospects as ClientProspects
+		self.assertIs(ClientProspects, Prospects)
+		self.assertIn(('prospects', Prospects), OBJECT_NAMESPACES)
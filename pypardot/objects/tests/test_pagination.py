@@ -0,0 +1,182 @@
+import threading
+import time
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotAPIError
+from pypardot.pagination import iter_query, read_many
+from pypardot.simulator import Simulator
+
+
+class FakeQuery(object):
+	"""
+	Serves query() pages from an in-memory table, honouring the criteria iter_query sends. Timestamp criteria are
+	exclusive, as in Pardot and the Simulator, unless <inclusive> is set.
+	"""
+
+	def __init__(self, rows, inclusive=False):
+		self.rows = rows
+		self.inclusive = inclusive
+		self.calls = []
+		self.lock = threading.Lock()
+
+	def __call__(self, **criteria):
+		with self.lock:
+			self.calls.append(dict(criteria))
+		rows = self.rows
+		if 'id_greater_than' in criteria:
+			rows = [r for r in rows if r['id'] > criteria['id_greater_than']]
+		if 'id_less_than' in criteria:
+			rows = [r for r in rows if r['id'] < criteria['id_less_than']]
+		if 'updated_after' in criteria:
+			rows = [r for r in rows if r['updated_at'] > criteria['updated_after'] or
+				(self.inclusive and r['updated_at'] == criteria['updated_after'])]
+		if 'updated_before' in criteria:
+			rows = [r for r in rows if r['updated_at'] < criteria['updated_before'] or
+				(self.inclusive and r['updated_at'] == criteria['updated_before'])]
+		rows = sorted(rows, key=lambda r: (r[criteria['sort_by']], r['id']),
+			reverse=criteria.get('sort_order') == 'descending')
+		page = rows[:criteria['limit']]
+		result = {'total_results': len(rows), 'prospect': page}
+		if len(page) == 1:
+			result['prospect'] = page[0]
+		return result
+
+
+class TestIterQuery(unittest.TestCase):
+	def test_id_cursor_walks_all_pages(self):
+		query = FakeQuery([{'id': i, 'updated_at': '2019-01-01 00:00:00'} for i in range(1, 12)])
+		ids = [row['id'] for row in iter_query(query, 'prospect', page_size=5)]
+		self.assertEqual(ids, list(range(1, 12)))
+		self.assertEqual([c.get('id_greater_than') for c in query.calls], [None, 5, 10])
+		self.assertTrue(all('offset' not in c for c in query.calls))
+
+	def test_early_termination_stops_requests(self):
+		query = FakeQuery([{'id': i} for i in range(1, 100)])
+		for row in iter_query(query, 'prospect', page_size=10):
+			if row['id'] == 3:
+				break
+		self.assertEqual(len(query.calls), 1)
+
+	def test_timestamp_cursor_skips_boundary_duplicates(self):
+		stamps = ['2019-01-01 00:00:0{0}'.format(i // 3) for i in range(9)]
+		query = FakeQuery([{'id': i + 1, 'updated_at': s} for i, s in enumerate(stamps)])
+		ids = [row['id'] for row in iter_query(query, 'prospect', cursor='updated_at', page_size=4)]
+		self.assertEqual(sorted(ids), list(range(1, 10)))
+		self.assertEqual(len(ids), len(set(ids)))
+
+	def test_timestamp_cursor_drains_full_page_ties(self):
+		rows = [{'id': i, 'updated_at': '2019-01-01 00:00:00'} for i in range(1, 8)]
+		rows += [{'id': i, 'updated_at': '2019-01-01 00:00:01'} for i in range(8, 10)]
+		rows += [{'id': 10, 'updated_at': '2019-01-01 00:00:05'}]
+		ids = [row['id'] for row in iter_query(FakeQuery(rows), 'prospect', cursor='updated_at', page_size=3)]
+		self.assertEqual(sorted(ids), list(range(1, 11)))
+		self.assertEqual(len(ids), len(set(ids)))
+
+	def test_timestamp_cursor_handles_inclusive_criteria(self):
+		rows = [{'id': i, 'updated_at': '2019-01-01 00:00:00'} for i in range(1, 8)]
+		rows += [{'id': i, 'updated_at': '2019-01-01 00:00:01'} for i in range(8, 16)]
+		rows += [{'id': i, 'updated_at': '2019-01-01 00:00:0{0}'.format(i % 10)} for i in range(16, 26)]
+		query = FakeQuery(rows, inclusive=True)
+		ids = [row['id'] for row in iter_query(query, 'prospect', cursor='updated_at', page_size=3)]
+		self.assertEqual(sorted(ids), list(range(1, 26)))
+		self.assertEqual(len(ids), len(set(ids)))
+
+	def test_parallel_windows_yield_every_record_in_order(self):
+		query = FakeQuery([{'id': i} for i in range(3, 2000, 3)])
+		ids = [row['id'] for row in iter_query(query, 'prospect', page_size=50, parallel=4)]
+		self.assertEqual(ids, list(range(3, 2000, 3)))
+		windows = set((c['id_greater_than'], c['id_less_than']) for c in query.calls if 'id_less_than' in c)
+		self.assertTrue(len(windows) > 1)
+
+	def test_parallel_stops_cleanly_on_early_termination(self):
+		query = FakeQuery([{'id': i} for i in range(1, 5000)])
+		rows = iter_query(query, 'prospect', page_size=10, parallel=4)
+		self.assertEqual(next(rows)['id'], 1)
+		rows.close()
+		time.sleep(0.5)
+		# Only the windows already being fetched were started; queued ones send nothing.
+		windows = set(c['id_less_than'] for c in query.calls if 'id_less_than' in c)
+		self.assertLessEqual(len(windows), 4)
+
+	def test_parallel_surfaces_worker_errors(self):
+		def failing(**criteria):
+			if 'id_less_than' in criteria:
+				raise RuntimeError('boom')
+			return {'total_results': 1, 'prospect': {'id': 1 if criteria['sort_order'] == 'ascending' else 900}}
+		with self.assertRaises(RuntimeError):
+			list(iter_query(failing, 'prospect', page_size=10, parallel=2))
+
+
+class TestTimestampCursorWithSimulator(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri)
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+
+	def test_ties_spanning_several_pages_are_all_yielded(self):
+		self.simulator.seed('prospect', 5, created_at='2018-12-31 23:59:59')
+		self.simulator.seed('prospect', 450, created_at='2019-01-01 00:00:00')
+		self.simulator.seed('prospect', 5)
+		ids = [row['id'] for row in self.p.prospects.iter_query(cursor='created_at')]
+		self.assertEqual(sorted(ids), list(range(1, 461)))
+		self.assertEqual(len(ids), len(set(ids)))
+
+		ids = [row['id'] for row in self.p.prospects.iter_query(cursor='created_at', created_after='2018-12-31 23:59:59')]
+		self.assertEqual(sorted(ids), list(range(6, 461)))
+
+class TestReadMany(unittest.TestCase):
+	def test_nearby_ids_share_range_queries(self):
+		query = FakeQuery([{'id': i} for i in range(1, 2001) if i != 150])
+		ids = list(range(1, 400)) + [1500, 1501]
+		found = read_many(ids, 'prospect', query=query)
+		self.assertEqual(sorted(found), [i for i in ids if i != 150])
+		self.assertEqual(len(query.calls), 3)
+
+	def test_scattered_ids_share_queries_where_records_are_sparse(self):
+		query = FakeQuery([{'id': i} for i in range(1, 100000, 97)])
+		ids = list(range(1, 100000, 97 * 20)) + [50]
+		found = read_many(ids, 'prospect', query=query, workers=1)
+		self.assertEqual(sorted(found), ids[:-1])
+		self.assertEqual(len(query.calls), 7)
+
+		# Among dense records, each scattered id still costs no more than one query.
+		query = FakeQuery([{'id': i} for i in range(1, 2001)])
+		self.assertEqual(len(read_many(range(1, 2001, 250), 'prospect', query=query)), 8)
+		self.assertEqual(len(query.calls), 8)
+
+	def test_id_list_queries_200_ids_at_a_time(self):
+		calls = []
+
+		def query_by_ids(ids=None):
+			calls.append(ids)
+			return {'visit': [{'id': int(i)} for i in ids.split(',')]}
+
+		found = read_many(range(0, 5000, 10), 'visit', query=query_by_ids, id_list=True)
+		self.assertEqual(len(found), 500)
+		self.assertEqual(len(calls), 3)
+
+	def test_falls_back_to_reads(self):
+		found = read_many(['3', 4], 'email', read=lambda email_id: {'email': {'id': email_id, 'name': 'Welcome'}})
+		self.assertEqual(found, {3: {'id': 3, 'name': 'Welcome'}, 4: {'id': 4, 'name': 'Welcome'}})
+
+	def test_reads_skip_invalid_ids(self):
+		simulator = Simulator(seed=1).start()
+		p = PardotAPI('email', 'password', 'user_key', base_uri=simulator.base_uri)
+		try:
+			simulator.seed('email', 2)
+			found = p.emails.read_many([1, 2, 1000])
+			self.assertEqual(sorted(found), [1, 2])
+			simulator.fail_next('daily_limit')
+			with self.assertRaises(PardotAPIError):
+				p.emails.read_many([1], workers=1)
+		finally:
+			p.transport.close()
+			simulator.stop()
+
+
+if __name__ == '__main__':
+	unittest.main()
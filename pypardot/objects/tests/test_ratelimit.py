@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from pypardot.errors import PardotQuotaExceededError
+from pypardot.ratelimit import RateLimiter, FileBackend
+
+
+class TestRateLimiter(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_daily_quota_is_enforced_and_reported(self):
+		limiter = RateLimiter(daily_limit=3)
+		for _ in range(3):
+			with limiter.limit():
+				pass
+		self.assertEqual(limiter.quota_used, 3)
+		self.assertEqual(limiter.quota_remaining, 0)
+		with self.assertRaises(PardotQuotaExceededError):
+			limiter.acquire()
+
+	def test_token_bucket_spaces_out_calls(self):
+		limiter = RateLimiter(rate=20, burst=1)
+		start = time.time()
+		for _ in range(5):
+			with limiter.limit():
+				pass
+		self.assertTrue(time.time() - start >= 0.15)
+
+	def test_concurrency_cap(self):
+		limiter = RateLimiter(max_concurrent=2)
+		active, peak, lock = [0], [0], threading.Lock()
+
+		def work():
+			with limiter.limit():
+				with lock:
+					active[0] += 1
+					peak[0] = max(peak[0], active[0])
+				time.sleep(0.02)
+				with lock:
+					active[0] -= 1
+
+		threads = [threading.Thread(target=work) for _ in range(8)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(peak[0], 2)
+
+	def test_file_backend_shares_quota(self):
+		path = os.path.join(self.directory, 'account')
+		first = RateLimiter(daily_limit=10, backend=FileBackend(path))
+		second = RateLimiter(daily_limit=10, backend=FileBackend(path))
+		with first.limit():
+			pass
+		with second.limit():
+			pass
+		self.assertEqual(first.quota_used, 2)
+		second.exhaust_quota()
+		self.assertEqual(first.quota_remaining, 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
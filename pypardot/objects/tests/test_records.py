@@ -0,0 +1,33 @@
+import unittest
+from datetime import datetime
+
+from pypardot.records import RecordColumns, record_class
+
+
+class TestRecords(unittest.TestCase):
+	def test_fields_are_parsed_on_first_access(self):
+		prospect = record_class('prospect')({
+			'id': '12', 'email': 'joe@company.com', 'score': '40', 'opted_out': '1',
+			'created_at': '2019-01-31 13:45:00', 'favourite_colour': 'blue'})
+		self.assertFalse(hasattr(prospect, '__dict__'))
+		self.assertEqual(prospect._score, '40')
+		self.assertEqual(prospect.score, 40)
+		self.assertEqual(prospect._score, 40)
+		self.assertIs(prospect.opted_out, True)
+		self.assertEqual(prospect.created_at, datetime(2019, 1, 31, 13, 45))
+		self.assertEqual(prospect['email'], 'joe@company.com')
+		self.assertEqual(prospect.get('favourite_colour'), 'blue')
+		self.assertIsNone(prospect.last_name)
+		with self.assertRaises(KeyError):
+			prospect['missing']
+
+	def test_columns(self):
+		columns = RecordColumns('visitorActivity', [
+			{'id': 1, 'type': '2', 'created_at': '2019-01-01 00:00:00'},
+			{'id': 2, 'type': 4, 'created_at': None, 'campaign': {'id': 3}}])
+		self.assertEqual(len(columns), 2)
+		self.assertEqual(columns.column('type'), [2, 4])
+		self.assertEqual(columns.column('created_at'), [datetime(2019, 1, 1), None])
+		self.assertEqual(columns.column('campaign'), [None, {'id': 3}])
+		self.assertEqual([activity.id for activity in columns], [1, 2])
+		self.assertEqual(columns[1]['campaign'], {'id': 3})
@@ -0,0 +1,79 @@
+import unittest
+
+from pypardot.client import OBJECT_MODULES, PardotAPI
+from pypardot.errors import PardotAPIArgumentError
+from pypardot.objects.registry import OBJECTS
+
+
+class RecordingClient(object):
+	"""Stands in for PardotAPI, recording each request and answering with <response>."""
+
+	def __init__(self, response=None):
+		self.response = response
+		self.requests = []
+
+	def get(self, object_name, path=None, params=None):
+		self.requests.append(('get', object_name, path, params))
+		return self.response
+
+	def post(self, object_name, path=None, params=None):
+		self.requests.append(('post', object_name, path, params))
+		return self.response
+
+
+class TestRegistry(unittest.TestCase):
+	def setUp(self):
+		self.client = RecordingClient()
+		self.p = PardotAPI('email', 'password', 'user_key')
+		for name, _, _ in OBJECT_MODULES:
+			getattr(self.p, name).client = self.client
+
+	def test_every_namespace_is_generated_from_the_registry(self):
+		for name, module, class_name in OBJECT_MODULES:
+			self.assertIn(class_name, OBJECTS)
+			wrapper = getattr(self.p, name)
+			self.assertEqual(type(wrapper).__module__, 'pypardot.objects.' + module)
+			self.assertTrue(type(wrapper).__doc__)
+
+	def test_operations_send_their_parameters(self):
+		self.p.customfields.update(id=3, name='Region')
+		self.p.opportunities.update(id=4, probability=90)
+		self.p.prospectaccounts.assign(id=5, user_id=6)
+		self.assertEqual(self.client.requests, [
+			('post', 'customField', '/do/update/id/3', {'name': 'Region'}),
+			('post', 'opportunity', '/do/update/id/4', {'probability': 90}),
+			('post', 'prospectAccount', '/do/assign/id/5', {'user_id': 6}),
+		])
+
+	def test_positional_arguments(self):
+		self.p.opportunities.create_by_id(7, 'Renewal', 1000, 50)
+		self.p.listmemberships.read(8, 9)
+		self.assertEqual(self.client.requests, [
+			('post', 'opportunity', '/do/create/prospect_id/7', {'name': 'Renewal', 'value': 1000, 'probability': 50}),
+			('post', 'listMembership', '/do/read/list_id/8/prospect_id/9', {}),
+		])
+		with self.assertRaises(TypeError):
+			self.p.tags.read(1, 2)
+
+	def test_missing_identifiers_are_rejected_before_any_request(self):
+		with self.assertRaises(PardotAPIArgumentError):
+			self.p.prospects.read_by_email()
+		with self.assertRaises(PardotAPIArgumentError):
+			self.p.listmemberships.create(list_id=1)
+		with self.assertRaises(PardotAPIArgumentError):
+			self.p.visits.query_by_ids()
+		self.assertEqual(self.client.requests, [])
+
+	def test_query_results_are_lists(self):
+		self.client.response = {'result': {'total_results': 1, 'visit': {'id': 1}}}
+		result = self.p.visits.query_by_ids(ids='1, 2')
+		self.assertEqual(result['visit'], [{'id': 1}])
+		self.assertEqual(self.client.requests[-1], ('get', 'visit', '/do/query', {'ids': '1,2'}))
+
+		self.client.response = {'result': {'total_results': 0}}
+		self.assertEqual(self.p.tags.query(name='a')['tag'], [])
+
+	def test_deletes_report_success(self):
+		self.client.response = 204
+		self.assertTrue(self.p.prospects.delete_by_id(id=1))
+		self.assertEqual(self.p.lists.delete(id=2), 204)
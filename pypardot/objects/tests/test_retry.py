@@ -0,0 +1,90 @@
+import unittest
+
+import requests
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotAPIError
+from pypardot.retry import RetryPolicy
+
+
+class FakeResponse(object):
+	def __init__(self, body=None, status_code=200):
+		self.body = body
+		self.status_code = status_code
+		self.headers = {'content-type': 'application/json'} if body is not None else {}
+
+	def json(self):
+		return self.body
+
+
+OK = FakeResponse({'@attributes': {'stat': 'ok'}, 'prospect': {'id': 1}})
+LOGIN = FakeResponse({'@attributes': {'stat': 'ok'}, 'api_key': 'key'})
+TOO_MANY = FakeResponse({'@attributes': {'stat': 'fail', 'err_code': 122}, 'err': 'Too many concurrent requests'})
+BAD_ID = FakeResponse({'@attributes': {'stat': 'fail', 'err_code': 3}, 'err': 'Invalid prospect ID'})
+
+
+class ScriptedTransport(object):
+	"""Plays back a script of responses (or exceptions) for non-login requests."""
+
+	def __init__(self, *script):
+		self.script = list(script)
+		self.calls = 0
+
+	def get(self, url, **kwargs):
+		return self._next(url)
+
+	def post(self, url, **kwargs):
+		return self._next(url)
+
+	def _next(self, url):
+		if '/api/login/' in url:
+			return LOGIN
+		self.calls += 1
+		outcome = self.script.pop(0)
+		if isinstance(outcome, Exception):
+			raise outcome
+		return outcome
+
+
+class TestRetryPolicy(unittest.TestCase):
+	def client(self, transport, **policy):
+		policy.setdefault('base_delay', 0)
+		return PardotAPI('email', 'password', 'user_key', transport=transport, retry_policy=RetryPolicy(**policy))
+
+	def test_retries_retryable_failures_then_succeeds(self):
+		transport = ScriptedTransport(TOO_MANY, requests.exceptions.ConnectionError(), FakeResponse(status_code=502), OK)
+		client = self.client(transport)
+		self.assertEqual(client.prospects.read_by_id(id=1)['prospect']['id'], 1)
+		stats = client.retry_policy.stats.as_dict()
+		self.assertEqual(stats['retries'], 3)
+		self.assertEqual(stats['retries_by_reason'], {'err_code_122': 1, 'connection_error': 1, 'http_502': 1})
+
+	def test_fatal_errors_are_not_retried(self):
+		transport = ScriptedTransport(BAD_ID, OK)
+		with self.assertRaises(PardotAPIError):
+			self.client(transport).prospects.read_by_id(id=1)
+		self.assertEqual(transport.calls, 1)
+
+	def test_gives_up_after_max_attempts(self):
+		transport = ScriptedTransport(TOO_MANY, TOO_MANY, TOO_MANY)
+		client = self.client(transport, max_attempts=2)
+		with self.assertRaises(PardotAPIError):
+			client.prospects.read_by_id(id=1)
+		self.assertEqual(transport.calls, 2)
+		self.assertEqual(client.retry_policy.stats.gave_up, 1)
+
+	def test_writes_are_not_retried_after_a_read_timeout(self):
+		transport = ScriptedTransport(requests.exceptions.ReadTimeout(), OK)
+		with self.assertRaises(requests.exceptions.ReadTimeout):
+			self.client(transport).prospects.create(email='joe@company.com')
+		self.assertEqual(transport.calls, 1)
+
+	def test_deadline_stops_retrying(self):
+		transport = ScriptedTransport(TOO_MANY, OK)
+		client = self.client(transport, base_delay=10, max_delay=10, deadline=0)
+		with self.assertRaises(PardotAPIError):
+			client.prospects.read_by_id(id=1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotAPIError
+from pypardot.retry import RetryPolicy
+from pypardot.simulator import Simulator
+
+
+class TestSimulator(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.p = PardotAPI('email', 'password', 'user_key', base_uri=self.simulator.base_uri)
+
+	def tearDown(self):
+		self.p.transport.close()
+		self.simulator.stop()
+
+	def test_queries_are_paged(self):
+		self.simulator.seed('prospect', 450)
+		ids = [prospect['id'] for prospect in self.p.prospects.iter_query()]
+		self.assertEqual(ids, list(range(1, 451)))
+		self.assertEqual(self.simulator.requests[('prospect', 'query')], 3)
+
+		result = self.p.prospects.query(id_greater_than=449)
+		self.assertEqual(result['total_results'], 1)
+		self.assertEqual(len(result['prospect']), 1)
+
+	def test_timestamp_criteria_are_exclusive(self):
+		self.simulator.seed('prospect', 3, created_at='2019-01-01 00:00:00')
+		self.simulator.seed('prospect', 2, created_at='2019-01-01 00:00:01')
+		self.assertEqual(self.p.prospects.query(created_after='2019-01-01 00:00:00')['total_results'], 2)
+		self.assertEqual(self.p.prospects.query(created_before='2019-01-01 00:00:01')['total_results'], 3)
+
+	def test_records_can_be_created_read_updated_and_deleted(self):
+		prospect = self.p.prospects.create(email='joe@company.com', first_name='Joe')['prospect']
+		self.p.prospects.update_by_id(id=prospect['id'], company='Joes Plumbing')
+		self.assertEqual(self.p.prospects.read_by_email(email='joe@company.com')['prospect']['company'], 'Joes Plumbing')
+		self.assertTrue(self.p.prospects.delete_by_id(id=prospect['id']))
+		with self.assertRaises(PardotAPIError):
+			self.p.prospects.read_by_id(id=prospect['id'])
+
+	def test_batches_report_rejected_records(self):
+		records = [{'email': 'p{0}@example.com'.format(i)} for i in range(120)] + [{'first_name': 'No email'}]
+		result = self.p.prospects.bulk_upsert(records)
+		self.assertEqual((result.records, result.batches), (121, 3))
+		self.assertEqual([error.index for error in result.errors], [120])
+		self.assertEqual(len(self.simulator.records['prospect']), 120)
+
+	def test_expired_keys_are_refreshed(self):
+		self.simulator.seed('campaign', 2)
+		self.p.campaigns.read(id=1)
+		self.simulator.fail_next('expired_key')
+		self.assertEqual(self.p.campaigns.read(id=2)['campaign']['id'], 2)
+		self.assertEqual(self.simulator.logins, 2)
+
+	def test_injected_failures_are_retried(self):
+		self.simulator.seed('tag', 1)
+		self.p.retry_policy = RetryPolicy(base_delay=0)
+		self.simulator.fail_next('server_error')
+		self.simulator.fail_next('concurrent_limit')
+		self.assertEqual(self.p.tags.read(id=1)['tag']['id'], 1)
+		self.assertEqual(self.p.retry_policy.stats.retries, 2)
@@ -0,0 +1,78 @@
+import json
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.errors import PardotAPIError
+from pypardot.streaming import RecordStream
+
+
+class StreamedResponse(object):
+	"""A JSON response whose body is read in small chunks."""
+
+	def __init__(self, body):
+		self.content = json.dumps(body).encode('utf-8')
+		self.status_code = 200
+		self.headers = {'content-type': 'application/json'}
+		self.closed = False
+
+	def json(self):
+		return json.loads(self.content.decode('utf-8'))
+
+	def iter_content(self, chunk_size=None):
+		for start in range(0, len(self.content), 7):
+			yield self.content[start:start + 7]
+
+	def close(self):
+		self.closed = True
+
+
+class ProspectPages(object):
+	"""Serves prospect query pages of <total> prospects, honouring id_greater_than and limit."""
+
+	def __init__(self, total, api_key='key'):
+		self.total = total
+		self.api_key = api_key
+		self.responses = []
+
+	def get(self, url, params=None, headers=None, stream=False, timeout=None):
+		if 'api_key={0},'.format(self.api_key) not in headers['Authorization']:
+			body = {'@attributes': {'stat': 'fail', 'err_code': 1}, 'err': 'Invalid API key or user key'}
+		else:
+			first = int(params.get('id_greater_than', 0)) + 1
+			ids = range(first, min(first + params['limit'], self.total + 1))
+			body = {'@attributes': {'stat': 'ok'},
+					'result': {'total_results': self.total - first + 1,
+							   'prospect': [{'id': i, 'email': 'p{0}@example.com'.format(i)} for i in ids]}}
+		self.responses.append(StreamedResponse(body))
+		return self.responses[-1]
+
+	def post(self, url, data=None, headers=None, timeout=None):
+		return StreamedResponse({'@attributes': {'stat': 'ok'}, 'api_key': 'key'})
+
+
+class TestStreaming(unittest.TestCase):
+	def test_records_are_decoded_across_chunk_boundaries(self):
+		body = json.dumps({'@attributes': {'stat': 'ok'}, 'result': {
+			'total_results': 2, 'prospect': [{'id': 1, 'first_name': 'Zoë'}, {'id': 2, 'score': 12345}]}}).encode('utf-8')
+		stream = RecordStream([body[i:i + 3] for i in range(0, len(body), 3)], 'prospect')
+		self.assertEqual(list(stream), [{'id': 1, 'first_name': 'Zoë'}, {'id': 2, 'score': 12345}])
+		self.assertEqual(stream.total_results, 2)
+
+	def test_iter_query_streams_every_page(self):
+		transport = ProspectPages(450)
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		ids = [prospect['id'] for prospect in client.prospects.iter_query(stream=True)]
+		self.assertEqual(ids, list(range(1, 451)))
+		self.assertEqual(len(transport.responses), 3)
+		self.assertTrue(all(response.closed for response in transport.responses))
+
+	def test_errors_are_raised_before_records_are_read(self):
+		transport = ProspectPages(10)
+		client = PardotAPI('email', 'password', 'user_key', transport=transport)
+		client.api_key = 'expired'
+		self.assertEqual(len(list(client.prospects.stream_query(limit=200))), 10)
+		self.assertEqual(client.api_key, 'key')
+
+		transport.api_key = 'revoked'
+		with self.assertRaises(PardotAPIError):
+			client.prospects.stream_query(limit=200)
@@ -0,0 +1,55 @@
+import unittest
+
+from pypardot.client import PardotAPI
+from pypardot.simulator import Simulator
+from pypardot.transport import Transport, take_connection_time
+
+
+class TestTransport(unittest.TestCase):
+	def setUp(self):
+		self.simulator = Simulator(seed=1).start()
+		self.simulator.seed('prospect', 1)
+		self.simulator.seed('visit', 1)
+
+	def tearDown(self):
+		self.simulator.stop()
+
+	def counts(self, transport):
+		"""Returns the connections opened and requests sent through the transport's pools."""
+		pools = transport.session.get_adapter(self.simulator.base_uri).poolmanager.pools
+		pools = [pools[key] for key in pools.keys()]
+		return sum(pool.num_connections for pool in pools), sum(pool.num_requests for pool in pools)
+
+	def test_objects_and_clients_share_one_session(self):
+		with Transport() as transport:
+			first = PardotAPI('email', 'password', 'user_key', transport=transport, base_uri=self.simulator.base_uri)
+			second = PardotAPI('email', 'password', 'user_key', transport=transport, base_uri=self.simulator.base_uri)
+			for client in (first, second):
+				client.prospects.read_by_id(id=1)
+				client.visits.read(id=1)
+				client.prospects.query(limit=1)
+			self.assertIs(first.transport.session, second.transport.session)
+			# Two logins and six calls, one after another, over a single kept-alive connection.
+			self.assertEqual(self.counts(transport), (1, 8))
+
+	def test_pool_settings_reach_the_adapter(self):
+		with Transport(pool_connections=2, pool_maxsize=5, pool_block=True) as transport:
+			for url in ('https://pi.pardot.com', 'http://localhost'):
+				poolmanager = transport.session.get_adapter(url).poolmanager
+				pool = poolmanager.connection_from_url(url)
+				self.assertEqual((pool.pool.maxsize, pool.block), (5, True))
+				self.assertEqual(poolmanager.pools._maxsize, 2)
+
+	def test_keep_alive_can_be_disabled(self):
+		with Transport(keep_alive=False) as transport:
+			self.assertEqual(transport.session.headers['Connection'], 'close')
+			client = PardotAPI('email', 'password', 'user_key', transport=transport, base_uri=self.simulator.base_uri)
+			client.prospects.read_by_id(id=1)
+			take_connection_time()
+			# The server closes each connection, so every call opens a new one.
+			client.prospects.read_by_id(id=1)
+			self.assertGreater(take_connection_time(), 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,361 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from queue import Queue, Full
+
+import requests
+
+from .deadline import as_deadline
+from .errors import PardotAPIError, PardotDeadlineExceededError
+
+PAGE_SIZE = 200
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMESTAMP_CURSORS = ('created_at', 'updated_at')
+WINDOWS_PER_WORKER = 4
+PREFETCH_PAGES = 2
+# Pardot's answers to a read of an id that matches no record, e.g. 'Invalid ID' or 'Invalid prospect ID'.
+_INVALID_ID = re.compile(r'^Invalid (\w+ )?ID$')
+
+
+def records(result, result_key):
+    """
+    Returns the records under result[<result_key>] as a list. Pardot returns a single record as a dict and omits the
+    key for empty results, and bulk output skips the normalization done by query(), so both cases are handled here.
+    """
+    rows = result.get(result_key) if result else None
+    if rows is None:
+        return []
+    if isinstance(rows, dict):
+        return [rows]
+    return rows
+
+
+def iter_query(query, result_key, cursor='id', page_size=PAGE_SIZE, parallel=None, stream=False, stream_query=None,
+               deadline=None, **criteria):
+    """
+    Yields every record matching <criteria>, one at a time, by calling <query> (an object's query method) a page at
+    a time. Pages are walked with a cursor rather than an offset, so deep result sets cost the same per page as the
+    first one and only one page is held in memory. Stop iterating at any time to stop issuing requests.
+
+    <cursor> is 'id' (walks id_greater_than in id order), 'created_at' (walks created_after) or 'updated_at' (walks
+    updated_after). A starting point may be given with the matching criteria, e.g. id_greater_than=1000.
+
+    With <parallel> set to N, the id range of the matching records is split into disjoint id_greater_than/id_less_than
+    windows that are fetched by N threads at once. Records are still yielded in id order. The threads share the
+    client's transport, so its connection pool and max_concurrency cap apply to them as to any other request.
+
+    With <stream> set, pages are requested with <stream_query> (an object's stream_query method) and each record is
+    decoded as it arrives, so not even a whole page is held in memory. Streaming uses the id cursor, one page at a
+    time.
+
+    With a <deadline> (a Deadline, or a number of seconds from now), every page request runs within it, and once it
+    has passed no further page is requested: the records already fetched are yielded, then PardotDeadlineExceededError
+    is raised. Its progress is a dict giving the number of <records> yielded and the criteria to <resume> from, e.g.
+    {'id_greater_than': 1234}. Timestamp criteria are exclusive, so on a timestamp cursor the resume criteria start a
+    second before the last timestamp yielded, and resuming repeats the records sharing that second.
+    """
+    criteria.pop('offset', None)
+    deadline = as_deadline(deadline)
+    if deadline is not None:
+        query = _within(deadline, query)
+        if stream_query is not None:
+            stream_query = _within(deadline, stream_query)
+    if stream:
+        if stream_query is None:
+            raise ValueError('streaming needs a stream_query function')
+        if cursor != 'id' or (parallel is not None and parallel > 1):
+            raise ValueError('streaming is only supported with the id cursor, without parallel fetching')
+        rows = _iter_streamed(stream_query, page_size, criteria)
+    elif parallel is not None and parallel > 1:
+        if cursor != 'id':
+            raise ValueError('parallel fetching is only supported with the id cursor')
+        rows = _iter_parallel(query, result_key, page_size, parallel, criteria)
+    elif cursor == 'id':
+        rows = _iter_by_id(query, result_key, page_size, criteria)
+    elif cursor in TIMESTAMP_CURSORS:
+        rows = _iter_by_timestamp(query, result_key, cursor, page_size, criteria)
+    else:
+        raise ValueError('cursor must be one of id, {0}'.format(', '.join(TIMESTAMP_CURSORS)))
+    if deadline is None:
+        return rows
+    return _until_deadline(rows, deadline, cursor)
+
+
+def _within(deadline, func):
+    """Wraps <func> so that it runs within <deadline>, on whichever thread calls it."""
+    def call(**criteria):
+        with deadline:
+            return func(**criteria)
+    return call
+
+
+def _until_deadline(rows, deadline, cursor):
+    """
+    Yields <rows> until fetching them fails because <deadline> has passed, then raises PardotDeadlineExceededError
+    saying how far iteration got.
+    """
+    count = 0
+    last = None
+    try:
+        for row in rows:
+            yield row
+            count += 1
+            last = row
+    except (PardotDeadlineExceededError, requests.exceptions.Timeout):
+        if not deadline.expired:
+            raise
+        resume = {}
+        if last is not None:
+            if cursor == 'id':
+                resume['id_greater_than'] = last['id']
+            elif last.get(cursor):
+                before = parse_timestamp(last[cursor]) - timedelta(seconds=1)
+                resume[cursor[:-len('_at')] + '_after'] = format_timestamp(before)
+        raise PardotDeadlineExceededError('Deadline of {0} seconds exceeded after {1} records'.format(
+            deadline.seconds, count), progress={'records': count, 'resume': resume})
+    finally:
+        rows.close()
+
+
+def _iter_by_id(query, result_key, page_size, criteria):
+    for rows in _pages_by_id(query, result_key, page_size, criteria):
+        for row in rows:
+            yield row
+
+
+def _pages_by_id(query, result_key, page_size, criteria):
+    criteria.update({'sort_by': 'id', 'sort_order': 'ascending', 'limit': page_size})
+    while True:
+        rows = records(query(**criteria), result_key)
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        criteria['id_greater_than'] = rows[-1]['id']
+
+
+def _iter_streamed(stream_query, page_size, criteria):
+    criteria.update({'sort_by': 'id', 'sort_order': 'ascending', 'limit': page_size})
+    while True:
+        count = 0
+        for row in stream_query(**criteria):
+            count += 1
+            criteria['id_greater_than'] = row['id']
+            yield row
+        if count < page_size:
+            return
+
+
+def _iter_parallel(query, result_key, page_size, parallel, criteria):
+    """
+    Probes the lowest and highest matching ids, then fetches disjoint id windows across <parallel> threads. Each
+    window streams its pages into its own bounded queue, and windows are consumed strictly in order, so memory is
+    bounded by a few pages per worker no matter how large the result set is.
+    """
+    probe = dict(criteria, sort_by='id', limit=1)
+    first = records(query(**dict(probe, sort_order='ascending')), result_key)
+    if not first:
+        return
+    last = records(query(**dict(probe, sort_order='descending')), result_key)
+    low, high = int(first[0]['id']), int(last[0]['id'])
+
+    count = min(parallel * WINDOWS_PER_WORKER, (high - low) // page_size + 1)
+    edges = [low - 1 + (high - low + 1) * i // count for i in range(count + 1)]
+    windows = [dict(criteria, id_greater_than=lower, id_less_than=upper + 1)
+               for lower, upper in zip(edges, edges[1:]) if upper > lower]
+
+    stop = threading.Event()
+    queues = [Queue(maxsize=PREFETCH_PAGES) for _ in windows]
+
+    def put(out, item):
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def fetch(window, out):
+        if stop.is_set():
+            return
+        try:
+            for rows in _pages_by_id(query, result_key, page_size, window):
+                if not put(out, (rows, None)):
+                    return
+            put(out, (None, None))
+        except Exception as err:
+            put(out, (None, err))
+
+    executor = ThreadPoolExecutor(max_workers=parallel)
+    try:
+        for window, out in zip(windows, queues):
+            executor.submit(fetch, window, out)
+        for out in queues:
+            while True:
+                rows, err = out.get()
+                if err is not None:
+                    raise err
+                if rows is None:
+                    break
+                for row in rows:
+                    yield row
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_by_timestamp(query, result_key, field, page_size, criteria):
+    """
+    Walks <field> in ascending order. Many records can share a timestamp (Pardot timestamps have one second
+    resolution), and a page may end part way through them, so each page after the first is requested from the second
+    before the last timestamp reached (the boundary). Records older than the boundary, and those at the boundary that
+    were already yielded, are skipped. This holds whether Pardot's *_after criteria are exclusive, as documented and
+    as the Simulator implements them, or inclusive.
+
+    If a full page brings nothing new, more records share one second than fit in a page; that second is then drained
+    by id before continuing past it.
+    """
+    after_key = field[:-len('_at')] + '_after'
+    start = criteria.pop(after_key, None)
+    boundary = None
+    seen = set()
+    criteria.update({'sort_by': field, 'sort_order': 'ascending', 'limit': page_size})
+    while True:
+        if boundary is not None:
+            criteria[after_key] = format_timestamp(parse_timestamp(boundary) - timedelta(seconds=1))
+        elif start is not None:
+            criteria[after_key] = start
+        rows = records(query(**criteria), result_key)
+        fresh = [row for row in rows if boundary is None or (row.get(field) or '') > boundary or
+                 (row.get(field) == boundary and row['id'] not in seen)]
+        for row in fresh:
+            yield row
+        if len(rows) < page_size:
+            return
+        if fresh:
+            last = fresh[-1][field]
+            if last != boundary:
+                boundary, seen = last, set()
+            seen.update(row['id'] for row in fresh if row.get(field) == boundary)
+            continue
+        for row in _drain(query, result_key, field, boundary, page_size, criteria):
+            if row['id'] not in seen:
+                yield row
+        boundary, seen = format_timestamp(parse_timestamp(boundary) + timedelta(seconds=1)), set()
+
+
+def _drain(query, result_key, field, timestamp, page_size, criteria):
+    """Yields, in id order, the records whose <field> is <timestamp>."""
+    start = parse_timestamp(timestamp)
+    window = dict((key, value) for key, value in criteria.items() if key not in ('sort_by', 'sort_order', 'limit'))
+    window[field[:-len('_at')] + '_after'] = format_timestamp(start - timedelta(seconds=1))
+    window[field[:-len('_at')] + '_before'] = format_timestamp(start + timedelta(seconds=1))
+    for row in _iter_by_id(query, result_key, page_size, window):
+        if row.get(field) == timestamp:
+            yield row
+
+
+def read_many(ids, result_key, query=None, read=None, id_list=False, workers=4, **criteria):
+    """
+    Reads the records with the given <ids> and returns them in a dict keyed by id. Ids that match no record are left
+    out of the result.
+
+    With <id_list> set, <query> accepts a comma separated <ids> criterion and is called once per 200 ids. Otherwise
+    the sorted ids are grouped into id ranges no wider than a page, and <query> is called once per range with
+    id_greater_than/id_less_than, so ids that lie close together, as they do for records created around the same
+    time, cost one request per 200. The ids left on their own are split into at most <workers> runs, and each run's
+    id range is walked a page at a time, every page starting at the lowest id not yet read. Records between the ids
+    are fetched and dropped, so scattered ids among few records still share requests, and an id never costs more
+    than one. Objects without a query fall back to calling <read>(id) for each id. Requests are sent by <workers>
+    threads at once.
+    """
+    ids = sorted(set(int(record_id) for record_id in ids))
+    if query is not None and id_list:
+        batches = [dict(criteria, ids=','.join(str(record_id) for record_id in ids[start:start + PAGE_SIZE]))
+                   for start in range(0, len(ids), PAGE_SIZE)]
+        fetch = lambda batch: records(query(**batch), result_key)
+    elif query is not None:
+        batches = _id_runs(ids, workers)
+        fetch = lambda run: _read_run(query, result_key, run, criteria)
+    elif read is not None:
+        batches = ids
+        fetch = lambda record_id: _read_existing(read, record_id, result_key)
+    else:
+        raise ValueError('read_many needs a query or read function')
+
+    wanted = set(ids)
+    found = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for rows in executor.map(fetch, batches):
+            for row in rows:
+                if int(row['id']) in wanted:
+                    found[int(row['id'])] = row
+    finally:
+        executor.shutdown(wait=True)
+    return found
+
+
+def _read_existing(read, record_id, result_key):
+    """Returns the records <read> returns for <record_id>, or none if Pardot says the id is invalid."""
+    try:
+        return records(read(record_id), result_key)
+    except PardotAPIError as err:
+        if _INVALID_ID.match(err.message):
+            return []
+        raise
+
+
+def _read_run(query, result_key, ids, criteria):
+    """
+    Returns the records in the id range spanned by the sorted <ids>, a page at a time. Each page starts at the lowest
+    id beyond the previous page, skipping the records between the ids.
+    """
+    found = []
+    position = 0
+    while position < len(ids):
+        rows = records(query(**dict(criteria, id_greater_than=ids[position] - 1, id_less_than=ids[-1] + 1,
+                                    sort_by='id', sort_order='ascending', limit=PAGE_SIZE)), result_key)
+        found.extend(rows)
+        if len(rows) < PAGE_SIZE:
+            break
+        last = int(rows[-1]['id'])
+        while position < len(ids) and ids[position] <= last:
+            position += 1
+    return found
+
+
+def _id_runs(ids, workers):
+    """
+    Splits sorted <ids> into the runs read_many walks: a run per group of ids spanning fewer than PAGE_SIZE ids, then
+    the ids left on their own, split into at most <workers> runs.
+    """
+    groups = _id_ranges(ids)
+    runs = [group for group in groups if len(group) > 1]
+    scattered = [group[0] for group in groups if len(group) == 1]
+    count = min(workers, len(scattered))
+    runs.extend(scattered[len(scattered) * i // count:len(scattered) * (i + 1) // count] for i in range(count))
+    return runs
+
+
+def _id_ranges(ids):
+    """Splits sorted <ids> into groups spanning fewer than PAGE_SIZE ids, so each range fits in one page."""
+    groups = []
+    for record_id in ids:
+        if groups and record_id - groups[-1][0] < PAGE_SIZE:
+            groups[-1].append(record_id)
+        else:
+            groups.append([record_id])
+    return groups
+
+
+def parse_timestamp(timestamp):
+    """Parses a Pardot timestamp such as '2019-01-31 13:45:00' into a datetime."""
+    return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+
+
+def format_timestamp(timestamp):
+    """Formats a datetime the way Pardot writes timestamps and accepts them in criteria."""
+    return timestamp.strftime(TIMESTAMP_FORMAT)
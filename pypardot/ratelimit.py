@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+
+from .errors import PardotQuotaExceededError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Pardot error codes for a spent daily quota and for too many requests in flight at once.
+DAILY_LIMIT_ERROR_CODE = 66
+CONCURRENT_LIMIT_ERROR_CODE = 122
+# Pardot allows five concurrent API requests per account.
+DEFAULT_MAX_CONCURRENT = 5
+
+
+class RateLimiter(object):
+    """
+    Client-side limiter for one Pardot account, combining a token bucket (<rate> requests per second, bursting up to
+    <burst>), a cap of <max_concurrent> requests in flight and a <daily_limit> call quota. Any of the three may be
+    left as None to disable it. Calls block until they may proceed, except when the daily quota is spent, in which
+    case PardotQuotaExceededError is raised without a request being sent.
+
+    State lives in <backend>: MemoryBackend (the default) shares it between the threads of one process and
+    FileBackend shares it between processes on the same host. Use one limiter, or one backend path, per account.
+    Daily usage resets at midnight UTC.
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrent=DEFAULT_MAX_CONCURRENT, daily_limit=None, backend=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 1)
+        self.max_concurrent = max_concurrent
+        self.daily_limit = daily_limit
+        self.backend = backend if backend is not None else MemoryBackend()
+
+    def acquire(self):
+        """Waits for a request slot and token, counts the call against the daily quota and returns a slot handle."""
+        self._count_call()
+        self._take_token()
+        if self.max_concurrent:
+            return self.backend.acquire_slot(self.max_concurrent)
+        return None
+
+    def release(self, slot):
+        if slot is not None:
+            self.backend.release_slot(slot)
+
+    def limit(self):
+        """Context manager wrapping a single request."""
+        return _Acquired(self)
+
+    def exhaust_quota(self):
+        """Marks today's quota as spent, e.g. after Pardot reports error 66."""
+        def exhaust(state):
+            _roll_day(state)
+            state['used'] = max(state['used'], self.daily_limit or state['used'])
+        self.backend.update(exhaust)
+
+    @property
+    def quota_used(self):
+        """Number of calls counted against today's quota, across every thread or process sharing the backend."""
+        return self.backend.update(lambda state: _roll_day(state)['used'])
+
+    @property
+    def quota_remaining(self):
+        """Calls left today, or None when no daily limit is configured."""
+        if self.daily_limit is None:
+            return None
+        return max(0, self.daily_limit - self.quota_used)
+
+    @property
+    def quota_resets_in(self):
+        """Seconds until the daily quota resets."""
+        return 86400 - int(time.time()) % 86400
+
+    def _count_call(self):
+        def count(state):
+            _roll_day(state)
+            if self.daily_limit is not None and state['used'] >= self.daily_limit:
+                return False
+            state['used'] += 1
+            return True
+
+        if not self.backend.update(count):
+            raise PardotQuotaExceededError(
+                'Daily API quota of {0} calls is spent; it resets in {1} seconds.'.format(
+                    self.daily_limit, self.quota_resets_in))
+
+    def _take_token(self):
+        if not self.rate:
+            return
+
+        def take(state):
+            now = time.time()
+            tokens = min(self.burst, state.get('tokens', self.burst) + (now - state.get('stamp', now)) * self.rate)
+            state['stamp'] = now
+            if tokens >= 1:
+                state['tokens'] = tokens - 1
+                return 0
+            state['tokens'] = tokens
+            return (1 - tokens) / self.rate
+
+        wait = self.backend.update(take)
+        while wait:
+            time.sleep(wait)
+            wait = self.backend.update(take)
+
+
+class _Acquired(object):
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.slot = None
+
+    def __enter__(self):
+        self.slot = self.limiter.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.limiter.release(self.slot)
+
+
+class MemoryBackend(object):
+    """Keeps limiter state in this process; safe to share between threads."""
+
+    def __init__(self):
+        self.state = {}
+        self._lock = threading.Lock()
+        self._slots = None
+        self._slots_lock = threading.Lock()
+
+    def update(self, func):
+        """Calls <func> with the state dict under a lock and returns its result."""
+        with self._lock:
+            return func(self.state)
+
+    def acquire_slot(self, max_concurrent):
+        with self._slots_lock:
+            if self._slots is None:
+                self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._slots.acquire()
+        return True
+
+    def release_slot(self, slot):
+        self._slots.release()
+
+
+class FileBackend(object):
+    """
+    Keeps limiter state in a JSON file at <path>, guarded by an advisory file lock, so that every process on the host
+    pointed at the same path shares one quota, token bucket and set of concurrency slots. POSIX only.
+    """
+
+    def __init__(self, path, poll_interval=0.05):
+        if fcntl is None:
+            raise RuntimeError('FileBackend requires fcntl, which is not available on this platform.')
+        self.path = path
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+
+    def update(self, func):
+        with self._lock:
+            with open(self.path + '.lock', 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    state = self._read()
+                    result = func(state)
+                    self._write(state)
+                    return result
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def acquire_slot(self, max_concurrent):
+        """Holds an exclusive lock on one of <max_concurrent> slot files; the OS frees it if the process dies."""
+        while True:
+            for index in range(max_concurrent):
+                slot = open('{0}.slot{1}'.format(self.path, index), 'a')
+                try:
+                    fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return slot
+                except (IOError, OSError):
+                    slot.close()
+            time.sleep(self.poll_interval)
+
+    def release_slot(self, slot):
+        fcntl.flock(slot, fcntl.LOCK_UN)
+        slot.close()
+
+    def _read(self):
+        try:
+            with open(self.path) as state_file:
+                return json.load(state_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, state):
+        temporary = '{0}.{1}.tmp'.format(self.path, os.getpid())
+        with open(temporary, 'w') as state_file:
+            json.dump(state, state_file)
+        os.rename(temporary, self.path)
+
+
+def _roll_day(state):
+    today = time.strftime('%Y-%m-%d', time.gmtime())
+    if state.get('day') != today:
+        state['day'] = today
+        state['used'] = 0
+    return state
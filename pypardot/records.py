@@ -0,0 +1,211 @@
+import keyword
+import re
+from datetime import datetime
+
+from .pagination import parse_timestamp
+from .schema import field_types
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_record_classes = {}
+
+
+def _integer(value):
+    return int(value) if value != '' else None
+
+
+def _float(value):
+    return float(value) if value != '' else None
+
+
+def _boolean(value):
+    return value in (True, 1, '1', 'true', 'True')
+
+
+def _timestamp(value):
+    return parse_timestamp(value) if value else None
+
+
+# For each datatype, the Python type of parsed values and the function that parses raw JSON values.
+PARSERS = {
+    'integer': (int, _integer),
+    'float': (float, _float),
+    'boolean': (bool, _boolean),
+    'timestamp': (datetime, _timestamp),
+}
+
+
+class Record(object):
+    """
+    Base class of the typed record classes built by record_class(). Fields of the object's schema are stored in
+    slots rather than a per-record dict; any other fields of the response, such as custom fields, are kept in a dict
+    of extras. Typed fields are parsed from their JSON values on first access. Records can also be read like the
+    dicts they replace, with record['email'] or record.get('email').
+    """
+
+    __slots__ = ('_extra',)
+    _fields = ()
+    _slot_names = {}
+
+    def __init__(self, data):
+        for slot in self._slot_names.values():
+            setattr(self, slot, None)
+        extra = None
+        for name, value in data.items():
+            slot = self._slot_names.get(name)
+            if slot is not None:
+                setattr(self, slot, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+        self._extra = extra
+
+    def __getitem__(self, name):
+        if name in self._slot_names:
+            return getattr(self, name)
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self._slot_names or (self._extra is not None and name in self._extra)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def as_dict(self):
+        """Returns the record as a dict, with typed fields parsed."""
+        data = dict((name, getattr(self, name)) for name in self._fields)
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(type(self).__name__, self.get('id'))
+
+
+class _TypedField(object):
+    """Descriptor that parses the raw value kept in <slot> the first time it is read and stores the result."""
+
+    __slots__ = ('slot', 'kind', 'parse')
+
+    def __init__(self, slot, kind, parse):
+        self.slot = slot
+        self.kind = kind
+        self.parse = parse
+
+    def __get__(self, record, owner):
+        if record is None:
+            return self
+        value = getattr(record, self.slot)
+        if value is None or type(value) is self.kind:
+            return value
+        value = self.parse(value)
+        setattr(record, self.slot, value)
+        return value
+
+    def __set__(self, record, value):
+        setattr(record, self.slot, value)
+
+
+def record_class(object_name, schema=None):
+    """
+    Returns a Record subclass for <object_name> with a slot for each field of <schema> (a field map like
+    pypardot.schema.OBJECT_FIELD_MAP[object_name], which is used by default). Classes built from the default schema
+    are cached.
+    """
+    if schema is None and object_name in _record_classes:
+        return _record_classes[object_name]
+    types = field_types(object_name, schema)
+    attributes = {'_fields': [], '_slot_names': {}}
+    slots = []
+    for name in sorted(types):
+        if not _IDENTIFIER.match(name) or keyword.iskeyword(name) or name in dir(Record):
+            continue
+        attributes['_fields'].append(name)
+        if types[name] in PARSERS:
+            slot = '_' + name
+            kind, parse = PARSERS[types[name]]
+            attributes[name] = _TypedField(slot, kind, parse)
+        else:
+            slot = name
+        slots.append(slot)
+        attributes['_slot_names'][name] = slot
+    attributes['_fields'] = tuple(attributes['_fields'])
+    attributes['__slots__'] = tuple(slots)
+    cls = type(str(object_name[:1].upper() + object_name[1:] + 'Record'), (Record,), attributes)
+    if schema is None:
+        _record_classes[object_name] = cls
+    return cls
+
+
+def typed_records(object_name, rows, schema=None):
+    """Yields a typed record for each dict in <rows>, e.g. typed_records('prospect', p.prospects.iter_query())."""
+    cls = record_class(object_name, schema)
+    for row in rows:
+        yield cls(row)
+
+
+class RecordColumns(object):
+    """
+    Holds a whole result set of one object column by column: one list per schema field, plus the extra fields of
+    each row. A column is parsed to its datatype the first time it is read with column(). Indexing or iterating
+    returns typed records.
+    """
+
+    def __init__(self, object_name, rows=(), schema=None):
+        self.object_name = object_name
+        self.record_class = record_class(object_name, schema)
+        self.types = field_types(object_name, schema)
+        self._columns = dict((name, []) for name in self.record_class._fields)
+        self._parsed = set()
+        self._extra = []
+        self.extend(rows)
+
+    def append(self, row):
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+            self._parsed.discard(name)
+        extra = dict((name, value) for name, value in row.items() if name not in self._columns)
+        self._extra.append(extra or None)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def column(self, name):
+        """Returns the values of field <name> for every row, parsed to the field's datatype."""
+        if name not in self._columns:
+            return [extra.get(name) if extra else None for extra in self._extra]
+        column = self._columns[name]
+        if name not in self._parsed and self.types.get(name) in PARSERS:
+            kind, parse = PARSERS[self.types[name]]
+            column[:] = [value if value is None or type(value) is kind else parse(value) for value in column]
+        self._parsed.add(name)
+        return column
+
+    def row(self, index):
+        """Returns row <index> as a dict of its raw values."""
+        data = dict((name, column[index]) for name, column in self._columns.items())
+        if self._extra[index]:
+            data.update(self._extra[index])
+        return data
+
+    def __getitem__(self, index):
+        return self.record_class(self.row(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self._extra)
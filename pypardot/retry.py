@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+
+import requests
+
+from .deadline import current_deadline
+from .errors import PardotAPIError
+from .ratelimit import CONCURRENT_LIMIT_ERROR_CODE
+
+# Pardot error codes worth another attempt: the request was refused, not processed.
+RETRYABLE_ERROR_CODES = (CONCURRENT_LIMIT_ERROR_CODE,)
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+# Status codes returned before the request was processed, so safe to retry for writes too.
+REFUSED_STATUS_CODES = (429, 503)
+
+
+class RetryPolicy(object):
+    """
+    Decides which failures are worth retrying and how long to wait between attempts. Pardot error codes listed in
+    <retryable_error_codes>, HTTP status codes in <retryable_status_codes>, timeouts and dropped connections are
+    retried; every other error is raised at once. Waits grow exponentially from <base_delay> up to <max_delay> with
+    full jitter, and no retry is started that would end past <deadline> seconds from the first attempt, or past the
+    Deadline the call is made in.
+
+    Writes are only retried when Pardot cannot have processed them (connection never established, request refused),
+    so that a retry never creates a record twice.
+
+    Every client sharing a policy adds to its counters; see stats.
+    """
+
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30, deadline=None,
+                 retryable_error_codes=RETRYABLE_ERROR_CODES, retryable_status_codes=RETRYABLE_STATUS_CODES):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retryable_error_codes = set(str(code) for code in retryable_error_codes)
+        self.retryable_status_codes = set(retryable_status_codes)
+        self.stats = RetryStats()
+
+    def call(self, func, idempotent=True):
+        """
+        Calls <func> until it succeeds, fails with an error that is not retryable, or runs out of attempts or time.
+        A retryable HTTP status code returned by <func> (PardotAPI returns the status code for non-JSON responses) is
+        treated like an error, and is returned as-is once retries are exhausted.
+        """
+        started = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = func()
+            except Exception as err:
+                reason = self.classify(err, idempotent)
+                if reason is None or not self._wait(attempt, started, reason):
+                    self.stats.record(attempt, gave_up=reason is not None)
+                    raise
+                continue
+            reason = self.classify(result, idempotent)
+            if reason is None or not self._wait(attempt, started, reason):
+                self.stats.record(attempt, gave_up=reason is not None)
+                return result
+
+    def classify(self, outcome, idempotent=True):
+        """Returns a short reason string if <outcome> (an exception or a status code) may be retried, else None."""
+        if isinstance(outcome, PardotAPIError):
+            if str(outcome.err_code) in self.retryable_error_codes:
+                return 'err_code_{0}'.format(outcome.err_code)
+            return None
+        if type(outcome) is int:
+            if outcome in self.retryable_status_codes and (idempotent or outcome in REFUSED_STATUS_CODES):
+                return 'http_{0}'.format(outcome)
+            return None
+        if isinstance(outcome, requests.exceptions.ConnectTimeout):
+            return 'connect_timeout'
+        if isinstance(outcome, requests.exceptions.Timeout):
+            return 'timeout' if idempotent else None
+        if isinstance(outcome, (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+            return 'connection_error' if idempotent else None
+        return None
+
+    def backoff(self, attempt):
+        """Seconds to wait before attempt number <attempt> + 1: capped exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _wait(self, attempt, started, reason):
+        if attempt >= self.max_attempts:
+            return False
+        delay = self.backoff(attempt)
+        if self.deadline is not None and time.time() + delay - started > self.deadline:
+            return False
+        deadline = current_deadline()
+        if deadline is not None and delay >= deadline.remaining():
+            return False
+        self.stats.retried(reason, delay)
+        time.sleep(delay)
+        return True
+
+
+class RetryStats(object):
+    """Thread-safe counters describing what retrying has cost."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.attempts = 0
+            self.retries = 0
+            self.gave_up = 0
+            self.sleep_seconds = 0.0
+            self.retries_by_reason = {}
+
+    def retried(self, reason, delay):
+        with self._lock:
+            self.retries += 1
+            self.sleep_seconds += delay
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+    def record(self, attempts, gave_up=False):
+        with self._lock:
+            self.calls += 1
+            self.attempts += attempts
+            if gave_up:
+                self.gave_up += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'gave_up': self.gave_up,
+                'sleep_seconds': self.sleep_seconds,
+                'retries_by_reason': dict(self.retries_by_reason),
+            }
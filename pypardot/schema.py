@@ -0,0 +1,51 @@
+DATATYPES = ('integer', 'float', 'boolean', 'timestamp', 'string')
+
+
+def _fields(**datatypes):
+    return dict((name, {'datatype': datatype}) for name, datatype in datatypes.items())
+
+
+# Types of the standard fields of common Pardot objects, in the same shape as OBJECT_FIELD_MAP in the tests. Custom
+# fields are not listed: they are typed from describe() where the API offers it and are otherwise strings.
+OBJECT_FIELD_MAP = {
+    'campaign': _fields(id='integer', name='string', cost='integer'),
+    'list': _fields(
+        id='integer', name='string', is_public='boolean', is_dynamic='boolean', title='string', description='string',
+        is_crm_visible='boolean', created_at='timestamp', updated_at='timestamp'),
+    'listMembership': _fields(
+        id='integer', list_id='integer', prospect_id='integer', opted_out='boolean', created_at='timestamp',
+        updated_at='timestamp'),
+    'opportunity': _fields(
+        id='integer', campaign_id='integer', name='string', value='float', probability='integer', type='string',
+        stage='string', status='string', closed_at='timestamp', created_at='timestamp', updated_at='timestamp'),
+    'prospect': _fields(
+        id='integer', campaign_id='integer', salutation='string', first_name='string', last_name='string',
+        email='string', company='string', prospect_account_id='integer', website='string', job_title='string',
+        department='string', country='string', address_one='string', address_two='string', city='string',
+        state='string', territory='string', zip='string', phone='string', fax='string', source='string',
+        annual_revenue='string', employees='string', industry='string', years_in_business='string',
+        comments='string', notes='string', score='integer', grade='string', last_activity_at='timestamp',
+        recent_interaction='string', crm_lead_fid='string', crm_contact_fid='string', crm_owner_fid='string',
+        crm_account_fid='string', salesforce_fid='string', crm_last_sync='timestamp', crm_url='string',
+        is_do_not_email='boolean', is_do_not_call='boolean', opted_out='boolean', is_reviewed='boolean',
+        is_starred='boolean', created_at='timestamp', updated_at='timestamp'),
+    'prospectAccount': _fields(id='integer', name='string', created_at='timestamp', updated_at='timestamp'),
+    'user': _fields(
+        id='integer', email='string', first_name='string', last_name='string', job_title='string', role='string',
+        created_at='timestamp', updated_at='timestamp'),
+    'visitor': _fields(
+        id='integer', page_view_count='integer', ip_address='string', hostname='string',
+        campaign_parameter='string', medium_parameter='string', source_parameter='string',
+        content_parameter='string', term_parameter='string', created_at='timestamp', updated_at='timestamp'),
+    'visitorActivity': _fields(
+        id='integer', prospect_id='integer', visitor_id='integer', type='integer', type_name='string',
+        details='string', email_id='integer', email_template_id='integer', list_email_id='integer',
+        form_id='integer', form_handler_id='integer', landing_page_id='integer', file_id='integer',
+        custom_redirect_id='integer', campaign_id='integer', visitor_page_view_id='integer', created_at='timestamp'),
+}
+
+
+def field_types(object_name, schema=None):
+    """Returns {field name: datatype} for <object_name>, from <schema> if given, else from OBJECT_FIELD_MAP."""
+    fields = schema if schema is not None else OBJECT_FIELD_MAP.get(object_name, {})
+    return dict((name, spec['datatype'] if isinstance(spec, dict) else spec) for name, spec in fields.items())
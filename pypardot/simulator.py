@@ -0,0 +1,344 @@
+"""
+Local simulator of the Pardot v4 API, for load testing and benchmarking the client without credentials:
+
+    with Simulator(latency=0.05, errors={'server_error': 0.01}) as simulator:
+        simulator.seed('prospect', 10000)
+        p = PardotAPI('email', 'password', 'user_key', base_uri=simulator.base_uri)
+        prospects = list(p.prospects.iter_query())
+
+It serves login and, for every object in pypardot.objects.registry, query (with id and timestamp criteria, sorting
+and paging), read, create, update, upsert, delete and the prospect batch endpoints, keeping records in memory.
+Responses mimic Pardot's: a query matching one record returns it as a dict rather than a list, deletes answer 204
+No Content, and errors carry Pardot's error codes.
+"""
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qsl, urlsplit
+
+from .client import INVALID_API_KEY_MESSAGE
+from .objects.registry import OBJECTS
+from .pagination import PAGE_SIZE, format_timestamp, parse_timestamp
+from .ratelimit import CONCURRENT_LIMIT_ERROR_CODE, DAILY_LIMIT_ERROR_CODE
+from .schema import OBJECT_FIELD_MAP, field_types
+
+# The error codes and messages of the failures that can be injected, besides 'server_error' (an HTTP 500).
+ERRORS = {
+    'expired_key': (1, INVALID_API_KEY_MESSAGE),
+    'concurrent_limit': (CONCURRENT_LIMIT_ERROR_CODE, 'You have exceeded your concurrent request limit'),
+    'daily_limit': (DAILY_LIMIT_ERROR_CODE, 'You have exceeded your daily API call limit'),
+}
+FAILURES = tuple(sorted(ERRORS)) + ('server_error',)
+INVALID_ID_ERROR = (4, 'Invalid ID')
+INVALID_ACTION_ERROR = (9, 'Invalid action')
+INVALID_CRITERIA_ERROR = (58, 'Invalid search criteria')
+BATCH_ACTIONS = ('batchCreate', 'batchUpdate', 'batchUpsert')
+# Query criteria: (parameter, field, whether it keeps the records after the bound rather than before it). As in
+# Pardot, every bound is exclusive: created_after=T matches records created strictly after T, and records stamped
+# exactly T are left out, so clients walking timestamps must handle records sharing the boundary second themselves.
+CRITERIA = (
+    ('id_greater_than', 'id', True),
+    ('id_less_than', 'id', False),
+    ('created_after', 'created_at', True),
+    ('created_before', 'created_at', False),
+    ('updated_after', 'updated_at', True),
+    ('updated_before', 'updated_at', False),
+)
+# Fields every simulated record has, whatever its object.
+BASE_FIELDS = {'id': 'integer', 'name': 'string', 'created_at': 'timestamp', 'updated_at': 'timestamp'}
+_PATH = re.compile(r'^/api/(?P<object>\w+)/version/(?P<version>\d+)(?:/do/(?P<action>\w+)(?P<keys>(?:/[^/]+/[^/]+)*))?')
+
+
+class Simulator(object):
+    """
+    Runs the simulated API on a background thread of this process, listening on <host>:<port> (a free port by
+    default). Use as a context manager; point a client at <base_uri>.
+
+    Every response is delayed by <latency> seconds plus up to <jitter> more. <errors> maps failures to the share of
+    requests that should fail with them: 'expired_key' invalidates the API key in use, 'concurrent_limit' and
+    'daily_limit' answer with Pardot's rate limit errors and 'server_error' with an HTTP 500. fail_next() injects
+    failures deterministically instead. Generated records carry <custom_fields> extra text fields on top of the
+    object's standard fields, to bring payloads to realistic sizes. <seed> makes generated data and injected errors
+    repeatable.
+
+    <requests> counts the requests served by (object, action) and <logins> the logins.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0, jitter=0, errors=None, custom_fields=0, seed=None):
+        unknown = set(errors or {}) - set(FAILURES)
+        if unknown:
+            raise ValueError('unknown failures: {0}'.format(', '.join(sorted(unknown))))
+        self.latency = latency
+        self.jitter = jitter
+        self.errors = dict(errors or {})
+        self.custom_fields = custom_fields
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.logins = 0
+        self.records = dict((spec.object_name, {}) for spec in OBJECTS.values())
+        self._result_keys = dict((spec.object_name, spec.result_key) for spec in OBJECTS.values())
+        self._api_keys = set()
+        self._next_ids = Counter()
+        self._queued_failures = []
+        self._lock = threading.Lock()
+        self.server = _ThreadingServer((host, port), _Handler)
+        self.server.simulator = self
+        self.base_uri = 'http://{0}:{1}'.format(*self.server.server_address[:2])
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def seed(self, object_name, count, **fields):
+        """
+        Adds <count> generated records of <object_name>, created a minute apart, with the given <fields> overriding
+        generated values. Returns the ids of the new records.
+        """
+        started = datetime(2019, 1, 1)
+        ids = []
+        with self._lock:
+            for offset in range(count):
+                record = self._generate(object_name, started + timedelta(minutes=offset))
+                record.update(fields)
+                ids.append(self._insert(object_name, record)['id'])
+        return ids
+
+    def fail_next(self, failure, count=1):
+        """Makes the next <count> requests other than logins fail with <failure>, one of FAILURES."""
+        if failure not in FAILURES:
+            raise ValueError('failure must be one of {0}'.format(', '.join(FAILURES)))
+        with self._lock:
+            self._queued_failures.extend([failure] * count)
+
+    def handle(self, method, path, params):
+        """Answers one request. Returns (HTTP status, JSON body or None)."""
+        match = _PATH.match(path)
+        if match is None:
+            return 404, None
+        object_name, action = match.group('object'), match.group('action')
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.random.uniform(0, self.jitter))
+        with self._lock:
+            if object_name == 'login':
+                return self._login(params)
+            self.requests[(object_name, action)] += 1
+            failure = self._failure()
+            if failure == 'server_error':
+                return 500, None
+            if failure == 'expired_key':
+                self._api_keys.discard(params.get('api_key'))
+            if failure is not None or params.get('api_key') not in self._api_keys:
+                return _error(*ERRORS[failure or 'expired_key'])
+            if object_name not in self.records:
+                return _error(*INVALID_ACTION_ERROR)
+            keys = match.group('keys').strip('/').split('/') if match.group('keys') else []
+            return self._dispatch(object_name, action, dict(zip(keys[::2], keys[1::2])), params)
+
+    def _login(self, params):
+        if not (params.get('email') and params.get('password') and params.get('user_key')):
+            return _error(15, 'Login failed')
+        self.logins += 1
+        api_key = 'sim-key-{0}'.format(self.logins)
+        self._api_keys.add(api_key)
+        return 200, _ok({'api_key': api_key})
+
+    def _failure(self):
+        if self._queued_failures:
+            return self._queued_failures.pop(0)
+        for failure in FAILURES:
+            if self.errors.get(failure) and self.random.random() < self.errors[failure]:
+                return failure
+        return None
+
+    def _dispatch(self, object_name, action, keys, params):
+        result_key = self._result_keys[object_name]
+        if action == 'query':
+            try:
+                return 200, _ok({'result': self._query(object_name, result_key, params)})
+            except ValueError:
+                return _error(*INVALID_CRITERIA_ERROR)
+        if action in BATCH_ACTIONS:
+            return self._batch(object_name, action[len('batch'):].lower(), params)
+        if action in ('create', 'upsert') or keys:
+            record = self._find(object_name, keys)
+            if action == 'create' or (action == 'upsert' and record is None):
+                record = self._generate(object_name, datetime.now())
+                record.update((key, int(value) if value.isdigit() else value) for key, value in keys.items())
+                record = self._insert(object_name, record)
+            elif record is None:
+                return _error(*INVALID_ID_ERROR)
+            if action == 'delete':
+                del self.records[object_name][record['id']]
+                return 204, None
+            if action in ('create', 'update', 'upsert', 'assign', 'unassign'):
+                self._update(record, params)
+            return 200, _ok({result_key: record})
+        return 200, _ok({})
+
+    def _query(self, object_name, result_key, params):
+        records = list(self.records[object_name].values())
+        for param, field, after in CRITERIA:
+            if not params.get(param):
+                continue
+            if field == 'id':
+                bound = int(params[param])
+                value = lambda record: int(record['id'])
+            else:
+                # Pardot timestamps are fixed width, so they compare correctly as strings.
+                bound = format_timestamp(parse_timestamp(params[param]))
+                value = lambda record: record.get(field) or ''
+            # Exclusive bounds: records at the bound itself never match.
+            records = [record for record in records if (value(record) > bound) == after and value(record) != bound]
+        for param in ('ids', 'prospect_ids', 'visitor_ids'):
+            if params.get(param):
+                wanted = set(int(value) for value in params[param].split(','))
+                field = 'id' if param == 'ids' else param[:-1]
+                records = [record for record in records if int(record.get(field) or 0) in wanted]
+        sort_by = params.get('sort_by') or 'created_at'
+        records.sort(key=lambda record: (record.get(sort_by) or '', record['id']),
+                     reverse=params.get('sort_order') == 'descending')
+        offset = int(params.get('offset') or 0)
+        limit = min(int(params.get('limit') or PAGE_SIZE), PAGE_SIZE)
+        page = records[offset:offset + limit]
+        result = {'total_results': len(records)}
+        if page:
+            result[result_key] = page[0] if len(page) == 1 else page
+        return result
+
+    def _batch(self, object_name, operation, params):
+        data = json.loads(params.get(object_name + 's') or '{}')
+        batch = data.get(object_name + 's') or []
+        if isinstance(batch, dict):
+            batch = list(batch.values())
+        errors = {}
+        for position, fields in enumerate(batch):
+            keys = dict((key, fields[key]) for key in ('id', 'email') if fields.get(key))
+            record = self._find(object_name, keys) if keys else None
+            if operation == 'update' and record is None:
+                errors[str(position)] = INVALID_ID_ERROR[1]
+            elif operation != 'update' and record is None and not fields.get('email'):
+                errors[str(position)] = 'Invalid prospect email address'
+            elif operation == 'create' and record is not None:
+                errors[str(position)] = 'A prospect with the specified email address already exists'
+            else:
+                if record is None:
+                    record = self._insert(object_name, self._generate(object_name, datetime.now()))
+                self._update(record, fields)
+        body = _ok({'errors': errors}) if errors else _ok({})
+        return 200, body
+
+    def _generate(self, object_name, created_at):
+        types = field_types(object_name) if object_name in OBJECT_FIELD_MAP else BASE_FIELDS
+        record = {}
+        for name, datatype in types.items():
+            if datatype == 'integer':
+                record[name] = self.random.randint(1, 100000)
+            elif datatype == 'float':
+                record[name] = round(self.random.uniform(0, 100000), 2)
+            elif datatype == 'boolean':
+                record[name] = self.random.random() < 0.1
+            elif datatype == 'timestamp':
+                record[name] = format_timestamp(created_at)
+            else:
+                record[name] = '{0} {1}'.format(name.replace('_', ' '), self.random.randint(1, 100000))
+        for index in range(self.custom_fields):
+            record['custom_field_{0}'.format(index)] = 'custom value {0}'.format(self.random.randint(1, 100000))
+        if object_name == 'prospect':
+            record['email'] = 'prospect{0}@example.com'.format(self.random.randint(1, 10 ** 9))
+        return record
+
+    def _insert(self, object_name, record):
+        self._next_ids[object_name] += 1
+        record['id'] = self._next_ids[object_name]
+        self.records[object_name][record['id']] = record
+        return record
+
+    def _find(self, object_name, keys):
+        if 'id' in keys:
+            return self.records[object_name].get(int(keys['id']))
+        for record in self.records[object_name].values():
+            if all(str(record.get(key)) == str(value) for key, value in keys.items()):
+                return record
+        return None
+
+    def _update(self, record, fields):
+        for name, value in fields.items():
+            if name not in ('id', 'api_key', 'user_key', 'format'):
+                record[name] = value
+        record['updated_at'] = format_timestamp(datetime.now())
+
+
+def _ok(body):
+    return dict({'@attributes': {'stat': 'ok', 'version': 1}}, **body)
+
+
+def _error(code, message):
+    return 400, {'@attributes': {'stat': 'fail', 'version': 1, 'err_code': code}, 'err': message}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        # Headers and body go out in separate writes; without this, Nagle's algorithm stalls kept-alive connections.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self._respond('get', b'')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self._respond('post', self.rfile.read(length) if length else b'')
+
+    def _respond(self, method, body):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query))
+        if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            params.update(parse_qsl(body.decode('utf-8')))
+        authorization = re.search(r'api_key=([^,\s]+)', self.headers.get('Authorization', ''))
+        if authorization and 'api_key' not in params:
+            params['api_key'] = authorization.group(1)
+        status, content = self.server.simulator.handle(method, url.path, params)
+        self.send_response(status)
+        if content is None:
+            payload = b''
+            if status != 204:
+                payload = self.responses[status][0].encode('utf-8')
+                self.send_header('Content-Type', 'text/plain')
+        else:
+            payload = json.dumps(content).encode('utf-8')
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if self.close_connection:
+            # Echo a requested close, or the client may pool the socket and reuse it as it is shut.
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
@@ -0,0 +1,54 @@
+import threading
+
+
+class SingleFlight(object):
+    """
+    Collapses concurrent calls for the same key into one: the first caller runs the function while later callers
+    with that key wait for it to finish and share its result, or its exception. Once the call completes, the next
+    caller for the key starts a new one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Returns (result, shared), where shared is True if the result was handed to more than one caller: always for
+        callers that waited on another thread's call, and for the caller that ran the function if anyone waited on it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def in_flight(self, key):
+        """True if a call for <key> is currently running."""
+        with self._lock:
+            return key in self._calls
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
@@ -0,0 +1,149 @@
+import codecs
+import json
+
+CHUNK_SIZE = 65536
+_WHITESPACE = ' \t\r\n'
+
+
+class RecordStream(object):
+    """
+    Decodes a Pardot JSON query response incrementally from <chunks>, an iterable of bytes such as
+    requests.Response.iter_content(), and yields the records under result[<result_key>] one at a time. Only the
+    record being decoded and one chunk of the body are held in memory, never the whole page.
+
+    The other members of the response are kept as they are decoded: <response> holds the top level members such as
+    '@attributes' and 'err', and <result> the members of 'result' other than the records, such as 'total_results'.
+    <close> is called once the body has been read, or when iteration stops early.
+    """
+
+    def __init__(self, chunks, result_key, close=None):
+        self.result_key = result_key
+        self.response = {}
+        self.result = {}
+        self._chunks = iter(chunks)
+        self._close = close
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+        self._pending = []
+        self._records = self._parse()
+
+    @property
+    def total_results(self):
+        return self.result.get('total_results')
+
+    def prime(self):
+        """
+        Decodes up to the first record, or to the end of the response if it has none, so that an error response can
+        be detected before any record is consumed.
+        """
+        if not self._pending:
+            for record in self._records:
+                self._pending.append(record)
+                break
+        return self
+
+    def __iter__(self):
+        while self._pending:
+            yield self._pending.pop(0)
+        for record in self._records:
+            yield record
+
+    def _parse(self):
+        try:
+            self._expect('{')
+            for key in self._members():
+                if key == 'result' and self._peek() == '{':
+                    self._position += 1
+                    for result_key in self._members():
+                        if result_key != self.result_key:
+                            self.result[result_key] = self._value()
+                        elif self._peek() == '[':
+                            self._position += 1
+                            for record in self._elements():
+                                yield record
+                        else:
+                            record = self._value()
+                            if isinstance(record, dict):
+                                yield record
+                else:
+                    self.response[key] = self._value()
+        finally:
+            if self._close is not None:
+                self._close()
+
+    def _members(self):
+        """Yields the keys of the object whose opening brace has been consumed, leaving each value to the caller."""
+        if self._peek() == '}':
+            self._position += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            yield key
+            if self._separator('}'):
+                return
+
+    def _elements(self):
+        """Yields the decoded elements of the array whose opening bracket has been consumed."""
+        if self._peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield self._value()
+            if self._separator(']'):
+                return
+
+    def _separator(self, closing):
+        """Consumes a comma or <closing>, returning True for <closing>."""
+        character = self._peek()
+        if character not in (',', closing):
+            raise ValueError('Malformed JSON response at offset {0}'.format(self._position))
+        self._position += 1
+        return character == closing
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._position = end
+            return value
+
+    def _expect(self, character):
+        if self._peek() != character:
+            raise ValueError('Malformed JSON response at offset {0}'.format(self._position))
+        self._position += 1
+
+    def _peek(self):
+        """Skips whitespace and returns the next character, or None at the end of the body."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return None
+
+    def _fill(self):
+        """Appends the next chunk to the buffer, dropping what has been consumed. Returns False at the end."""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            chunk = None
+        text = self._decoder.decode(chunk or b'', final=chunk is None)
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        return True
@@ -0,0 +1,129 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 32
+
+_connection_time = threading.local()
+
+
+def take_connection_time():
+    """
+    Returns the seconds spent opening connections (resolving the host, TCP and, for https, TLS) for requests made on
+    this thread since the last call, and resets them. It is 0 while pooled connections are reused.
+    """
+    seconds = getattr(_connection_time, 'value', 0.0)
+    _connection_time.value = 0.0
+    return seconds
+
+
+def _add_connection_time(seconds):
+    _connection_time.value = getattr(_connection_time, 'value', 0.0) + seconds
+
+
+class _TimedConnection(object):
+    """
+    Mixin for urllib3 connections that times each connect() for take_connection_time(). urllib3 does the work,
+    and raises its errors, as usual.
+    """
+
+    def connect(self):
+        started = time.time()
+        try:
+            super(_TimedConnection, self).connect()
+        finally:
+            _add_connection_time(time.time() - started)
+
+
+class _TimedHTTPConnection(_TimedConnection, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnection, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open _TimedConnections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                   'https': _TimedHTTPSConnectionPool}
+
+
+class Transport(object):
+    """
+    Pooled HTTP transport used by PardotAPI for every request. Owns a single requests.Session so that TCP and TLS
+    connections to Pardot are kept alive and reused across calls instead of being re-established for each one.
+
+    <pool_connections> is the number of per-host connection pools to cache, <pool_maxsize> is the maximum number of
+    connections kept open to a single host, and <pool_block> makes callers wait for a free connection rather than
+    opening (and then discarding) extra ones when more than <pool_maxsize> threads are active. Set <keep_alive> to
+    False to close each connection after its response has been read. <max_concurrency> caps the number of requests in
+    flight at once across every thread using this transport, including the workers of parallel queries.
+
+    A single Transport may be shared by several PardotAPI instances, e.g. one client per Pardot account. The client
+    passes the <timeout> of each request, in seconds or as a (connect, read) pair, as requests takes it.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=False, keep_alive=True, max_concurrency=None, session=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.session = session if session is not None else self._build_session()
+
+    def _build_session(self):
+        """Builds a requests.Session with pooled adapters mounted for both http and https."""
+        session = requests.Session()
+        adapter = _TimedHTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                                    pool_block=self.pool_block, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get(self, url, params=None, headers=None, stream=False, timeout=None):
+        """
+        Issues a GET request over the pooled session and returns the requests.Response. With <stream> set, the body is
+        left unread for the caller to consume, and the connection returns to the pool once it has been read or closed.
+        """
+        if self._slots is None:
+            return self.session.get(url, params=params, headers=headers, stream=stream, timeout=timeout)
+        with self._slots:
+            return self.session.get(url, params=params, headers=headers, stream=stream, timeout=timeout)
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        """Issues a POST request over the pooled session and returns the requests.Response."""
+        if self._slots is None:
+            return self.session.post(url, data=data, headers=headers, timeout=timeout)
+        with self._slots:
+            return self.session.post(url, data=data, headers=headers, timeout=timeout)
+
+    def close(self):
+        """Closes every pooled connection."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -11,5 +11,7 @@ setup(
     keywords="pardot",
     url="https://github.com/mneedham91/PyPardot4",
     packages=['pypardot', 'pypardot.objects'],
+    python_requires='>=3.9',
     install_requires=['requests'],
+    extras_require={'async': ['aiohttp'], 'arrow': ['pyarrow'], 'opentelemetry': ['opentelemetry-api']},
 )